@@ -1,3 +1,6 @@
+import time
+STARTUP_STARTED = time.perf_counter()  # отсчёт фаз запуска, см. startup_report
+
 import sys
 import os
 from pathlib import Path
@@ -9,22 +12,39 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import uuid
 import json as jsonlib
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QLineEdit, QTableWidget, QTableWidgetItem,
+    QPushButton, QLabel, QLineEdit, QTableWidget, QTableWidgetItem, QTableView,
     QHeaderView, QMessageBox, QDialog, QAbstractItemView, QCheckBox, QSpinBox,
     QFrame, QGroupBox, QSystemTrayIcon, QMenu, QTabWidget, QComboBox, QFormLayout,
-    QDateEdit
+    QDateEdit, QProgressDialog
+)
+from PySide6.QtCore import (
+    Qt, Signal, QObject, QThread, QTimer, QDate, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 )
-from PySide6.QtCore import Qt, Signal, QObject, QThread, QTimer, QDate
 from PySide6.QtGui import QDesktopServices, QColor, QPalette, QFont, QIcon, QPixmap, QAction, QPainter
-from PySide6.QtCharts import QChart, QChartView, QBarSeries, QBarSet, QValueAxis, QBarCategoryAxis, QCategoryAxis
-# Сразу после всех импортов добавьте:
-print("=" * 50)
-print("СТАРТ ПРОГРАММЫ")
-print("=" * 50)
+
+try:
+    import tracing
+    from stall_watchdog import EventLoopWatchdog
+    from profiler import AppProfiler, options_from as profile_options
+    from log_setup import HOT_LOGGER, setup_logging
+    from startup_report import StartupReport
+    from single_instance import SingleInstance
+except ImportError:
+    from hh_vacancy_app import tracing
+    from hh_vacancy_app.stall_watchdog import EventLoopWatchdog
+    from hh_vacancy_app.profiler import AppProfiler, options_from as profile_options
+    from hh_vacancy_app.log_setup import HOT_LOGGER, setup_logging
+    from hh_vacancy_app.startup_report import StartupReport
+    from hh_vacancy_app.single_instance import SingleInstance
+traced = tracing.traced
+startup = StartupReport(STARTUP_STARTED)
+startup.mark("импорт модулей")
 
 def resource_path(relative_path):
     """Возвращает абсолютный путь до ресурса, работает и в exe, и в dev-режиме"""
@@ -32,7 +52,6 @@ def resource_path(relative_path):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.dirname(__file__), relative_path)
 
-print("resource_path определен")
 
 
 def get_data_dir():
@@ -45,38 +64,61 @@ def get_data_dir():
 data_dir = get_data_dir()
 LOG_FILE = data_dir / "app.log"  # Для лога
 TOKEN_FILE = data_dir / "auth.json"
+VACANCIES_CACHE_FILE = data_dir / "vacancies.json"  # список с сервера и локальными изменениями для офлайн-режима
+MUTATIONS_FILE = data_dir / "pending_mutations.json"
 
 AUTH_BASE_URL = os.getenv("AUTH_SERVICE_URL", "https://api.subscriptionhhapp.ru").rstrip("/")
 VACANCY_BASE_URL = os.getenv("VACANCY_SERVICE_URL", "https://vacancy.subscriptionhhapp.ru").rstrip("/")
 BOT_USERNAME = os.getenv("TELEGRAM_BOT_USERNAME", "hhsubscription_bot")
-
-# Настройка логирования
+ADMIN_CACHE_TTL = int(os.getenv("ADMIN_CACHE_TTL", "120"))  # секунд до автообновления вкладки админки
+ADMIN_SECTIONS = ("users", "payments", "stats", "bot")  # в порядке вкладок build_admin_tab
+ADMIN_PAYMENTS_PAGE_SIZE = 50
+ADMIN_USERS_PAGE_SIZE = 200
+ADMIN_SEARCH_DEBOUNCE_MS = 250
+BULK_MAX_WORKERS = int(os.getenv("ADMIN_BULK_WORKERS", "8"))
+ADMIN_BATCH_SIZE = 100  # элементов в одном пакетном запросе админки
+STALL_WATCHDOG_MS = int(os.getenv("HH_STALL_WATCHDOG_MS", "0"))  # 0 — сторож цикла событий выключен
+VACANCY_BATCH_SIZE = 500  # id в одном запросе отметки/удаления
+VACANCY_MAX_WORKERS = int(os.getenv("VACANCY_BULK_WORKERS", "4"))
+BATCH_UNSUPPORTED = (404, 405, 501)
+MUTATION_MAX_ATTEMPTS = 5  # после стольких неудачных отправок изменение отбрасывается
+MUTATION_RETRY_MS = 30000
+
+# Настройка логирования: запись в файл идёт в фоновом потоке, см. log_setup
+logger = logging.getLogger(__name__)
+# Перерисовка таблицы и графиков, SSE: этот логгер ограничен по частоте записей
+hot_logger = logging.getLogger(HOT_LOGGER)
 try:
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(str(LOG_FILE), encoding='utf-8'),  # Изменено: путь к LOG_FILE
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    logger = logging.getLogger(__name__)
-    logger.info("=" * 50)
-    logger.info("ЛОГИРОВАНИЕ ИНИЦИАЛИЗИРОВАНО")
-    logger.info("=" * 50)
-    print("Логирование настроено успешно")
+    log_listener = setup_logging(LOG_FILE)
 except Exception as e:
+    log_listener = None
     print(f"ОШИБКА при настройке логирования: {e}")
     import traceback
     traceback.print_exc()
-    # Добавьте: logger не используется здесь, так что OK
+startup.mark("логирование")
+
+
+class ApiSession(requests.Session):
+    """Session, у которой каждый запрос — span «МЕТОД /путь» в трассировке."""
+
+    def request(self, method, url, *args, **kwargs):
+        if not tracing.enabled:
+            return super().request(method, url, *args, **kwargs)
+        with tracing.span(f"{method.upper()} {urlparse(url).path}", cat="http"):
+            return super().request(method, url, *args, **kwargs)
+
+
+def chunked(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
 
 class ApiClient:
     def __init__(self, auth_base_url, vacancy_base_url):
         self.auth_base_url = auth_base_url.rstrip("/")
         self.vacancy_base_url = vacancy_base_url.rstrip("/")
-        self.session = requests.Session()
+        self.session = ApiSession()
         self.token = None
 
     def set_token(self, token):
@@ -163,15 +205,37 @@ class ApiClient:
         resp.raise_for_status()
         return resp.json()
 
-    def mark_multiple_viewed(self, vacancy_ids):
+    def _post_vacancy_ids(self, path, vacancy_ids):
         resp = self.session.post(
-            f"{self.vacancy_base_url}/api/vacancies/mark-multiple-viewed",
+            f"{self.vacancy_base_url}{path}",
             json=vacancy_ids,
             headers=self._auth_headers(),
-            timeout=10
+            timeout=30
         )
         resp.raise_for_status()
 
+    def _send_chunks(self, path, chunks):
+        """Отправляет пачки id параллельно; результат — {id: None или исключение}."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(VACANCY_MAX_WORKERS, len(chunks)))) as executor:
+            futures = {executor.submit(self._post_vacancy_ids, path, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                error = future.exception()
+                for vacancy_id in futures[future]:
+                    results[vacancy_id] = error
+        return results
+
+    def mark_multiple_viewed(self, vacancy_ids):
+        """Помечает вакансии просмотренными пачками по VACANCY_BATCH_SIZE.
+
+        Возвращает {id: None или исключение}: упавшая пачка не отменяет
+        остальные.
+        """
+        chunks = list(chunked(vacancy_ids, VACANCY_BATCH_SIZE))
+        if not chunks:
+            return {}
+        return self._send_chunks("/api/vacancies/mark-multiple-viewed", chunks)
+
     def delete_vacancy(self, vacancy_id):
         resp = self.session.delete(
             f"{self.vacancy_base_url}/api/vacancies/{vacancy_id}",
@@ -180,6 +244,52 @@ class ApiClient:
         )
         resp.raise_for_status()
 
+    def _delete_one(self, vacancy_id):
+        try:
+            self.delete_vacancy(vacancy_id)
+        except requests.exceptions.HTTPError as e:
+            # Уже удалена (например, с другого устройства) — для пользователя это успех
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            return e
+        except Exception as e:
+            return e
+        return None
+
+    def delete_vacancies(self, vacancy_ids):
+        """Удаляет вакансии пакетами; возвращает {id: None или исключение}.
+
+        Первая пачка проверяет, знает ли сервер пакетное удаление. Если нет
+        (404/405/501), вакансии удаляются поштучно не более чем в
+        BULK_MAX_WORKERS потоков.
+        """
+        path = "/api/vacancies/delete-multiple"
+        chunks = list(chunked(vacancy_ids, VACANCY_BATCH_SIZE))
+        if not chunks:
+            return {}
+        try:
+            self._post_vacancy_ids(path, chunks[0])
+            results = {vacancy_id: None for vacancy_id in chunks[0]}
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code not in BATCH_UNSUPPORTED:
+                results = {vacancy_id: e for vacancy_id in chunks[0]}
+            else:
+                logger.info("Пакетное удаление недоступно, удаляем поштучно")
+                return self._delete_each(vacancy_ids)
+        except Exception as e:
+            results = {vacancy_id: e for vacancy_id in chunks[0]}
+        if len(chunks) > 1:
+            results.update(self._send_chunks(path, chunks[1:]))
+        return results
+
+    def _delete_each(self, vacancy_ids):
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(BULK_MAX_WORKERS, len(vacancy_ids)))) as executor:
+            futures = {executor.submit(self._delete_one, vacancy_id): vacancy_id for vacancy_id in vacancy_ids}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+
     def get_current_user(self):
         resp = self.session.get(
             f"{self.auth_base_url}/api/auth/me",
@@ -238,9 +348,12 @@ class ApiClient:
         resp.raise_for_status()
         return resp.json()
 
-    def get_admin_users(self):
+    def get_admin_users(self, search=None, page=None, size=None):
+        """Без параметров — весь список, как раньше; search/page/size — поиск и страницы на сервере."""
+        params = {k: v for k, v in (("search", search), ("page", page), ("size", size)) if v is not None}
         resp = self.session.get(
             f"{self.auth_base_url}/api/admin/all-users",
+            params=params or None,
             headers=self._auth_headers(),
             timeout=10
         )
@@ -286,6 +399,59 @@ class ApiClient:
         resp.raise_for_status()
         return resp.json()
 
+    # Пакетные эндпоинты. Если сервер их не знает (404/405/501), BulkOperationWorker
+    # выполняет операцию поштучно через обычные методы выше. Итог по каждому
+    # элементу сервер возвращает в results, см. batch_results.
+    def extend_subscriptions_batch(self, payloads):
+        resp = self.session.post(
+            f"{self.auth_base_url}/api/admin/extend-subscription/batch",
+            json=payloads,
+            headers=self._auth_headers(),
+            timeout=60
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def update_admin_users_batch(self, telegram_ids, payload):
+        resp = self.session.put(
+            f"{self.auth_base_url}/api/admin/users/batch",
+            json={"telegramIds": telegram_ids, "update": payload},
+            headers=self._auth_headers(),
+            timeout=60
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def delete_users_batch(self, telegram_ids):
+        resp = self.session.post(
+            f"{self.auth_base_url}/api/admin/users/delete-batch",
+            json=telegram_ids,
+            headers=self._auth_headers(),
+            timeout=60
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def verify_admin_payments_batch(self, payment_ids, notes=None):
+        resp = self.session.post(
+            f"{self.auth_base_url}/api/admin/payments/verify-batch",
+            json={"paymentIds": payment_ids, "notes": notes or ""},
+            headers=self._auth_headers(),
+            timeout=60
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def reject_admin_payments_batch(self, payment_ids, reason):
+        resp = self.session.post(
+            f"{self.auth_base_url}/api/admin/payments/reject-batch",
+            json={"paymentIds": payment_ids, "reason": reason},
+            headers=self._auth_headers(),
+            timeout=60
+        )
+        resp.raise_for_status()
+        return resp.json()
+
     def get_admin_stats(self):
         resp = self.session.get(
             f"{self.auth_base_url}/api/admin/stats",
@@ -354,6 +520,26 @@ class ApiClient:
         resp.raise_for_status()
         return resp.json()
 
+    def start_broadcast_job(self, message):
+        """Ставит рассылку в очередь на сервере и сразу возвращает {"jobId": ...}."""
+        resp = self.session.post(
+            f"{self.auth_base_url}/api/admin/bot/broadcast/jobs",
+            json={"message": message},
+            headers=self._auth_headers(),
+            timeout=10
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def get_broadcast_job(self, job_id):
+        resp = self.session.get(
+            f"{self.auth_base_url}/api/admin/bot/broadcast/jobs/{job_id}",
+            headers=self._auth_headers(),
+            timeout=10
+        )
+        resp.raise_for_status()
+        return resp.json()
+
     def bot_broadcast(self, message):
         resp = self.session.post(
             f"{self.auth_base_url}/api/admin/bot/broadcast",
@@ -723,6 +909,94 @@ DEFAULT_SETTINGS = {
     "stats_date": None
 }
 
+class MutationQueue:
+    """Очередь изменений вакансий, ещё не подтверждённых сервером.
+
+    Хранится в MUTATIONS_FILE и переживает перезапуск. На каждый id — одно
+    действие: "delete" поглощает "mark", "mark" после "delete" ничего не
+    меняет. Очередь меняется только из GUI-потока; воркер получает копию
+    через snapshot().
+    """
+
+    def __init__(self, path=MUTATIONS_FILE):
+        self.path = Path(path)
+        self.items = {}  # id -> {"id", "action": "mark" | "delete", "attempts"}
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.items = {item["id"]: item for item in data if item.get("action") in ("mark", "delete")}
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать очередь изменений: {e}")
+            self.items = {}
+
+    def save(self):
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(list(self.items.values()), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, action, vacancy_ids):
+        for vacancy_id in vacancy_ids:
+            current = self.items.get(vacancy_id)
+            if current and (current["action"] == "delete" or current["action"] == action):
+                continue
+            self.items[vacancy_id] = {"id": vacancy_id, "action": action, "attempts": 0}
+        self.save()
+
+    def snapshot(self):
+        """{действие: [id]} для отправки."""
+        result = {"mark": [], "delete": []}
+        for vacancy_id, item in self.items.items():
+            result[item["action"]].append(vacancy_id)
+        return result
+
+    def complete(self, action, results):
+        """Убирает подтверждённые id; отказам сервера (4xx) увеличивает счётчик попыток.
+
+        Сетевые ошибки и 5xx попыткой не считаются: без связи очередь может
+        ждать сколько угодно. Возвращает id, отброшенные после
+        MUTATION_MAX_ATTEMPTS.
+        """
+        dropped = []
+        for vacancy_id, error in results.items():
+            item = self.items.get(vacancy_id)
+            # Пока шла отправка, действие могло смениться (mark -> delete)
+            if not item or item["action"] != action:
+                continue
+            if not error:
+                del self.items[vacancy_id]
+                continue
+            response = getattr(error, "response", None)
+            if response is None or not 400 <= response.status_code < 500 or response.status_code in (408, 429):
+                continue
+            item["attempts"] += 1
+            if item["attempts"] >= MUTATION_MAX_ATTEMPTS:
+                del self.items[vacancy_id]
+                dropped.append(vacancy_id)
+        self.save()
+        return dropped
+
+    def apply(self, vacancies):
+        """Накладывает неотправленные изменения на список с сервера."""
+        if not self.items:
+            return vacancies
+        result = []
+        for vacancy in vacancies:
+            item = self.items.get(vacancy.get("id"))
+            if item and item["action"] == "delete":
+                continue
+            if item and item["action"] == "mark":
+                vacancy["status"] = "OLD"
+            result.append(vacancy)
+        return result
+
+
 # Worker для фонового обновления
 class UpdateWorker(QThread):
     finished = Signal(list, int)
@@ -735,24 +1009,27 @@ class UpdateWorker(QThread):
         self.existing_ids = existing_ids
         self.do_search = do_search
 
+    @traced("UpdateWorker.run", cat="worker")
     def run(self):
         try:
             headers = {"Authorization": f"Bearer {self.auth_token}"}
             if self.do_search:
-                search_resp = requests.post(
-                    f"{VACANCY_BASE_URL}/api/vacancies/search",
-                    json=self.search_payload,
-                    headers=headers,
-                    timeout=30
-                )
+                with tracing.span("POST /api/vacancies/search", cat="http"):
+                    search_resp = requests.post(
+                        f"{VACANCY_BASE_URL}/api/vacancies/search",
+                        json=self.search_payload,
+                        headers=headers,
+                        timeout=30
+                    )
                 search_resp.raise_for_status()
 
-            list_resp = requests.get(
-                f"{VACANCY_BASE_URL}/api/vacancies",
-                headers=headers,
-                timeout=15
-            )
-            list_resp.raise_for_status()
+            with tracing.span("GET /api/vacancies", cat="http"):
+                list_resp = requests.get(
+                    f"{VACANCY_BASE_URL}/api/vacancies",
+                    headers=headers,
+                    timeout=15
+                )
+                list_resp.raise_for_status()
 
             vacancies = list_resp.json()
             new_count = sum(1 for v in vacancies if v.get("id") not in self.existing_ids)
@@ -762,6 +1039,30 @@ class UpdateWorker(QThread):
             self.error.emit(str(e))
 
 
+class MutationReplayWorker(QThread):
+    """Отправка очереди изменений пакетами вне GUI-потока."""
+    done = Signal(object, object)  # результаты отметки и удаления: {id: None или исключение}
+
+    def __init__(self, api, pending):
+        super().__init__()
+        self.api = api
+        self.pending = pending
+
+    def _send(self, func, vacancy_ids):
+        if not vacancy_ids:
+            return {}
+        try:
+            return func(vacancy_ids)
+        except Exception as e:
+            logger.warning(f"Ошибка отправки изменений: {e}")
+            return {vacancy_id: e for vacancy_id in vacancy_ids}
+
+    def run(self):
+        marked = self._send(self.api.mark_multiple_viewed, self.pending["mark"])
+        deleted = self._send(self.api.delete_vacancies, self.pending["delete"])
+        self.done.emit(marked, deleted)
+
+
 class VacancyStreamWorker(QThread):
     new_vacancies = Signal(list)
     error = Signal(str)
@@ -775,6 +1076,28 @@ class VacancyStreamWorker(QThread):
     def stop(self):
         self._stop = True
 
+    def _iter_lines(self, resp):
+        """Строки потока по мере прихода байт.
+
+        iter_lines() читает блоками по 512 байт и держит конец события,
+        пока не придёт следующее, поэтому читаем через read1().
+        """
+        read1 = getattr(resp.raw, "read1", None)
+        if read1 is None:
+            # urllib3 < 2: без read1 остаётся побайтовое чтение
+            yield from resp.iter_lines(chunk_size=1, decode_unicode=True)
+            return
+        pending = b""
+        while True:
+            chunk = read1(65536, decode_content=True)
+            if not chunk:
+                break
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                yield line.rstrip(b"\r").decode("utf-8")
+        if pending:
+            yield pending.decode("utf-8")
+
     def run(self):
         try:
             headers = {"Authorization": f"Bearer {self.auth_token}"}
@@ -786,7 +1109,7 @@ class VacancyStreamWorker(QThread):
             ) as resp:
                 resp.raise_for_status()
                 buffer = ""
-                for line in resp.iter_lines(decode_unicode=True):
+                for line in self._iter_lines(resp):
                     if self._stop:
                         break
                     if line is None:
@@ -794,11 +1117,12 @@ class VacancyStreamWorker(QThread):
                     if line == "":
                         if buffer:
                             try:
-                                payload = jsonlib.loads(buffer)
-                                if isinstance(payload, list):
-                                    self.new_vacancies.emit(payload)
+                                with tracing.span("sse.event", cat="sse", bytes=len(buffer)):
+                                    payload = jsonlib.loads(buffer)
+                                    if isinstance(payload, list):
+                                        self.new_vacancies.emit(payload)
                             except Exception as e:
-                                logger.warning(f"Ошибка парсинга SSE: {e}")
+                                hot_logger.warning(f"Ошибка парсинга SSE: {e}")
                             buffer = ""
                         continue
                     if line.startswith("data:"):
@@ -807,6 +1131,555 @@ class VacancyStreamWorker(QThread):
             self.error.emit(str(e))
 
 
+class AdminDataWorker(QThread):
+    """Фоновая загрузка разделов админки.
+
+    Одна проверка авторизации на весь пакет, затем все запросы разделов
+    идут параллельно. Каждый раздел отдаётся сигналом loaded, как только
+    готовы все его запросы.
+    """
+    loaded = Signal(str, object)
+    failed = Signal(str, str)
+    auth_failed = Signal()
+
+    def __init__(self, api, sections, users_params=None):
+        super().__init__()
+        self.api = api
+        self.sections = list(sections)
+        self.users_params = users_params or {}
+
+    def _requests(self, section):
+        if section == "users":
+            return {"users": lambda: self.api.get_admin_users(**self.users_params)}
+        if section == "stats":
+            return {"stats": self.api.get_admin_stats, "payments": self.api.get_admin_payment_stats}
+        if section == "bot":
+            return {"bot": self.api.get_bot_stats}
+        raise ValueError(f"Неизвестный раздел админки: {section}")
+
+    def run(self):
+        try:
+            if not self.api.get_subscription_status():
+                self.auth_failed.emit()
+                return
+        except Exception as e:
+            for section in self.sections:
+                self.failed.emit(section, str(e))
+            return
+
+        calls = [(section, part, func)
+                 for section in self.sections
+                 for part, func in self._requests(section).items()]
+        remaining = defaultdict(int)
+        for section, _, _ in calls:
+            remaining[section] += 1
+        results = defaultdict(dict)
+        errors = {}
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = {executor.submit(func): (section, part) for section, part, func in calls}
+            for future in as_completed(futures):
+                section, part = futures[future]
+                try:
+                    results[section][part] = future.result()
+                except Exception as e:
+                    logger.warning(f"Админка, {section}/{part}: {e}")
+                    errors[section] = str(e)
+                remaining[section] -= 1
+                if remaining[section] == 0:
+                    if section in errors:
+                        self.failed.emit(section, errors[section])
+                    else:
+                        self.loaded.emit(section, results[section])
+
+
+class AccountDataWorker(QThread):
+    """Фоновая загрузка личного кабинета: подписка, профиль и платежи.
+
+    Как и AdminDataWorker, сначала проверяет токен; профиль и платежи
+    запрашиваются параллельно.
+    """
+    loaded = Signal(object)
+    failed = Signal(str)
+    auth_failed = Signal()
+
+    def __init__(self, api):
+        super().__init__()
+        self.api = api
+
+    def run(self):
+        try:
+            status = self.api.get_subscription_status()
+            if not status:
+                self.auth_failed.emit()
+                return
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                user = executor.submit(self.api.get_current_user)
+                payments = executor.submit(self.api.get_user_payments)
+                data = {"status": status, "user": user.result(), "payments": payments.result()}
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit(data)
+
+
+class PaymentsPageWorker(QThread):
+    """Загрузка одной страницы /api/admin/payments/all в фоне."""
+    loaded = Signal(object, int, object)
+    failed = Signal(object, int, str)
+    auth_failed = Signal(object, int)
+
+    def __init__(self, api, status, page, size):
+        super().__init__()
+        self.api = api
+        self.status = status
+        self.page = page
+        self.size = size
+
+    def run(self):
+        try:
+            response = self.api.get_admin_payments(status=self.status, page=self.page, size=self.size)
+            self.loaded.emit(self.status, self.page, response)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 401:
+                self.auth_failed.emit(self.status, self.page)
+            else:
+                self.failed.emit(self.status, self.page, str(e))
+        except Exception as e:
+            self.failed.emit(self.status, self.page, str(e))
+
+
+class AdminPaymentsModel(QAbstractTableModel):
+    """Платежи админки постранично: canFetchMore/fetchMore вместо одной страницы.
+
+    Страницы кэшируются отдельно для каждого статуса, так что переключение
+    фильтра показывает уже загруженное без запросов. Пока пользователь
+    смотрит страницу, следующая заранее грузится в фоне. Об ошибках
+    сообщается только для страниц, которые ждёт пользователь (wanted);
+    неудачная предзагрузка просто пишется в лог.
+    """
+    COLUMNS = [
+        ("ID", "id"), ("Telegram ID", "telegramId"), ("Тариф", "plan"), ("Месяцев", "months"),
+        ("Сумма", "amount"), ("Статус", "status"), ("Создан", "createdAt"), ("Примечание", "adminNotes")
+    ]
+    load_failed = Signal(str)
+    auth_expired = Signal()
+
+    def __init__(self, api, page_size=ADMIN_PAYMENTS_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.api = api
+        self.page_size = page_size
+        self.status = None
+        self.cache = {}  # статус -> {"pages": {номер: [платежи]}, "last": номер последней или None, "loaded_at": ...}
+        self.rows = []
+        self.shown_pages = 0
+        self.wanted = set()
+        self.workers = {}
+        self.generation = 0  # ответы, запрошенные до refresh(), отбрасываются
+
+    def _entry(self, status=None):
+        status = self.status if status is None else status
+        return self.cache.setdefault(status, {"pages": {}, "last": None, "loaded_at": time.monotonic()})
+
+    def set_status(self, status):
+        """Переключает фильтр; показывает закэшированные страницы без запросов."""
+        self.beginResetModel()
+        self.status = status
+        entry = self._entry()
+        self.rows = []
+        self.shown_pages = 0
+        # Ожидаемые страницы относятся к прежнему фильтру
+        self.wanted.clear()
+        while self.shown_pages in entry["pages"]:
+            self.rows.extend(entry["pages"][self.shown_pages])
+            self.shown_pages += 1
+        self.endResetModel()
+        if self.shown_pages == 0:
+            self.fetchMore()
+
+    def is_stale(self, status, ttl):
+        entry = self.cache.get(status)
+        return entry is not None and time.monotonic() - entry["loaded_at"] >= ttl
+
+    def refresh(self, status=None):
+        """Сбрасывает кэш всех статусов: после подтверждения платёж меняет статус."""
+        self.cache.clear()
+        self.wanted.clear()
+        self.generation += 1
+        self.set_status(status)
+
+    def payment_at(self, row):
+        return self.rows[row] if 0 <= row < len(self.rows) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        value = self.rows[index.row()].get(self.COLUMNS[index.column()][1])
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][0]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        last = self._entry()["last"]
+        return (last is None or self.shown_pages <= last) and self.shown_pages not in self.wanted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        page = self.shown_pages
+        if page in self._entry()["pages"]:
+            self._show_page(page)
+        else:
+            self.wanted.add(page)
+            self._request(self.status, page)
+
+    def _show_page(self, page):
+        rows = self._entry()["pages"][page]
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+            self.rows.extend(rows)
+            self.shown_pages += 1
+            self.endInsertRows()
+        else:
+            self.shown_pages += 1
+        # Следующая страница — заранее, чтобы прокрутка не ждала сеть
+        last = self._entry()["last"]
+        if last is None or page + 1 <= last:
+            self._request(self.status, page + 1)
+
+    def _request(self, status, page):
+        key = (self.generation, status, page)
+        if key in self.workers or page in self._entry(status)["pages"]:
+            return
+        worker = PaymentsPageWorker(self.api, status, page, self.page_size)
+        worker.loaded.connect(
+            lambda status, page, response, gen=self.generation: self.on_page_loaded(status, page, response, gen)
+        )
+        worker.failed.connect(
+            lambda status, page, error, gen=self.generation: self.on_page_failed(status, page, error, gen)
+        )
+        worker.auth_failed.connect(
+            lambda status, page, gen=self.generation: self.on_page_auth_failed(status, page, gen)
+        )
+        worker.finished.connect(lambda key=key: self.workers.pop(key, None))
+        self.workers[key] = worker
+        worker.start()
+
+    def on_page_loaded(self, status, page, response, generation):
+        if generation != self.generation:
+            return
+        if isinstance(response, dict):
+            rows = response.get("payments") or response.get("content") or []
+            total_pages = response.get("totalPages")
+        else:
+            rows, total_pages = response or [], None
+        entry = self._entry(status)
+        entry["pages"][page] = rows
+        if total_pages is not None:
+            entry["last"] = max(0, total_pages - 1)
+        elif len(rows) < self.page_size:
+            entry["last"] = page
+        if status == self.status and page in self.wanted:
+            self.wanted.discard(page)
+            if page == self.shown_pages:
+                self._show_page(page)
+
+    def _take_wanted(self, status, page, generation):
+        """True, если эту страницу ждёт пользователь; снимает её с ожидания."""
+        if generation != self.generation or status != self.status or page not in self.wanted:
+            return False
+        self.wanted.discard(page)
+        return True
+
+    def on_page_failed(self, status, page, error, generation):
+        if not self._take_wanted(status, page, generation):
+            logger.debug(f"Предзагрузка платежей ({status or 'ALL'}, стр. {page + 1}) не удалась: {error}")
+            return
+        self.load_failed.emit(error)
+
+    def on_page_auth_failed(self, status, page, generation):
+        if not self._take_wanted(status, page, generation):
+            return
+        self.auth_expired.emit()
+
+
+def batch_results(response, keys):
+    """Разбор ответа пакетного эндпоинта админки: {ключ: (успех, сообщение)}.
+
+    Сервер перечисляет элементы в results: [{"id", "success", "error"}].
+    Элементы, которых в ответе нет, считаются неуспешными — их результат
+    неизвестен. Ответ только со счётчиком ({"updated": N}) подтверждает
+    все элементы, лишь если N совпадает с размером пачки.
+    """
+    outcome = {key: (False, "результат неизвестен: сервер не вернул его в ответе") for key in keys}
+    if not isinstance(response, dict):
+        return outcome
+    entries = response.get("results")
+    if isinstance(entries, list):
+        for entry in entries:
+            key = str((entry or {}).get("id"))
+            if key in outcome:
+                outcome[key] = (bool(entry.get("success")), "" if entry.get("success") else str(entry.get("error") or "ошибка"))
+        return outcome
+    counts = [value for value in response.values() if isinstance(value, int) and not isinstance(value, bool)]
+    if len(counts) == 1 and counts[0] == len(keys):
+        outcome = {key: (True, "") for key in keys}
+    return outcome
+
+
+class BulkOperationWorker(QThread):
+    """Массовая операция админки: пакетные запросы или поштучно в пуле потоков.
+
+    Элементы отправляются в batch_func пачками по batch_size, результат
+    каждого элемента берётся из ответа (см. batch_results), элементы
+    сопоставляются по key_func. Если сервер такого эндпоинта не знает,
+    оставшиеся элементы идут в item_func не более чем в max_workers потоков.
+    Отмена не прерывает уже отправленные запросы, но следующие пачки и
+    элементы не запускаются.
+    """
+    progress = Signal(int, int)
+    done = Signal(list)  # [(название элемента, успех, сообщение)]
+
+    def __init__(self, items, item_func, label_func=str, batch_func=None, max_workers=BULK_MAX_WORKERS,
+                 key_func=None, batch_size=ADMIN_BATCH_SIZE):
+        super().__init__()
+        self.items = list(items)
+        self.item_func = item_func
+        self.label_func = label_func
+        self.batch_func = batch_func
+        self.max_workers = max_workers
+        self.key_func = key_func or label_func
+        self.batch_size = batch_size
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run_chunk(self, chunk):
+        """Результаты пачки; None, если пакетного эндпоинта нет."""
+        keys = [str(self.key_func(item)) for item in chunk]
+        try:
+            response = self.batch_func(chunk)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code in BATCH_UNSUPPORTED:
+                return None
+            return [(self.label_func(item), False, str(e)) for item in chunk]
+        except Exception as e:
+            return [(self.label_func(item), False, str(e)) for item in chunk]
+        outcome = batch_results(response, keys)
+        return [(self.label_func(item), *outcome[key]) for item, key in zip(chunk, keys)]
+
+    def _run_one(self, item):
+        if self._cancelled.is_set():
+            return self.label_func(item), False, "отменено"
+        try:
+            self.item_func(item)
+            return self.label_func(item), True, ""
+        except Exception as e:
+            return self.label_func(item), False, str(e)
+
+    def _run_each(self, items, results):
+        total = len(self.items)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(items)))) as executor:
+            futures = [executor.submit(self._run_one, item) for item in items]
+            for future in as_completed(futures):
+                results.append(future.result())
+                self.progress.emit(len(results), total)
+
+    def run(self):
+        total = len(self.items)
+        results = []
+        remaining = self.items
+        if self.batch_func is not None and total > 1:
+            for chunk in chunked(self.items, self.batch_size):
+                if self._cancelled.is_set():
+                    break
+                chunk_results = self._run_chunk(chunk)
+                if chunk_results is None:
+                    logger.info("Пакетный эндпоинт недоступен, выполняем поштучно")
+                    break
+                results += chunk_results
+                self.progress.emit(len(results), total)
+            remaining = self.items[len(results):]
+        if remaining and self._cancelled.is_set():
+            results += [(self.label_func(item), False, "отменено") for item in remaining]
+        elif remaining:
+            self._run_each(remaining, results)
+        self.progress.emit(total, total)
+        self.done.emit(results)
+
+
+class BroadcastWorker(QThread):
+    """Рассылка как фоновая задача: отправить, получить jobId и опрашивать прогресс.
+
+    Интервал опроса растёт от 0.5 до 5 секунд, пока прогресс не меняется,
+    и сбрасывается, когда сервер сообщает новые цифры. Если сервер не знает
+    /broadcast/jobs, рассылка уходит старым синхронным запросом, но тоже
+    вне GUI-потока.
+    """
+    progress = Signal(dict)
+    completed = Signal(dict)
+    error = Signal(str)
+
+    FINAL_STATUSES = ("DONE", "COMPLETED", "FAILED", "CANCELLED")
+
+    def __init__(self, api, message, min_interval=0.5, max_interval=5.0):
+        super().__init__()
+        self.api = api
+        self.message = message
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        try:
+            try:
+                job = self.api.start_broadcast_job(self.message)
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code not in BATCH_UNSUPPORTED:
+                    raise
+                self.api.bot_broadcast(self.message)
+                self.completed.emit({"status": "DONE"})
+                return
+
+            job_id = job.get("jobId") or job.get("id")
+            interval = self.min_interval
+            last = None
+            while not self._stop.is_set():
+                state = self.api.get_broadcast_job(job_id)
+                counters = (state.get("sent"), state.get("failed"), state.get("status"))
+                if counters != last:
+                    self.progress.emit(state)
+                    last = counters
+                    interval = self.min_interval
+                else:
+                    interval = min(self.max_interval, interval * 1.5)
+                if str(state.get("status") or "").upper() in self.FINAL_STATUSES:
+                    self.completed.emit(state)
+                    return
+                self._stop.wait(interval)
+        except Exception as e:
+            logger.warning(f"Ошибка рассылки: {e}")
+            self.error.emit(str(e))
+
+
+class AdminUsersModel(QAbstractTableModel):
+    """Пользователи админки с индексами для поиска.
+
+    Для каждого пользователя один раз собирается строка поиска в нижнем
+    регистре, а по ней — индекс триграмм: подстрока из трёх и более
+    символов ищется пересечением нескольких множеств, а не перебором всех
+    пользователей. Поиск по telegramId — через словарь.
+    """
+    COLUMNS = ["Telegram ID", "Имя", "Username", "Email", "Статус", "Тариф", "Дней", "Роль", "Создан"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.users = []
+        self.by_id = {}
+        self.search_keys = []
+        self.trigrams = None
+
+    def set_users(self, users):
+        self.beginResetModel()
+        self.users = list(users)
+        self.by_id = {user.get("telegramId"): user for user in self.users}
+        self.search_keys = [
+            "\n".join(str(user.get(field) or "") for field in ("firstName", "lastName", "username", "email")).lower()
+            for user in self.users
+        ]
+        self.trigrams = None  # строится при первом поиске, а не при каждой загрузке списка
+        self.endResetModel()
+
+    def _build_trigrams(self):
+        self.trigrams = defaultdict(set)
+        for row, key in enumerate(self.search_keys):
+            for gram in {key[i:i + 3] for i in range(len(key) - 2)}:
+                self.trigrams[gram].add(row)
+
+    def match_rows(self, query):
+        """Множество строк, где есть подстрока query; None — фильтра нет."""
+        query = query.strip().lower()
+        if not query:
+            return None
+        if len(query) < 3:
+            return {row for row, key in enumerate(self.search_keys) if query in key}
+        if self.trigrams is None:
+            self._build_trigrams()
+        postings = sorted((self.trigrams.get(query[i:i + 3], set()) for i in range(len(query) - 2)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        # Триграммы могут совпасть в разных местах строки — проверяем точно
+        return {row for row in candidates if query in self.search_keys[row]}
+
+    def user_at(self, row):
+        return self.users[row] if 0 <= row < len(self.users) else None
+
+    def _cell(self, user, column):
+        if column == 0:
+            return str(user.get("telegramId"))
+        if column == 1:
+            return f"{user.get('firstName') or ''} {user.get('lastName') or ''}".strip()
+        if column == 4:
+            return "Активна" if user.get("isActive") else "Неактивна"
+        field = (None, None, "username", "email", None, "subscriptionPlan", "daysRemaining", "role", "createdAt")[column]
+        return str(user.get(field) or "")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.users)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        user = self.users[index.row()]
+        if role == Qt.DisplayRole:
+            return self._cell(user, index.column())
+        if role == Qt.UserRole:
+            # Числовые колонки сортируются как числа
+            if index.column() == 0:
+                return user.get("telegramId") or 0
+            if index.column() == 6:
+                return user.get("daysRemaining") or 0
+            return self._cell(user, index.column()).lower()
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+
+class AdminUsersFilterProxy(QSortFilterProxyModel):
+    """Фильтр по заранее вычисленному набору строк из AdminUsersModel.match_rows."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.allowed = None
+        self.setSortRole(Qt.UserRole)
+
+    def set_query(self, query):
+        self.allowed = self.sourceModel().match_rows(query)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.allowed is None or source_row in self.allowed
+
+
 class SupportDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -877,6 +1750,7 @@ class VacancyApp(QMainWindow):
             logger.warning(f"Неверный формат loaded_at: {date_str}")
             return datetime.min
 
+    @traced("VacancyApp.__init__")
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Удобные Вакансии — HH.ru")
@@ -902,9 +1776,25 @@ class VacancyApp(QMainWindow):
         self.is_admin = False
         self.user_payments = []
         self.admin_users = []
-        self.filtered_admin_users = []
-        self.admin_payments = []
+        self.admin_users_server_paged = False
+        self.admin_users_page = 0
+        self.admin_users_total_pages = 1
+        self.account_worker = None
+        self.account_reload = False
+        self.account_needs_auth = False
+        self.bulk_worker = None
+        self.broadcast_worker = None
+        self.mutations = MutationQueue()
+        self.replay_worker = None
+        self.replay_again = False
+        self.replay_timer = QTimer(self)
+        self.replay_timer.setSingleShot(True)
+        self.replay_timer.timeout.connect(self.flush_mutations)
+        self.admin_cache = {}
+        self.admin_loading = set()
+        self.admin_workers = []
         self.stream_worker = None
+        self.profiler = None
         self.offline_mode = False
         self.last_auth_error = None
         self.subscription_active = False
@@ -923,19 +1813,21 @@ class VacancyApp(QMainWindow):
                     QMessageBox.information(self, "Авторизация", "Авторизация не выполнена")
                     self.close_application()
                     return
+        startup.mark("авторизация")
         if not self.offline_mode:
             self.load_settings()
-        self.init_ui()  # Сначала создаём UI
+        # Стиль до создания виджетов: иначе Qt заново полирует всё готовое дерево
         self.apply_theme()
-        if not self.offline_mode:
-            self.refresh_account_profile()
-            self.refresh_account_subscription()
-            self.load_user_payments()
+        startup.mark("настройки и тема")
+        self.init_ui()
+        startup.mark("интерфейс")
         self.load_vacancies_from_file()
+        startup.mark("загрузка вакансий")
         self.populate_stats_dates()  # Теперь stats_date_combo уже существует
         self.on_stats_mode_changed(self.stats_mode_combo.currentText())
         self.update_table()
         self.update_stats_chart()
+        startup.mark("таблица и статистика")
         if not self.offline_mode:
             self.setup_auto_update()
         self.apply_subscription_state()
@@ -947,7 +1839,9 @@ class VacancyApp(QMainWindow):
 
         self.tray_icon = None
         self.setup_system_tray()
+        startup.mark("трей и фоновые задачи")
 
+    @traced()
     def setup_system_tray(self):
         """Настройка системного трея"""
         if not QSystemTrayIcon.isSystemTrayAvailable():
@@ -1012,19 +1906,22 @@ class VacancyApp(QMainWindow):
             return
         self.stream_retry_timer.start(5000)
 
+    @traced()
     def on_stream_vacancies(self, vacancies):
         try:
-            normalized = [self.normalize_vacancy(v) for v in vacancies]
+            normalized = self.normalize_vacancies(vacancies)
             existing_ids = {v.get("id") for v in self.vacancies}
-            new_items = [v for v in normalized if v.get("id") not in existing_ids]
+            # Удалённые и отмеченные локально, но ещё не отправленные, не должны вернуться
+            new_items = self.mutations.apply([v for v in normalized if v.get("id") not in existing_ids])
             if not new_items:
                 return
             self.vacancies.extend(new_items)
+            self.save_vacancies_to_file()
             self.populate_stats_dates()
             self.update_table()
             self.update_stats_chart()
         except Exception as e:
-            logger.warning(f"Ошибка обновления из SSE: {e}")
+            hot_logger.warning(f"Ошибка обновления из SSE: {e}")
 
     def on_stream_error(self, message):
         logger.warning(f"SSE поток завершился: {message}")
@@ -1043,6 +1940,7 @@ class VacancyApp(QMainWindow):
     def save_token(self, token):
         TOKEN_FILE.write_text(json.dumps({"token": token}), encoding="utf-8")
 
+    @traced()
     def authenticate(self, allow_dialog=True):
         self.last_auth_error = None
         token = self.load_token()
@@ -1112,22 +2010,152 @@ class VacancyApp(QMainWindow):
     def update_admin_tabs(self):
         if not hasattr(self, "tab_widget"):
             return
-        if self.is_admin and not hasattr(self, "admin_tabs"):
-            admin_tab = self.build_admin_tab()
-            self.tab_widget.addTab(admin_tab, "Администрирование")
-            self.load_admin_users()
-            self.load_admin_payments()
-            self.load_admin_stats()
-            self.load_bot_stats()
-        elif not self.is_admin and hasattr(self, "admin_tabs"):
-            for i in range(self.tab_widget.count()):
-                if self.tab_widget.tabText(i) == "Администрирование":
-                    widget = self.tab_widget.widget(i)
-                    self.tab_widget.removeTab(i)
-                    widget.deleteLater()
-                    break
+        index = self.main_tab_index("Администрирование")
+        if self.is_admin and index < 0:
+            self.add_lazy_tab("Администрирование", self.build_admin_tab)
+        elif not self.is_admin and index >= 0:
+            widget = self.tab_widget.widget(index)
+            self.lazy_tabs.pop(widget, None)
+            self.tab_widget.removeTab(index)
+            widget.deleteLater()
             if hasattr(self, "admin_tabs"):
                 del self.admin_tabs
+            self.admin_cache.clear()
+
+    def main_tab_index(self, title):
+        for i in range(self.tab_widget.count()):
+            if self.tab_widget.tabText(i) == title:
+                return i
+        return -1
+
+    def add_lazy_tab(self, title, builder):
+        """Вкладка-заглушка: builder() строит содержимое при первом открытии."""
+        placeholder = QWidget()
+        layout = QVBoxLayout(placeholder)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.lazy_tabs[placeholder] = builder
+        return self.tab_widget.addTab(placeholder, title)
+
+    def ensure_tab_built(self, index):
+        placeholder = self.tab_widget.widget(index)
+        builder = self.lazy_tabs.pop(placeholder, None)
+        if builder:
+            with tracing.span(f"build_tab {self.tab_widget.tabText(index)}"):
+                placeholder.layout().addWidget(builder())
+
+    def build_account_page(self):
+        # Сначала то, что уже известно со входа; свежие данные придут из AccountDataWorker
+        tab = self.build_account_tab()
+        self.refresh_account_profile()
+        self.refresh_account_subscription()
+        self.load_user_payments()
+        return tab
+
+    def on_main_tab_changed(self, index):
+        self.ensure_tab_built(index)
+        if self.tab_widget.widget(index) is self.stats_tab and self.stats_chart_dirty:
+            self.update_stats_chart()
+        if hasattr(self, "admin_tabs") and self.tab_widget.tabText(index) == "Администрирование":
+            self.on_admin_tab_changed(self.admin_tabs.currentIndex())
+
+    def on_admin_tab_changed(self, index):
+        if 0 <= index < len(ADMIN_SECTIONS):
+            self.load_admin_section(ADMIN_SECTIONS[index])
+
+    def load_admin_section(self, section, force=False):
+        """Показывает раздел из кэша, если он свежее ADMIN_CACHE_TTL, иначе грузит в фоне."""
+        if self.offline_mode or not self.token:
+            return
+        if section == "payments":
+            # У платежей свой постраничный кэш в модели
+            status = self.admin_payment_status.currentText()
+            status = None if status == "ALL" else status
+            model = self.admin_payments_model
+            if force or model.is_stale(status, ADMIN_CACHE_TTL):
+                model.refresh(status)
+            elif status != model.status or not model.rows:
+                model.set_status(status)
+            return
+        key = section
+        cached = self.admin_cache.get(key)
+        if cached and not force:
+            self.apply_admin_section(section, cached[1])
+            if time.monotonic() - cached[0] < ADMIN_CACHE_TTL:
+                return
+        if key in self.admin_loading:
+            return
+        self.admin_loading.add(key)
+        users_params = None
+        if section == "users" and self.admin_users_server_paged:
+            query = self.admin_user_search.text().strip() if hasattr(self, "admin_user_search") else ""
+            users_params = {"search": query or None, "page": self.admin_users_page, "size": ADMIN_USERS_PAGE_SIZE}
+        worker = AdminDataWorker(self.api, [section], users_params=users_params)
+        worker.loaded.connect(lambda name, data, key=key: self.on_admin_section_loaded(key, name, data))
+        worker.failed.connect(lambda name, error, key=key: self.on_admin_section_failed(key, name, error))
+        worker.auth_failed.connect(lambda key=key: self.on_admin_auth_failed(key))
+        worker.finished.connect(lambda w=worker: self.admin_workers.remove(w))
+        self.admin_workers.append(worker)
+        worker.start()
+
+    def on_admin_section_loaded(self, key, section, data):
+        self.admin_loading.discard(key)
+        self.admin_cache[key] = (time.monotonic(), data)
+        self.apply_admin_section(section, data)
+
+    def on_admin_section_failed(self, key, section, error):
+        self.admin_loading.discard(key)
+        if section == "users":
+            self.update_admin_users_pager()
+        titles = {"users": "пользователей", "payments": "платежи", "stats": "статистику", "bot": "статистику бота"}
+        QMessageBox.warning(self, "Администратор", f"Не удалось загрузить {titles.get(section, section)}: {error}")
+
+    def on_admin_auth_failed(self, key):
+        self.admin_loading.discard(key)
+        # Токен протух — переавторизация в GUI-потоке, затем повтор
+        if self.ensure_authenticated():
+            self.load_admin_section(key, force=True)
+
+    def apply_admin_section(self, section, data):
+        if section == "users":
+            response = data["users"]
+            self.admin_users = response.get("users", []) if isinstance(response, dict) else response
+            # Сервер отдаёт страницы — значит, пользователей много и искать должен он
+            if isinstance(response, dict) and (response.get("totalPages") or 1) > 1:
+                self.admin_users_server_paged = True
+            if isinstance(response, dict):
+                self.admin_users_total_pages = max(1, response.get("totalPages") or 1)
+                self.admin_users_page = response.get("page", response.get("number", self.admin_users_page))
+            if hasattr(self, "admin_users_model"):
+                self.admin_users_model.set_users(self.admin_users)
+                query = "" if self.admin_users_server_paged else self.admin_user_search.text()
+                self.admin_users_proxy.set_query(query)
+                self.update_admin_users_pager()
+        elif section == "stats":
+            stats, payment_stats = data["stats"], data["payments"]
+            details = (
+                f"Всего пользователей: {stats.get('totalUsers')}\n"
+                f"Активных подписок: {stats.get('activeSubscriptions')}\n"
+                f"Истекших подписок: {stats.get('expiredSubscriptions')}\n"
+                f"Пробный период использован: {stats.get('trialUsedCount')}\n"
+                f"Платежей всего: {payment_stats.get('totalPayments')}\n"
+                f"Ожидают: {payment_stats.get('pendingPayments')}\n"
+                f"Подтверждены: {payment_stats.get('verifiedPayments')}\n"
+                f"Отклонены: {payment_stats.get('rejectedPayments')}"
+            )
+            if hasattr(self, "admin_stats_details"):
+                self.admin_stats_details.setText(details)
+        elif section == "bot":
+            stats = data["bot"]
+            details = (
+                f"Всего пользователей: {stats.get('totalUsers')}\n"
+                f"Активных сегодня: {stats.get('activeToday')}\n"
+                f"Сообщений всего: {stats.get('totalMessages')}\n"
+                f"Сообщений сегодня: {stats.get('messagesToday')}\n"
+                f"Статус: {stats.get('botStatus')}\n"
+                f"Обновлено: {stats.get('lastUpdate')}"
+            )
+            if hasattr(self, "bot_stats_details"):
+                self.bot_stats_details.setText(details)
 
     def ensure_authenticated(self):
         if self.offline_mode:
@@ -1172,6 +2200,7 @@ class VacancyApp(QMainWindow):
             self.apply_subscription_state()
             self.update_connection_state()
             self.start_stream()
+            self.flush_mutations()
 
     def update_connection_state(self):
         if self.offline_mode:
@@ -1273,7 +2302,7 @@ class VacancyApp(QMainWindow):
         self.account_end_label.setText(f"Дата окончания: {end_date}")
 
     def refresh_account_profile(self):
-        if not self.current_user:
+        if not self.current_user or not hasattr(self, "profile_first_name"):
             return
         self.profile_first_name.setText(self.current_user.get("firstName") or "")
         self.profile_last_name.setText(self.current_user.get("lastName") or "")
@@ -1298,14 +2327,58 @@ class VacancyApp(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Ошибка", f"Не удалось обновить профиль: {e}")
 
+    @traced()
     def load_user_payments(self):
-        if not self.ensure_authenticated():
+        """Обновляет кабинет (подписку, профиль, платежи) в фоне."""
+        # Пока кабинет не открывали, платежи не нужны: загрузятся при открытии вкладки
+        if not hasattr(self, "payments_table"):
             return
-        try:
-            self.user_payments = self.api.get_user_payments()
-            self.populate_user_payments()
-        except Exception as e:
-            QMessageBox.warning(self, "Платежи", f"Не удалось загрузить платежи: {e}")
+        if self.offline_mode or not self.token:
+            return
+        if self.account_worker and self.account_worker.isRunning():
+            # Платёж могли создать или отменить, пока шла загрузка — повторим после неё
+            self.account_reload = True
+            return
+        self.payment_refresh_btn.setEnabled(False)
+        worker = AccountDataWorker(self.api)
+        worker.loaded.connect(self.on_account_loaded)
+        worker.failed.connect(self.on_account_failed)
+        worker.auth_failed.connect(self.on_account_auth_failed)
+        worker.finished.connect(self.on_account_worker_finished)
+        self.account_worker = worker
+        worker.start()
+
+    def on_account_loaded(self, data):
+        status = data["status"]
+        self.subscription_status = status
+        self.subscription_active = bool(status.get("active"))
+        self.user_telegram_id = status.get("telegramId")
+        if data["user"] is not None:
+            self.current_user = data["user"]
+            self.is_admin = (self.current_user.get("role") or "").upper() == "ADMIN"
+            self.update_admin_tabs()
+        self.apply_subscription_state()
+        self.refresh_account_profile()
+        self.user_payments = data["payments"]
+        self.populate_user_payments()
+
+    def on_account_failed(self, error):
+        QMessageBox.warning(self, "Платежи", f"Не удалось загрузить платежи: {error}")
+
+    def on_account_auth_failed(self):
+        self.account_needs_auth = True
+
+    def on_account_worker_finished(self):
+        # Ссылку на воркер держим до finished, иначе QThread удалится, пока поток жив
+        self.account_worker = None
+        self.payment_refresh_btn.setEnabled(True)
+        needs_auth, self.account_needs_auth = self.account_needs_auth, False
+        reload, self.account_reload = self.account_reload, False
+        if needs_auth:
+            # Токен протух — переавторизация в GUI-потоке, затем повтор
+            reload = self.ensure_authenticated()
+        if reload:
+            self.load_user_payments()
 
     def populate_user_payments(self):
         payments = self.user_payments or []
@@ -1364,58 +2437,46 @@ class VacancyApp(QMainWindow):
             QMessageBox.warning(self, "Платежи", f"Не удалось отменить платеж: {e}")
 
     def load_admin_users(self):
-        if not self.ensure_authenticated():
-            return
-        try:
-            response = self.api.get_admin_users()
-            self.admin_users = response.get("users", []) if isinstance(response, dict) else response
-            self.filtered_admin_users = list(self.admin_users)
-            if hasattr(self, "admin_users_table"):
-                self.populate_admin_users()
-        except Exception as e:
-            QMessageBox.warning(self, "Администратор", f"Не удалось загрузить пользователей: {e}")
+        self.load_admin_section("users", force=True)
 
     def filter_admin_users(self):
-        if not hasattr(self, "admin_users"):
+        """Срабатывает по таймеру после паузы в наборе, а не на каждую букву."""
+        if not hasattr(self, "admin_users_model"):
             return
-        query = self.admin_user_search.text().strip().lower()
-        if not query:
-            self.filtered_admin_users = list(self.admin_users)
-        else:
-            self.filtered_admin_users = [
-                u for u in self.admin_users
-                if query in str(u.get("firstName", "")).lower()
-                or query in str(u.get("lastName", "")).lower()
-                or query in str(u.get("username", "")).lower()
-                or query in str(u.get("email", "")).lower()
-            ]
-        self.populate_admin_users()
-
-    def populate_admin_users(self):
-        users = getattr(self, "filtered_admin_users", [])
-        self.admin_users_table.setRowCount(len(users))
-        for row, user in enumerate(users):
-            self.admin_users_table.setItem(row, 0, QTableWidgetItem(str(user.get("telegramId"))))
-            full_name = f"{user.get('firstName') or ''} {user.get('lastName') or ''}".strip()
-            self.admin_users_table.setItem(row, 1, QTableWidgetItem(full_name))
-            self.admin_users_table.setItem(row, 2, QTableWidgetItem(str(user.get("username") or "")))
-            self.admin_users_table.setItem(row, 3, QTableWidgetItem(str(user.get("email") or "")))
-            self.admin_users_table.setItem(row, 4, QTableWidgetItem("Активна" if user.get("isActive") else "Неактивна"))
-            self.admin_users_table.setItem(row, 5, QTableWidgetItem(str(user.get("subscriptionPlan") or "")))
-            self.admin_users_table.setItem(row, 6, QTableWidgetItem(str(user.get("daysRemaining") or "")))
-            self.admin_users_table.setItem(row, 7, QTableWidgetItem(str(user.get("role") or "")))
-            self.admin_users_table.setItem(row, 8, QTableWidgetItem(str(user.get("createdAt") or "")))
+        if self.admin_users_server_paged:
+            # Новый запрос — результаты с первой страницы
+            self.admin_users_page = 0
+            self.load_admin_section("users", force=True)
+            return
+        self.admin_users_proxy.set_query(self.admin_user_search.text())
+
+    def change_admin_users_page(self, step):
+        """Соседняя страница пользователей, когда их листает сервер."""
+        page = self.admin_users_page + step
+        if not 0 <= page < self.admin_users_total_pages or "users" in self.admin_loading:
+            return
+        self.admin_users_page = page
+        self.admin_users_prev_btn.setEnabled(False)
+        self.admin_users_next_btn.setEnabled(False)
+        self.load_admin_section("users", force=True)
+
+    def update_admin_users_pager(self):
+        if not hasattr(self, "admin_users_page_label"):
+            return
+        paged = self.admin_users_server_paged
+        for widget in (self.admin_users_prev_btn, self.admin_users_page_label, self.admin_users_next_btn):
+            widget.setVisible(paged)
+        self.admin_users_page_label.setText(f"Страница {self.admin_users_page + 1} из {self.admin_users_total_pages}")
+        self.admin_users_prev_btn.setEnabled(self.admin_users_page > 0)
+        self.admin_users_next_btn.setEnabled(self.admin_users_page + 1 < self.admin_users_total_pages)
 
     def _selected_admin_user(self):
-        row = self.admin_users_table.currentRow()
-        if row < 0:
+        index = self.admin_users_table.currentIndex()
+        if not index.isValid():
             return None
-        telegram_id_item = self.admin_users_table.item(row, 0)
-        telegram_id = int(telegram_id_item.text()) if telegram_id_item and telegram_id_item.text().isdigit() else None
-        for user in getattr(self, "admin_users", []):
-            if user.get("telegramId") == telegram_id:
-                return user
-        return None
+        user = self.admin_users_model.user_at(self.admin_users_proxy.mapToSource(index).row())
+        # Берём актуальную запись из индекса по telegramId
+        return self.admin_users_model.by_id.get((user or {}).get("telegramId"))
 
     def edit_selected_admin_user(self):
         user = self._selected_admin_user()
@@ -1435,15 +2496,73 @@ class VacancyApp(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Администратор", f"Не удалось обновить пользователя: {e}")
 
+    def _selected_admin_users(self):
+        rows = self.admin_users_table.selectionModel().selectedRows()
+        users = [self.admin_users_model.user_at(self.admin_users_proxy.mapToSource(index).row()) for index in rows]
+        return [user for user in users if user]
+
+    def run_bulk_operation(self, title, items, item_func, label_func=str, batch_func=None, on_done=None):
+        """Запускает BulkOperationWorker с отменяемым прогрессом и отчётом по каждому элементу."""
+        if self.bulk_worker and self.bulk_worker.isRunning():
+            QMessageBox.information(self, title, "Дождитесь окончания предыдущей операции")
+            return
+        progress = QProgressDialog(f"{title}: 0 из {len(items)}", "Отмена", 0, len(items), self)
+        progress.setWindowTitle(title)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setValue(0)
+
+        worker = BulkOperationWorker(items, item_func, label_func, batch_func)
+        progress.canceled.connect(worker.cancel)
+
+        def on_progress(done, total):
+            progress.setLabelText(f"{title}: {done} из {total}")
+            progress.setValue(done)
+
+        def on_finished(results):
+            progress.close()
+            self.bulk_worker = None
+            self.show_bulk_report(title, results)
+            if on_done:
+                on_done()
+
+        worker.progress.connect(on_progress)
+        worker.done.connect(on_finished)
+        self.bulk_worker = worker
+        worker.start()
+
+    def show_bulk_report(self, title, results):
+        ok = sum(1 for _, success, _ in results if success)
+        failed = [(label, message) for label, success, message in results if not success]
+        box = QMessageBox(self)
+        box.setWindowTitle(title)
+        box.setIcon(QMessageBox.Information if not failed else QMessageBox.Warning)
+        box.setText(f"Успешно: {ok}, с ошибкой: {len(failed)}")
+        if failed:
+            box.setDetailedText("\n".join(f"{label}: {message}" for label, message in failed))
+        box.exec()
+
     def extend_selected_admin_user(self):
-        user = self._selected_admin_user()
-        if not user:
+        users = self._selected_admin_users()
+        if not users:
             QMessageBox.information(self, "Администратор", "Выберите пользователя")
             return
-        dialog = SubscriptionExtendDialog(user, self)
+        dialog = SubscriptionExtendDialog(users[0], self)
+        if len(users) > 1:
+            dialog.setWindowTitle(f"Продлить подписку: {len(users)} пользователей")
         if dialog.exec() != QDialog.Accepted:
             return
         payload = dialog.get_payload()
+        if len(users) > 1:
+            payloads = [dict(payload, telegramId=user.get("telegramId")) for user in users]
+            self.run_bulk_operation(
+                "Продление подписок", payloads,
+                item_func=self.api.extend_subscription,
+                label_func=lambda p: str(p.get("telegramId")),
+                batch_func=self.api.extend_subscriptions_batch,
+                on_done=self.load_admin_users
+            )
+            return
         try:
             self.api.extend_subscription(payload)
             self.load_admin_users()
@@ -1451,35 +2570,53 @@ class VacancyApp(QMainWindow):
             QMessageBox.warning(self, "Администратор", f"Не удалось продлить подписку: {e}")
 
     def apply_plan_selected_admin_user(self):
-        user = self._selected_admin_user()
-        if not user:
+        users = self._selected_admin_users()
+        if not users:
             QMessageBox.information(self, "Администратор", "Выберите пользователя")
             return
-        dialog = SubscriptionPlanDialog(user, self)
+        dialog = SubscriptionPlanDialog(users[0], self)
         if dialog.exec() != QDialog.Accepted:
             return
         payload = dialog.get_payload()
+        if len(users) > 1:
+            self.run_bulk_operation(
+                "Применение тарифа", [user.get("telegramId") for user in users],
+                item_func=lambda telegram_id: self.api.update_admin_user(telegram_id, payload),
+                batch_func=lambda ids: self.api.update_admin_users_batch(ids, payload),
+                on_done=self.load_admin_users
+            )
+            return
         try:
-            self.api.update_admin_user(user.get("telegramId"), payload)
+            self.api.update_admin_user(users[0].get("telegramId"), payload)
             self.load_admin_users()
         except Exception as e:
             QMessageBox.warning(self, "Администратор", f"Не удалось применить тариф: {e}")
 
     def delete_selected_admin_user(self):
-        user = self._selected_admin_user()
-        if not user:
+        users = self._selected_admin_users()
+        if not users:
             QMessageBox.information(self, "Администратор", "Выберите пользователя")
             return
+        question = (f"Удалить пользователя {users[0].get('telegramId')}?" if len(users) == 1
+                    else f"Удалить выбранных пользователей: {len(users)}?")
         confirm = QMessageBox.question(
             self,
             "Удаление пользователя",
-            f"Удалить пользователя {user.get('telegramId')}?",
+            question,
             QMessageBox.Yes | QMessageBox.No
         )
         if confirm != QMessageBox.Yes:
             return
+        if len(users) > 1:
+            self.run_bulk_operation(
+                "Удаление пользователей", [user.get("telegramId") for user in users],
+                item_func=self.api.delete_user,
+                batch_func=self.api.delete_users_batch,
+                on_done=self.load_admin_users
+            )
+            return
         try:
-            self.api.delete_user(user.get("telegramId"))
+            self.api.delete_user(users[0].get("telegramId"))
             self.load_admin_users()
         except Exception as e:
             QMessageBox.warning(self, "Администратор", f"Не удалось удалить пользователя: {e}")
@@ -1516,99 +2653,59 @@ class VacancyApp(QMainWindow):
         self.start_stream()
 
     def load_admin_payments(self):
-        if not self.ensure_authenticated():
-            return
-        status = self.admin_payment_status.currentText()
-        status_param = None if status == "ALL" else status
-        try:
-            response = self.api.get_admin_payments(status=status_param)
-            payments = response.get("payments", []) if isinstance(response, dict) else response
-            self.admin_payments = payments
-            if hasattr(self, "admin_payments_table"):
-                self.populate_admin_payments()
-        except Exception as e:
-            QMessageBox.warning(self, "Администратор", f"Не удалось загрузить платежи: {e}")
+        self.load_admin_section("payments", force=True)
 
-    def populate_admin_payments(self):
-        payments = getattr(self, "admin_payments", [])
-        self.admin_payments_table.setRowCount(len(payments))
-        for row, payment in enumerate(payments):
-            self.admin_payments_table.setItem(row, 0, QTableWidgetItem(str(payment.get("id"))))
-            self.admin_payments_table.setItem(row, 1, QTableWidgetItem(str(payment.get("telegramId") or "")))
-            self.admin_payments_table.setItem(row, 2, QTableWidgetItem(str(payment.get("plan") or "")))
-            self.admin_payments_table.setItem(row, 3, QTableWidgetItem(str(payment.get("months") or "")))
-            self.admin_payments_table.setItem(row, 4, QTableWidgetItem(str(payment.get("amount") or "")))
-            self.admin_payments_table.setItem(row, 5, QTableWidgetItem(str(payment.get("status") or "")))
-            self.admin_payments_table.setItem(row, 6, QTableWidgetItem(str(payment.get("createdAt") or "")))
-            self.admin_payments_table.setItem(row, 7, QTableWidgetItem(str(payment.get("adminNotes") or "")))
-
-    def _selected_admin_payment_id(self):
-        row = self.admin_payments_table.currentRow()
-        if row < 0:
-            return None
-        item = self.admin_payments_table.item(row, 0)
-        return int(item.text()) if item and item.text().isdigit() else None
+    def _selected_admin_payment_ids(self):
+        ids = []
+        for index in self.admin_payments_table.selectionModel().selectedRows():
+            payment_id = (self.admin_payments_model.payment_at(index.row()) or {}).get("id")
+            if str(payment_id).isdigit():
+                ids.append(int(payment_id))
+        return ids
 
     def verify_selected_payment(self):
-        payment_id = self._selected_admin_payment_id()
-        if not payment_id:
+        payment_ids = self._selected_admin_payment_ids()
+        if not payment_ids:
             QMessageBox.information(self, "Платежи", "Выберите платеж")
             return
+        if len(payment_ids) > 1:
+            self.run_bulk_operation(
+                "Подтверждение платежей", payment_ids,
+                item_func=lambda payment_id: self.api.verify_admin_payment(payment_id, "Платеж подтвержден"),
+                batch_func=lambda ids: self.api.verify_admin_payments_batch(ids, "Платеж подтвержден"),
+                on_done=self.load_admin_payments
+            )
+            return
         try:
-            self.api.verify_admin_payment(payment_id, "Платеж подтвержден")
+            self.api.verify_admin_payment(payment_ids[0], "Платеж подтвержден")
             self.load_admin_payments()
         except Exception as e:
             QMessageBox.warning(self, "Платежи", f"Не удалось подтвердить: {e}")
 
     def reject_selected_payment(self):
-        payment_id = self._selected_admin_payment_id()
-        if not payment_id:
+        payment_ids = self._selected_admin_payment_ids()
+        if not payment_ids:
             QMessageBox.information(self, "Платежи", "Выберите платеж")
             return
+        if len(payment_ids) > 1:
+            self.run_bulk_operation(
+                "Отклонение платежей", payment_ids,
+                item_func=lambda payment_id: self.api.reject_admin_payment(payment_id, "Платеж отклонен"),
+                batch_func=lambda ids: self.api.reject_admin_payments_batch(ids, "Платеж отклонен"),
+                on_done=self.load_admin_payments
+            )
+            return
         try:
-            self.api.reject_admin_payment(payment_id, "Платеж отклонен")
+            self.api.reject_admin_payment(payment_ids[0], "Платеж отклонен")
             self.load_admin_payments()
         except Exception as e:
             QMessageBox.warning(self, "Платежи", f"Не удалось отклонить: {e}")
 
     def load_admin_stats(self):
-        if not self.ensure_authenticated():
-            return
-        try:
-            stats = self.api.get_admin_stats()
-            payment_stats = self.api.get_admin_payment_stats()
-            details = (
-                f"Всего пользователей: {stats.get('totalUsers')}\n"
-                f"Активных подписок: {stats.get('activeSubscriptions')}\n"
-                f"Истекших подписок: {stats.get('expiredSubscriptions')}\n"
-                f"Пробный период использован: {stats.get('trialUsedCount')}\n"
-                f"Платежей всего: {payment_stats.get('totalPayments')}\n"
-                f"Ожидают: {payment_stats.get('pendingPayments')}\n"
-                f"Подтверждены: {payment_stats.get('verifiedPayments')}\n"
-                f"Отклонены: {payment_stats.get('rejectedPayments')}"
-            )
-            if hasattr(self, "admin_stats_details"):
-                self.admin_stats_details.setText(details)
-        except Exception as e:
-            QMessageBox.warning(self, "Администратор", f"Не удалось загрузить статистику: {e}")
+        self.load_admin_section("stats", force=True)
 
     def load_bot_stats(self):
-        if not self.ensure_authenticated():
-            return
-        try:
-            stats = self.api.get_bot_stats()
-            details = (
-                f"Всего пользователей: {stats.get('totalUsers')}\n"
-                f"Активных сегодня: {stats.get('activeToday')}\n"
-                f"Сообщений всего: {stats.get('totalMessages')}\n"
-                f"Сообщений сегодня: {stats.get('messagesToday')}\n"
-                f"Статус: {stats.get('botStatus')}\n"
-                f"Обновлено: {stats.get('lastUpdate')}"
-            )
-            if hasattr(self, "bot_stats_details"):
-                self.bot_stats_details.setText(details)
-        except Exception as e:
-            QMessageBox.warning(self, "Бот", f"Не удалось загрузить статистику: {e}")
+        self.load_admin_section("bot", force=True)
 
     def control_bot(self, action):
         if not self.ensure_authenticated():
@@ -1624,11 +2721,40 @@ class VacancyApp(QMainWindow):
         if not message:
             QMessageBox.information(self, "Бот", "Введите текст рассылки")
             return
-        try:
-            self.api.bot_broadcast(message)
-            QMessageBox.information(self, "Бот", "Рассылка отправлена")
-        except Exception as e:
-            QMessageBox.warning(self, "Бот", f"Не удалось отправить рассылку: {e}")
+        if self.broadcast_worker and self.broadcast_worker.isRunning():
+            QMessageBox.information(self, "Бот", "Предыдущая рассылка ещё идёт")
+            return
+        self.broadcast_send_btn.setEnabled(False)
+        self.broadcast_status_label.setText("Рассылка поставлена в очередь...")
+        worker = BroadcastWorker(self.api, message)
+        worker.progress.connect(self.on_broadcast_progress)
+        worker.completed.connect(self.on_broadcast_completed)
+        worker.error.connect(self.on_broadcast_error)
+        worker.finished.connect(lambda: self.broadcast_send_btn.setEnabled(True))
+        self.broadcast_worker = worker
+        worker.start()
+
+    def _broadcast_progress_text(self, state):
+        total = state.get("total")
+        sent = state.get("sent") or 0
+        failed = state.get("failed") or 0
+        of_total = f" из {total}" if total else ""
+        return f"Отправлено: {sent}{of_total}, ошибок: {failed}"
+
+    def on_broadcast_progress(self, state):
+        self.broadcast_status_label.setText(self._broadcast_progress_text(state))
+
+    def on_broadcast_completed(self, state):
+        if "sent" in state:
+            text = f"Рассылка завершена ({state.get('status')}). {self._broadcast_progress_text(state)}"
+        else:
+            text = "Рассылка отправлена"
+        self.broadcast_status_label.setText(text)
+        self.broadcast_input.clear()
+
+    def on_broadcast_error(self, message):
+        self.broadcast_status_label.setText("")
+        QMessageBox.warning(self, "Бот", f"Не удалось отправить рассылку: {message}")
 
     def show_and_restore(self):
         """Показать и восстановить окно"""
@@ -1638,6 +2764,13 @@ class VacancyApp(QMainWindow):
         self.activateWindow()
         logger.info("Окно приложения восстановлено из трея")
 
+    def handle_instance_command(self, command):
+        """Команда от повторного запуска приложения"""
+        logger.info(f"Повторный запуск приложения: {command}")
+        self.show_and_restore()
+        if command == "refresh" and not (self.worker and self.worker.isRunning()):
+            self.update_vacancies()
+
     def tray_icon_activated(self, reason):
         """Обработка событий иконки трея"""
         if reason == QSystemTrayIcon.DoubleClick:
@@ -1667,6 +2800,13 @@ class VacancyApp(QMainWindow):
         logger.info("Завершение приложения")
         self.auto_update_timer.stop()
         self.stop_stream()
+        if self.broadcast_worker and self.broadcast_worker.isRunning():
+            # Рассылка продолжается на сервере, перестаём только опрашивать
+            self.broadcast_worker.stop()
+            self.broadcast_worker.wait(1000)
+        if self.replay_worker and self.replay_worker.isRunning():
+            # Даём отправленным изменениям дойти; неподтверждённые останутся в очереди
+            self.replay_worker.wait(5000)
         if self.worker and self.worker.isRunning():
             self.worker.terminate()
             self.worker.wait()
@@ -1676,6 +2816,7 @@ class VacancyApp(QMainWindow):
         self.close()
         QApplication.quit()
 
+    @traced()
     def update_stats_chart(self):
         """Обновление графика статистики в зависимости от выбранного режима"""
         # Проверяем, что все необходимые элементы UI созданы
@@ -1683,9 +2824,17 @@ class VacancyApp(QMainWindow):
             logger.warning("Комбобоксы статистики ещё не созданы, пропускаем обновление графика")
             return
 
+        # График строится, только когда вкладка видна; иначе — при её открытии
+        if self.tab_widget.currentWidget() is not self.stats_tab:
+            self.stats_chart_dirty = True
+            return
+        self.stats_chart_dirty = False
+        # QtCharts грузится при первом графике, а не при старте приложения
+        from PySide6.QtCharts import QChart, QChartView
+
         # Проверяем наличие вакансий
         if not self.vacancies:
-            logger.info("Нет вакансий для отображения на графике")
+            hot_logger.debug("Нет вакансий для отображения на графике")
             if hasattr(self, 'chart_view') and self.chart_view:
                 # Очищаем график если он уже существует
                 empty_chart = QChart()
@@ -1732,10 +2881,12 @@ class VacancyApp(QMainWindow):
         else:
             self.chart_view.setChart(chart)
 
-        logger.info(f"График статистики обновлен в режиме: {mode}")
+        hot_logger.debug(f"График статистики обновлен в режиме: {mode}")
 
+    @traced()
     def _update_hourly_chart(self, chart, selected_date):
         """Обновление графика по часам для конкретного дня"""
+        from PySide6.QtCharts import QBarSet, QBarSeries, QBarCategoryAxis, QValueAxis
         hourly_counts = defaultdict(int)
 
         for v in self.vacancies:
@@ -1790,8 +2941,10 @@ class VacancyApp(QMainWindow):
         chart.addAxis(axis_y, Qt.AlignLeft)
         series.attachAxis(axis_y)
 
+    @traced()
     def _update_daily_chart(self, chart, days_count):
         """Обновление графика по дням за указанный период"""
+        from PySide6.QtCharts import QBarSet, QBarSeries, QBarCategoryAxis, QValueAxis
         daily_counts = defaultdict(int)
 
         for v in self.vacancies:
@@ -1887,7 +3040,9 @@ class VacancyApp(QMainWindow):
         """Обработка результатов автообновления"""
         logger.info(f"Автообновление завершено: {new_count} новых вакансий")
 
-        self.vacancies = [self.normalize_vacancy(v) for v in server_vacancies]
+        self.vacancies = self.normalize_vacancies(server_vacancies)
+        self.save_vacancies_to_file()
+        self.vacancies = self.mutations.apply(self.vacancies)
         self.populate_stats_dates()
         self.update_table()
         self.update_stats_chart()
@@ -1905,6 +3060,7 @@ class VacancyApp(QMainWindow):
             msg.activateWindow()
             logger.info("Показано уведомление о новых вакансиях")
 
+    @traced()
     def load_settings(self):
         if self.offline_mode:
             self.settings = DEFAULT_SETTINGS.copy()
@@ -1998,6 +3154,7 @@ class VacancyApp(QMainWindow):
 
         self.api.update_settings(payload)
 
+    @traced()
     def apply_theme(self):
         app = QApplication.instance()
         app.setStyle("Fusion")
@@ -2349,6 +3506,7 @@ class VacancyApp(QMainWindow):
         self.update_table()
         self.update_stats_chart()
 
+    @traced()
     def init_ui(self):
         logger.info("Инициализация UI")
         central_widget = QWidget()
@@ -2360,6 +3518,16 @@ class VacancyApp(QMainWindow):
         menubar = self.menuBar()
         help_menu = menubar.addMenu("Справка")
         help_menu.addAction("О программе", self.show_about_dialog)
+        self.profile_action = QAction("Профилирование", self)
+        self.profile_action.setCheckable(True)
+        self.profile_action.setChecked(bool(self.profiler and self.profiler.running))
+        self.profile_action.toggled.connect(self.toggle_profiling)
+        help_menu.addAction(self.profile_action)
+
+        # Сколько изменений ещё не подтвердил сервер
+        self.pending_label = QLabel()
+        self.statusBar().addPermanentWidget(self.pending_label)
+        self.update_pending_label()
 
         header = QFrame()
         header.setObjectName("header")
@@ -2602,14 +3770,15 @@ class VacancyApp(QMainWindow):
         self.mark_btn.setFixedHeight(36)
         self.delete_btn.setFixedHeight(36)
         self.select_all_btn.clicked.connect(self.select_all_new)
-        self.mark_btn.clicked.connect(self.mark_selected_as_old)
+        # У @traced-слотов сигнатура *args: аргумент сигнала (checked, индекс) Qt передал бы в метод
+        self.mark_btn.clicked.connect(lambda *_: self.mark_selected_as_old())
         self.delete_btn.clicked.connect(self.delete_selected_vacancies)
 
         self.status_filter_combo = QComboBox()
         self.status_filter_combo.addItem("Все", None)
         self.status_filter_combo.addItem("Новые", "NEW")
         self.status_filter_combo.addItem("Просмотренные", "OLD")
-        self.status_filter_combo.currentIndexChanged.connect(self.update_table)
+        self.status_filter_combo.currentIndexChanged.connect(lambda *_: self.update_table())
 
         action_layout.addWidget(self.select_all_btn)
         action_layout.addWidget(self.mark_btn)
@@ -2657,7 +3826,7 @@ class VacancyApp(QMainWindow):
         self.tab_widget.addTab(vacancies_tab, "Вакансии")
 
         # Вкладка "Статистика"
-        stats_tab = QWidget()
+        stats_tab = self.stats_tab = QWidget()
         stats_tab_layout = QVBoxLayout(stats_tab)
         stats_tab_layout.setContentsMargins(15, 12, 15, 12)
         stats_tab_layout.setSpacing(12)
@@ -2683,7 +3852,7 @@ class VacancyApp(QMainWindow):
         stats_control_layout.addWidget(QLabel("Дата:"))
         self.stats_date_combo = QComboBox()
         self.stats_date_combo.setMinimumWidth(130)
-        self.stats_date_combo.currentIndexChanged.connect(self.update_stats_chart)
+        self.stats_date_combo.currentIndexChanged.connect(lambda *_: self.update_stats_chart())
         stats_control_layout.addWidget(self.stats_date_combo)
 
         self.prev_btn = QPushButton("←")
@@ -2712,16 +3881,18 @@ class VacancyApp(QMainWindow):
         self.stats_chart_layout = QVBoxLayout(self.stats_chart_frame)
         self.stats_chart_layout.setContentsMargins(20, 12, 20, 12)
         self.chart_view = None
+        self.stats_chart_dirty = False
         stats_tab_layout.addWidget(self.stats_chart_frame)
         self.tab_widget.addTab(stats_tab, "Статистика")
 
-        account_tab = self.build_account_tab()
-        self.tab_widget.addTab(account_tab, "Личный кабинет")
-
+        # Кабинет и админка строятся при первом открытии вкладки
+        self.lazy_tabs = {}
+        self.add_lazy_tab("Личный кабинет", self.build_account_page)
         if self.is_admin:
-            admin_tab = self.build_admin_tab()
-            self.tab_widget.addTab(admin_tab, "Администрирование")
+            self.add_lazy_tab("Администрирование", self.build_admin_tab)
 
+        # Данные админки подгружаются при первом открытии вкладки, а не при входе
+        self.tab_widget.currentChanged.connect(self.on_main_tab_changed)
         content_layout.addWidget(self.tab_widget)
 
         main_layout.addWidget(content_widget)
@@ -2794,7 +3965,7 @@ class VacancyApp(QMainWindow):
         self.payment_check_btn = QPushButton("Проверить статус")
         self.payment_cancel_btn = QPushButton("Отменить платеж")
         self.payment_create_btn.clicked.connect(self.create_payment)
-        self.payment_refresh_btn.clicked.connect(self.load_user_payments)
+        self.payment_refresh_btn.clicked.connect(lambda *_: self.load_user_payments())
         self.payment_check_btn.clicked.connect(self.check_selected_payment)
         self.payment_cancel_btn.clicked.connect(self.cancel_selected_payment)
         payments_actions.addWidget(self.payment_create_btn)
@@ -2830,6 +4001,7 @@ class VacancyApp(QMainWindow):
         self.admin_tabs.addTab(self.build_admin_payments_tab(), "Платежи")
         self.admin_tabs.addTab(self.build_admin_stats_tab(), "Статистика")
         self.admin_tabs.addTab(self.build_admin_bot_tab(), "Бот")
+        self.admin_tabs.currentChanged.connect(self.on_admin_tab_changed)
         layout.addWidget(self.admin_tabs)
         return tab
 
@@ -2841,7 +4013,11 @@ class VacancyApp(QMainWindow):
         top = QHBoxLayout()
         self.admin_user_search = QLineEdit()
         self.admin_user_search.setPlaceholderText("Поиск по имени, username или email")
-        self.admin_user_search.textChanged.connect(self.filter_admin_users)
+        self.admin_user_search_timer = QTimer(self)
+        self.admin_user_search_timer.setSingleShot(True)
+        self.admin_user_search_timer.setInterval(ADMIN_SEARCH_DEBOUNCE_MS)
+        self.admin_user_search_timer.timeout.connect(self.filter_admin_users)
+        self.admin_user_search.textChanged.connect(self.admin_user_search_timer.start)
         self.admin_user_refresh_btn = QPushButton("Обновить")
         self.admin_user_refresh_btn.clicked.connect(self.load_admin_users)
         self.admin_user_edit_btn = QPushButton("Редактировать")
@@ -2860,15 +4036,34 @@ class VacancyApp(QMainWindow):
         top.addWidget(self.admin_user_delete_btn)
         layout.addLayout(top)
 
-        self.admin_users_table = QTableWidget()
-        self.admin_users_table.setColumnCount(9)
-        self.admin_users_table.setHorizontalHeaderLabels(
-            ["Telegram ID", "Имя", "Username", "Email", "Статус", "Тариф", "Дней", "Роль", "Создан"]
-        )
-        self.admin_users_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.admin_users_model = AdminUsersModel(self)
+        self.admin_users_proxy = AdminUsersFilterProxy(self)
+        self.admin_users_proxy.setSourceModel(self.admin_users_model)
+        self.admin_users_table = QTableView()
+        self.admin_users_table.setModel(self.admin_users_proxy)
+        self.admin_users_table.setSortingEnabled(True)
+        self.admin_users_table.sortByColumn(-1, Qt.AscendingOrder)
+        self.admin_users_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.admin_users_table.horizontalHeader().setStretchLastSection(True)
+        self.admin_users_table.verticalHeader().setVisible(False)
         self.admin_users_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.admin_users_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.admin_users_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.admin_users_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.admin_users_table)
+
+        # Листание видно, только если страницы отдаёт сервер
+        pager = QHBoxLayout()
+        self.admin_users_prev_btn = QPushButton("◀ Назад")
+        self.admin_users_prev_btn.clicked.connect(lambda: self.change_admin_users_page(-1))
+        self.admin_users_page_label = QLabel()
+        self.admin_users_next_btn = QPushButton("Вперёд ▶")
+        self.admin_users_next_btn.clicked.connect(lambda: self.change_admin_users_page(1))
+        pager.addStretch()
+        pager.addWidget(self.admin_users_prev_btn)
+        pager.addWidget(self.admin_users_page_label)
+        pager.addWidget(self.admin_users_next_btn)
+        layout.addLayout(pager)
+        self.update_admin_users_pager()
         return tab
 
     def build_admin_payments_tab(self):
@@ -2879,7 +4074,7 @@ class VacancyApp(QMainWindow):
         top = QHBoxLayout()
         self.admin_payment_status = QComboBox()
         self.admin_payment_status.addItems(["ALL", "PENDING", "VERIFIED", "REJECTED", "EXPIRED"])
-        self.admin_payment_status.currentIndexChanged.connect(self.load_admin_payments)
+        self.admin_payment_status.currentIndexChanged.connect(lambda: self.load_admin_section("payments"))
         self.admin_payment_refresh_btn = QPushButton("Обновить")
         self.admin_payment_refresh_btn.clicked.connect(self.load_admin_payments)
         self.admin_payment_verify_btn = QPushButton("Подтвердить")
@@ -2894,14 +4089,19 @@ class VacancyApp(QMainWindow):
         top.addStretch()
         layout.addLayout(top)
 
-        self.admin_payments_table = QTableWidget()
-        self.admin_payments_table.setColumnCount(8)
-        self.admin_payments_table.setHorizontalHeaderLabels(
-            ["ID", "Telegram ID", "Тариф", "Месяцев", "Сумма", "Статус", "Создан", "Примечание"]
+        self.admin_payments_model = AdminPaymentsModel(self.api, parent=self)
+        self.admin_payments_model.load_failed.connect(
+            lambda error: QMessageBox.warning(self, "Администратор", f"Не удалось загрузить платежи: {error}")
         )
-        self.admin_payments_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.admin_payments_model.auth_expired.connect(lambda: self.on_admin_auth_failed("payments"))
+        self.admin_payments_table = QTableView()
+        self.admin_payments_table.setModel(self.admin_payments_model)
+        self.admin_payments_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.admin_payments_table.horizontalHeader().setStretchLastSection(True)
+        self.admin_payments_table.verticalHeader().setVisible(False)
         self.admin_payments_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.admin_payments_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.admin_payments_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.admin_payments_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.admin_payments_table)
         return tab
 
@@ -2953,8 +4153,11 @@ class VacancyApp(QMainWindow):
         self.broadcast_input.setPlaceholderText("Текст рассылки")
         self.broadcast_send_btn = QPushButton("Отправить")
         self.broadcast_send_btn.clicked.connect(self.send_broadcast)
+        self.broadcast_status_label = QLabel("")
+        self.broadcast_status_label.setWordWrap(True)
         b_layout.addWidget(self.broadcast_input)
         b_layout.addWidget(self.broadcast_send_btn)
+        b_layout.addWidget(self.broadcast_status_label)
         layout.addWidget(broadcast_group)
         layout.addStretch()
         return tab
@@ -3032,8 +4235,9 @@ class VacancyApp(QMainWindow):
         self.setup_auto_update()
         QMessageBox.information(self, "Успех", "Настройки сохранены!")
 
+    @traced()
     def update_table(self):
-        logger.info("Обновление таблицы")
+        hot_logger.debug("Обновление таблицы")
         new_count = sum(1 for v in self.vacancies if v.get('status') == 'NEW')
         self.total_label.setText(str(len(self.vacancies)))
         self.new_label.setText(str(new_count))
@@ -3113,7 +4317,7 @@ class VacancyApp(QMainWindow):
                 title_item.setForeground(QColor("#BB86FC" if is_dark else "#1a73e8"))
                 title_item.setFont(font)
 
-        logger.info("Таблица обновлена")
+        hot_logger.debug("Таблица обновлена")
 
     def on_cell_click(self, row, column):
         if column == 2:
@@ -3134,6 +4338,10 @@ class VacancyApp(QMainWindow):
         except Exception:
             return value
 
+    @traced()
+    def normalize_vacancies(self, vacancies):
+        return [self.normalize_vacancy(v) for v in vacancies]
+
     def normalize_vacancy(self, vacancy):
         status = vacancy.get("status")
         status_value = "NEW" if status == "NEW" else "OLD"
@@ -3166,20 +4374,80 @@ class VacancyApp(QMainWindow):
             "telegramNotify": self.settings.get("telegram_notify", False) if self.subscription_active else False
         }
 
+    @traced()
     def load_vacancies_from_file(self):
         if self.offline_mode:
-            self.vacancies = []
+            self.vacancies = self.mutations.apply(self.load_cached_vacancies())
+            logger.info(f"Офлайн: {len(self.vacancies)} вакансий из кэша")
             return
         try:
             server_vacancies = self.api.get_vacancies()
-            self.vacancies = [self.normalize_vacancy(v) for v in server_vacancies]
+            self.vacancies = self.normalize_vacancies(server_vacancies)
             logger.info(f"Загружено {len(self.vacancies)} вакансий с сервера")
+            self.save_vacancies_to_file()
         except Exception as e:
             logger.error(f"Ошибка загрузки вакансий: {e}")
-            self.vacancies = []
+            self.vacancies = self.load_cached_vacancies()
+        self.vacancies = self.mutations.apply(self.vacancies)
+
+    def load_cached_vacancies(self):
+        if not VACANCIES_CACHE_FILE.exists():
+            return []
+        try:
+            return json.loads(VACANCIES_CACHE_FILE.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать кэш вакансий: {e}")
+            return []
 
     def save_vacancies_to_file(self):
-        return
+        """Снимок списка вместе с локальными изменениями, чтобы разбирать вакансии без сети."""
+        try:
+            tmp = VACANCIES_CACHE_FILE.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.vacancies, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, VACANCIES_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить кэш вакансий: {e}")
+
+    def queue_mutations(self, action, vacancy_ids):
+        """Ставит изменения в очередь и сразу пытается их отправить."""
+        # Копия уже с изменением: после отправки оно уйдёт из очереди, а офлайн-запуск читает копию
+        self.save_vacancies_to_file()
+        self.mutations.add(action, vacancy_ids)
+        self.update_pending_label()
+        self.flush_mutations()
+
+    def update_pending_label(self):
+        if not hasattr(self, "pending_label"):
+            return
+        count = len(self.mutations)
+        self.pending_label.setText(f"Не отправлено изменений: {count}")
+        self.pending_label.setVisible(bool(count))
+
+    def flush_mutations(self):
+        if not len(self.mutations) or self.offline_mode or not self.token:
+            return
+        if self.replay_worker and self.replay_worker.isRunning():
+            self.replay_again = True
+            return
+        self.replay_timer.stop()
+        worker = MutationReplayWorker(self.api, self.mutations.snapshot())
+        worker.done.connect(self.on_mutations_replayed)
+        self.replay_worker = worker
+        worker.start()
+
+    def on_mutations_replayed(self, marked, deleted):
+        self.replay_worker = None
+        dropped = self.mutations.complete("mark", marked) + self.mutations.complete("delete", deleted)
+        self.update_pending_label()
+        if dropped:
+            logger.error(f"Изменения не приняты сервером и отброшены: {dropped}")
+        failed = sum(1 for error in list(marked.values()) + list(deleted.values()) if error)
+        if self.replay_again:
+            self.replay_again = False
+            self.flush_mutations()
+        elif failed and len(self.mutations):
+            logger.warning(f"Не отправлено изменений: {failed}, повтор через {MUTATION_RETRY_MS // 1000} с")
+            self.replay_timer.start(MUTATION_RETRY_MS)
 
     def update_vacancies(self):
         logger.info("Нажата кнопка 'Обновить'")
@@ -3219,7 +4487,9 @@ class VacancyApp(QMainWindow):
     def on_update_finished_with_server(self, server_vacancies, new_count):
         logger.info(f"Обновление завершено: {new_count} новых вакансий")
 
-        self.vacancies = [self.normalize_vacancy(v) for v in server_vacancies]
+        self.vacancies = self.normalize_vacancies(server_vacancies)
+        self.save_vacancies_to_file()
+        self.vacancies = self.mutations.apply(self.vacancies)
         self.populate_stats_dates()
         self.update_table()
         self.update_stats_chart()
@@ -3267,6 +4537,7 @@ class VacancyApp(QMainWindow):
                 if checkbox:
                     checkbox.setChecked(True)
 
+    @traced()
     def mark_selected_as_old(self):
         logger.info("Пометка выбранных как просмотренные")
         updated = 0
@@ -3285,10 +4556,7 @@ class VacancyApp(QMainWindow):
 
         if updated > 0:
             if ids_to_mark:
-                try:
-                    self.api.mark_multiple_viewed(ids_to_mark)
-                except Exception as e:
-                    logger.error(f"Ошибка отметки вакансий: {e}")
+                self.queue_mutations("mark", ids_to_mark)
             self.update_table()
             self.update_stats_chart()
             msg = QMessageBox(self)
@@ -3333,20 +4601,34 @@ class VacancyApp(QMainWindow):
         if confirm != QMessageBox.Yes:
             return
 
-        failed = 0
-        for vacancy_id in ids_to_delete:
-            try:
-                self.api.delete_vacancy(vacancy_id)
-            except Exception as e:
-                failed += 1
-                logger.error(f"Ошибка удаления вакансии {vacancy_id}: {e}")
-
-        self.vacancies = [v for v in self.vacancies if v.get("id") not in ids_to_delete]
+        # Убираем сразу; сервер получит удаление из очереди, в том числе после восстановления связи
+        deleted = set(ids_to_delete)
+        self.vacancies = [v for v in self.vacancies if v.get("id") not in deleted]
         self.update_table()
         self.update_stats_chart()
-
-        if failed:
-            QMessageBox.warning(self, "Удаление", f"Не удалось удалить: {failed}")
+        self.queue_mutations("delete", ids_to_delete)
+
+    def attach_profiler(self, profiler):
+        self.profiler = profiler
+        profiler.finished.connect(self.on_profile_finished)
+        QApplication.instance().aboutToQuit.connect(profiler.stop)
+        if hasattr(self, "profile_action"):
+            self.profile_action.setChecked(profiler.running)
+
+    def toggle_profiling(self, checked):
+        if self.profiler is None:
+            self.attach_profiler(AppProfiler(str(get_data_dir()), parent=self))
+        if checked and not self.profiler.running:
+            self.profiler.start()
+        elif not checked and self.profiler.running:
+            path = self.profiler.stop()
+            QMessageBox.information(self, "Профилирование", f"Профиль сохранён:\n{path}")
+
+    def on_profile_finished(self, path):
+        # Запись могла остановиться сама по таймеру — снимаем галочку без повторного stop()
+        self.profile_action.blockSignals(True)
+        self.profile_action.setChecked(False)
+        self.profile_action.blockSignals(False)
 
     def show_about_dialog(self):
         """Показывает информацию о приложении и разработчике"""
@@ -3371,6 +4653,7 @@ class VacancyApp(QMainWindow):
         dialog = SupportDialog(self)
         dialog.exec()
 
+    @traced()
     def populate_stats_dates(self):
         """Заполнение комбобокса с датами для статистики"""
         if not hasattr(self, 'stats_date_combo'):
@@ -3415,7 +4698,7 @@ class VacancyApp(QMainWindow):
             self.stats_date_combo.setCurrentIndex(0)
 
         self.update_date_buttons()
-        logger.info(f"Загружено {len(dates)} уникальных дат для статистики")
+        hot_logger.debug(f"Загружено {len(dates)} уникальных дат для статистики")
 
     def on_stats_mode_changed(self, mode):
         """Обработка изменения режима статистики"""
@@ -3437,29 +4720,74 @@ class VacancyApp(QMainWindow):
 
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("Вход в main блок")
-    print("=" * 50)
     try:
         logger.info("Запуск основного цикла приложения")
-        print("Создание QApplication")
         app = QApplication(sys.argv)
-        print("QApplication создан")
 
         app.setStyle("Fusion")
-        print("Стиль установлен")
+        startup.mark("QApplication")
+
+        # Второй запуск только будит первый экземпляр: python app.py --refresh ещё и обновляет вакансии
+        instance = SingleInstance(data_dir)
+        if not instance.acquire():
+            command = "refresh" if "--refresh" in sys.argv else "activate"
+            if instance.send(command):
+                logger.info(f"Приложение уже запущено, передана команда «{command}»")
+                sys.exit(0)
+            logger.warning("Приложение уже запущено, но не отвечает")
+            sys.exit(1)
+        app.aboutToQuit.connect(instance.release)
+
+        if STALL_WATCHDOG_MS > 0:
+            watchdog = EventLoopWatchdog(STALL_WATCHDOG_MS)
+            watchdog.start()
+
+            def log_stall_summary():
+                watchdog.stop()
+                for culprit, count, total, longest in watchdog.summary():
+                    logger.warning(f"Зависания: {culprit} — {count} раз, всего {total} мс, максимум {longest} мс")
+
+            app.aboutToQuit.connect(log_stall_summary)
+
+        if tracing.enabled:
+            def export_trace():
+                if tracing.TRACE_ENV == "1":
+                    trace_path = get_data_dir() / f"trace-{datetime.now():%Y%m%d-%H%M%S}.json"
+                else:
+                    trace_path = tracing.TRACE_ENV
+                count = tracing.export(trace_path)
+                logger.info(f"Трассировка: {count} событий записано в {trace_path}")
 
-        print("Создание окна VacancyApp")
-        window = VacancyApp()
-        print("Окно создано")
+            app.aboutToQuit.connect(export_trace)
 
-        print("Показ окна")
+        profiler = None
+        profile_mode, profile_seconds = profile_options(sys.argv)
+        if profile_mode:
+            # Запускаем до создания окна, чтобы в профиль попал и старт
+            profiler = AppProfiler(str(get_data_dir()), profile_mode)
+            profiler.start(profile_seconds)
+
+        window = VacancyApp()
+        if profiler:
+            window.attach_profiler(profiler)
+        instance.attach(window.handle_instance_command)
         window.show()
-        print("Окно показано")
 
-        print("Запуск event loop")
+        def report_startup():
+            startup.mark("первый кадр")
+            startup.log()
+            report_path = os.getenv("HH_STARTUP_REPORT")
+            if report_path:
+                startup.write(report_path)
+            if os.getenv("HH_EXIT_AFTER_STARTUP") == "1":
+                # Режим замера measure_startup.py: первый кадр показан — выходим
+                window.close_application()
+
+        # Срабатывает, когда цикл событий обработал показ окна
+        QTimer.singleShot(0, report_startup)
         sys.exit(app.exec())
     except Exception as e:
+        logger.exception("Критическая ошибка")
         print(f"=" * 50)
         print(f"КРИТИЧЕСКАЯ ОШИБКА: {e}")
         print(f"=" * 50)
@@ -0,0 +1,228 @@
+"""Замеры горячих путей VacancyApp на синтетической истории без сети и без экрана.
+
+    python bench_app.py --sizes 1000 10000 100000
+    python bench_app.py --save-baseline          # записать текущие цифры как эталон
+
+Результаты сравниваются с эталоном из --baseline: если шаг стал медленнее
+больше чем на --threshold (и больше чем на --min-delta мс), это регрессия
+и скрипт завершается с кодом 1. Эталон зависит от машины, поэтому его
+записывают на той же машине, где потом сравнивают.
+"""
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+from unittest import mock
+
+# До импорта app: данные приложения — во временной папке, окно — без экрана
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+os.environ["APPDATA"] = tempfile.mkdtemp(prefix="hh_bench_")
+# Поток логов в консоль только мешает читать таблицу; запись в файл остаётся частью замера
+os.environ["HH_LOG_CONSOLE"] = "0"
+
+import app  # noqa: E402
+from PySide6 import __version__ as PYSIDE_VERSION  # noqa: E402
+from PySide6.QtCharts import QChart  # noqa: E402
+from PySide6.QtWidgets import QApplication, QMessageBox  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+STREAM_BATCH = 50  # вакансий в одном SSE-событии
+MARK_COUNT = 500  # сколько новых вакансий отмечается за раз
+STEPS = (
+    "normalize_vacancy", "update_table", "populate_stats_dates",
+    "_update_hourly_chart", "_update_daily_chart", "on_stream_vacancies", "mark_selected_as_old",
+)
+
+
+def make_payload(count, start_id=0, now=None):
+    """Вакансии в формате /api/vacancies, загруженные за последние полгода."""
+    rnd = random.Random(42 + start_id)
+    now = now or datetime(2026, 6, 30, 18, 0, 0)
+    schedules = ["remote", "hybrid", "office"]
+    cities = ["Москва", "Минск", "Санкт-Петербург", "Казань", "Новосибирск"]
+    items = []
+    for i in range(start_id, start_id + count):
+        loaded = now - timedelta(days=rnd.randint(0, 180), hours=rnd.randint(0, 23), minutes=rnd.randint(0, 59))
+        published = loaded - timedelta(days=rnd.randint(0, 3))
+        items.append({
+            "id": i,
+            "title": f"Java разработчик {i}",
+            "employer": f"Компания {i % 5000}",
+            "city": rnd.choice(cities),
+            "salary": rnd.choice([None, f"{rnd.randrange(100, 400) * 1000} RUR"]),
+            "publishedAt": published.isoformat(),
+            "loadedAt": loaded.isoformat(),
+            "url": f"https://hh.ru/vacancy/{i}",
+            "schedule": rnd.choice(schedules),
+            "status": "NEW" if rnd.random() < 0.2 else "OLD",
+        })
+    return items
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Подмена ApiSession у ApiClient: ответы из памяти по пути запроса."""
+
+    def __init__(self, vacancies):
+        self.headers = {}
+        self.routes = {
+            "/api/subscription/status": {"active": True, "telegramId": 1, "daysRemaining": 30},
+            "/api/auth/me": {"telegramId": 1, "firstName": "Bench", "role": "USER"},
+            "/api/settings": {},
+            "/api/vacancies": vacancies,
+            "/api/payments/my": [],
+        }
+
+    def request(self, url, **kwargs):
+        path = "/" + url.split("://", 1)[-1].split("/", 1)[-1]
+        return FakeResponse(self.routes.get(path, {}))
+
+    get = post = put = delete = request
+
+
+def create_window(payload):
+    app.TOKEN_FILE.write_text(json.dumps({"token": "bench"}), encoding="utf-8")
+    session = FakeSession(payload)
+    with mock.patch.object(app, "ApiSession", return_value=session), \
+            mock.patch.object(app.VacancyApp, "update_vacancies"), \
+            mock.patch.object(app.VacancyApp, "start_stream"), \
+            mock.patch.object(app.VacancyApp, "setup_auto_update"):
+        window = app.VacancyApp()
+    return window
+
+
+def measure(func, repeat, setup=None):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def bench_size(window, qt_app, count, repeat):
+    payload = make_payload(count)
+    stream_batch = make_payload(STREAM_BATCH, start_id=count)
+    normalized = [window.normalize_vacancy(v) for v in payload]
+    latest_date = max(datetime.strptime(v["loaded_at"], "%Y-%m-%d %H:%M:%S").date() for v in normalized)
+
+    def reset():
+        window.vacancies = [dict(v) for v in normalized]
+
+    def select_new():
+        reset()
+        window.update_table()
+        selected = 0
+        for row in range(window.table.rowCount()):
+            item = window.table.item(row, 1)
+            if selected < MARK_COUNT and item and "Новая" in item.text():
+                window.table.cellWidget(row, 0).setChecked(True)
+                selected += 1
+
+    results = {}
+    results["normalize_vacancy"] = measure(lambda: [window.normalize_vacancy(v) for v in payload], repeat)
+    reset()
+    results["update_table"] = measure(window.update_table, repeat)
+    results["populate_stats_dates"] = measure(window.populate_stats_dates, repeat)
+    results["_update_hourly_chart"] = measure(lambda: window._update_hourly_chart(QChart(), latest_date), repeat)
+    results["_update_daily_chart"] = measure(lambda: window._update_daily_chart(QChart(), 180), repeat)
+    results["on_stream_vacancies"] = measure(lambda: window.on_stream_vacancies(stream_batch), repeat, setup=reset)
+    results["mark_selected_as_old"] = measure(window.mark_selected_as_old, repeat, setup=select_new)
+    # Отправка очереди идёт в фоне и в замер не входит; дожидаемся её до следующего размера
+    if window.replay_worker:
+        window.replay_worker.wait()
+    qt_app.processEvents()
+    return results
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Строки отчёта и число регрессий относительно эталона."""
+    rows = []
+    regressions = 0
+    for size, steps in results.items():
+        base_steps = baseline.get(size, {})
+        for step in STEPS:
+            current = steps[step]
+            base = base_steps.get(step)
+            verdict = ""
+            if base:
+                ratio = current / base
+                verdict = f"{ratio:>8.2f}x"
+                if ratio > 1 + threshold and (current - base) * 1000 > min_delta:
+                    verdict += "  РЕГРЕССИЯ"
+                    regressions += 1
+            base_text = f"{base * 1000:>12.1f}" if base else f"{'—':>12}"
+            rows.append(f"{size:>8}  {step:<24}{current * 1000:>12.1f}{base_text}{verdict}")
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Размеры истории")
+    parser.add_argument("--repeat", type=int, default=3, help="Повторов на шаг, берётся лучший")
+    parser.add_argument("--baseline", default="bench_app_baseline.json", help="Файл эталона")
+    parser.add_argument("--save-baseline", action="store_true", help="Записать результаты как новый эталон")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Допустимое замедление, доля")
+    parser.add_argument("--min-delta", type=float, default=2.0, help="Разница в мс, которую считаем шумом")
+    parser.add_argument("--output", help="Сохранить результаты этого запуска в JSON")
+    args = parser.parse_args(argv)
+
+    qt_app = QApplication.instance() or QApplication(sys.argv)
+    with mock.patch.object(QMessageBox, "exec", return_value=QMessageBox.Ok), \
+            mock.patch.object(QMessageBox, "information"), \
+            mock.patch.object(QMessageBox, "warning"):
+        window = create_window(make_payload(10))
+        results = {}
+        for count in args.sizes:
+            started = time.perf_counter()
+            results[str(count)] = bench_size(window, qt_app, count, args.repeat)
+            print(f"{count} вакансий: {time.perf_counter() - started:.1f} с", file=sys.stderr)
+
+    run = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pyside": PYSIDE_VERSION,
+        "machine": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8")).get("results", {})
+
+    rows, regressions = compare(results, baseline, args.threshold, args.min_delta)
+    print(f"{'Размер':>8}  {'Шаг':<24}{'сейчас, мс':>12}{'эталон, мс':>12}")
+    print("\n".join(rows))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(run, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.save_baseline or not baseline_path.exists():
+        baseline_path.write_text(json.dumps(run, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Эталон записан: {baseline_path}")
+    elif regressions:
+        print(f"Регрессий: {regressions} (порог {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
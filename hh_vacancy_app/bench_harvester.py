@@ -0,0 +1,142 @@
+"""Сравнение старого поштучного преобразования из hh_java_search.py с пакетным.
+
+    python bench_harvester.py --history 100000 --items 20000 100000
+
+Нормализация упирается в чтение полей из словарей ответа и пакетно
+выигрывает немного; основной выигрыш — в анти-джойне и сортировке
+истории. Поэтому смотреть нужно на «Итого» при большой истории.
+"""
+import sys
+import time
+import random
+import argparse
+
+import pandas as pd
+
+from harvester import items_to_frame, sort_report
+
+
+def make_items(count, start_id=0):
+    rnd = random.Random(42)
+    currencies = ["RUR", "USD", "EUR", "BYR", "KZT"]
+    items = []
+    for i in range(start_id, start_id + count):
+        salary = None
+        if rnd.random() < 0.6:
+            salary = {
+                "from": rnd.choice([None, rnd.randrange(50, 400) * 1000]),
+                "to": rnd.choice([None, rnd.randrange(400, 900) * 1000]),
+                "currency": rnd.choice(currencies)
+            }
+        items.append({
+            "id": str(i),
+            "name": f"Java разработчик {i}",
+            "employer": {"name": f"Компания {i % 5000}"},
+            "area": {"name": rnd.choice(["Москва", "Минск", "Санкт-Петербург", "Казань"])},
+            "salary": salary,
+            "published_at": f"2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T10:00:00+0300",
+            "alternate_url": f"https://hh.ru/vacancy/{i}"
+        })
+    return items
+
+
+def make_history(count):
+    history = items_to_frame(make_items(count))
+    history["Статус"] = "OLD"
+    return history
+
+
+def legacy_select(items, old_df):
+    """Копия исходного цикла из hh_java_search.py."""
+    old_links = set(old_df["Ссылка"].tolist()) if not old_df.empty else set()
+    current_vacancies = []
+    for item in items:
+        link = item.get("alternate_url")
+        if link not in old_links:
+            current_vacancies.append({
+                "Название": item.get("name"),
+                "Компания": item.get("employer", {}).get("name"),
+                "Город": item.get("area", {}).get("name"),
+                "Зарплата": (
+                    f"{item['salary']['from']} - {item['salary']['to']} {item['salary']['currency']}"
+                    if item.get("salary") else "не указана"
+                ),
+                "Дата публикации": item.get("published_at", "")[:10],
+                "Ссылка": link,
+                "Статус": "NEW"
+            })
+    return pd.DataFrame(current_vacancies)
+
+
+def legacy_sort(new_df):
+    new_df = new_df.copy()
+    new_df['_sort_status'] = new_df['Статус'].apply(lambda x: 0 if x == 'NEW' else 1)
+    return new_df.sort_values(
+        by=['_sort_status', 'Дата публикации'],
+        ascending=[True, False]
+    ).drop(columns=['_sort_status']).reset_index(drop=True)
+
+
+def batch_select(items, old_df):
+    return items_to_frame(items, known_links=old_df["Ссылка"])
+
+
+def best_of(func, repeat, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def run_stages(select, sort, items, old_df, repeat):
+    select_time, current_df = best_of(select, repeat, items, old_df)
+    merged = pd.concat([old_df, current_df], ignore_index=True)
+    sort_time, report = best_of(sort, repeat, merged)
+    return select_time, sort_time, report
+
+
+def compare(old_df, items_count, overlap, repeat):
+    # Часть текущей выдачи пересекается с историей, остальное — новые id
+    start = max(0, len(old_df) - int(items_count * overlap))
+    items = make_items(items_count, start_id=start)
+
+    legacy = run_stages(legacy_select, legacy_sort, items, old_df, repeat)
+    batch = run_stages(batch_select, sort_report, items, old_df, repeat)
+    legacy_df, batch_df = legacy[2], batch[2]
+
+    same = (
+        len(legacy_df) == len(batch_df)
+        and list(legacy_df["Ссылка"]) == list(batch_df["Ссылка"])
+        and legacy_df["Зарплата"].astype(str).tolist() == batch_df["Зарплата"].astype(str).tolist()
+    )
+    print(f"\nИстория: {len(old_df)} строк, выдача: {items_count} вакансий")
+    print(f"{'Этап':<24}{'поштучно, мс':>14}{'пакетно, мс':>14}{'ускорение':>12}")
+    for title, old_time, new_time in (
+        ("Нормализация + NEW/OLD", legacy[0], batch[0]),
+        ("Сортировка", legacy[1], batch[1]),
+        ("Итого", legacy[0] + legacy[1], batch[0] + batch[1]),
+    ):
+        print(f"{title:<24}{old_time * 1000:>14.1f}{new_time * 1000:>14.1f}{old_time / new_time:>11.1f}x")
+    print(f"Результаты совпадают: {'да' if same else 'НЕТ'}")
+    return same
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, default=100000, help="Строк в прошлом отчёте")
+    parser.add_argument("--items", type=int, nargs="+", default=[20000, 100000],
+                        help="Вакансий в текущем запуске (можно несколько)")
+    parser.add_argument("--overlap", type=float, default=0.5, help="Доля вакансий, уже бывших в отчёте")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    old_df = make_history(args.history)
+    results = [compare(old_df, count, args.overlap, args.repeat) for count in args.items]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,44 +1,187 @@
-import PyInstaller.__main__
+"""Сборка HH_Vacancy_App через PyInstaller.
+
+    python build_exe.py                     # один exe (--onefile), как раньше
+    python build_exe.py --profile fast      # папка (--onedir): быстрый запуск
+    python build_exe.py --profile fast --dry-run   # только показать параметры
+
+Профиль onefile удобно раздавать, но при каждом запуске exe заново
+распаковывает весь бандл во временную папку. Профиль fast собирается в
+папку, не жмёт библиотеки UPX, выкидывает пакеты, которые приложение не
+импортирует, и компилирует байткод с оптимизацией. Сравнить время запуска
+профилей: python measure_startup.py
+"""
 import os
 import sys
-from PIL import Image
+import ast
+import argparse
+import importlib.util
 
 # Получаем текущую директорию
 current_dir = os.path.dirname(os.path.abspath(__file__))
+ENTRY = "app.py"
+APP_NAME = "HH_Vacancy_App"
+
+PROFILES = {
+    "onefile": {"mode": "--onefile", "excludes": False, "optimize": 0, "upx": True},
+    "fast": {"mode": "--onedir", "excludes": True, "optimize": 1, "upx": False},
+}
+
+# Тяжёлые пакеты, которые PyInstaller может втянуть из окружения (requirements.txt общий с веб-частью).
+# Исключаются, только если приложение их действительно не импортирует.
+EXCLUDE_CANDIDATES = (
+    "pandas", "numpy", "openpyxl", "flask", "werkzeug", "jinja2", "markupsafe", "itsdangerous",
+    "PIL", "matplotlib", "scipy", "tkinter", "unittest", "pydoc", "xmlrpc", "lib2to3", "yaml",
+)
+QT_MODULE_PREFIX = "PySide6."
+
+
+def local_modules():
+    return {name[:-3] for name in os.listdir(current_dir) if name.endswith(".py")}
+
+
+def collect_imports(entry=ENTRY):
+    """Все импортируемые модули, начиная с entry и по локальным модулям рядом с ним.
+
+    Учитываются и импорты внутри функций (например, QtCharts грузится лениво).
+    """
+    local = local_modules()
+    seen_files = set()
+    imports = set()
+    queue = [entry[:-3]]
+    while queue:
+        module = queue.pop()
+        if module in seen_files:
+            continue
+        seen_files.add(module)
+        with open(os.path.join(current_dir, f"{module}.py"), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                imports.add(name)
+                top = name.split(".")[0]
+                # hh_vacancy_app.tracing и tracing — один и тот же локальный модуль
+                local_name = name.split(".")[-1] if top == "hh_vacancy_app" else top
+                if local_name in local:
+                    queue.append(local_name)
+    return imports
+
+
+def installed_qt_modules():
+    spec = importlib.util.find_spec("PySide6")
+    if not spec or not spec.submodule_search_locations:
+        return []
+    folder = spec.submodule_search_locations[0]
+    return sorted(
+        QT_MODULE_PREFIX + name.split(".")[0]
+        for name in os.listdir(folder)
+        if name.startswith("Qt") and name.endswith((".pyd", ".so", ".abi3.so"))
+    )
+
+
+def derive_excludes(imports):
+    """Кандидаты и модули PySide6, которых нет среди реальных импортов приложения."""
+    top_level = {name.split(".")[0] for name in imports}
+    excludes = [name for name in EXCLUDE_CANDIDATES if name not in top_level]
+    excludes += [name for name in installed_qt_modules() if name not in imports]
+    return excludes
+
+
+def pyinstaller_supports_optimize():
+    # --optimize появился в PyInstaller 6.6
+    try:
+        import PyInstaller
+    except ImportError:
+        return False
+    version = tuple(int(part) for part in PyInstaller.__version__.split(".")[:2] if part.isdigit())
+    return version >= (6, 6)
+
+
+def make_icon():
+    """Генерация icon.ico из icon.png"""
+    png_icon = os.path.join(current_dir, "icon.png")
+    ico_icon = os.path.join(current_dir, "icon.ico")
+    if os.path.exists(png_icon):
+        from PIL import Image
+        img = Image.open(png_icon)
+        img.save(ico_icon, sizes=[(16, 16), (32, 32), (48, 48), (256, 256)])
+        print("✅ icon.ico создан из icon.png")
+    return ico_icon
+
+
+def build_args(profile_name, ico_icon, optimize=None):
+    profile = PROFILES[profile_name]
+    # Определяем разделитель для --add-data в зависимости от ОС
+    separator = ';' if sys.platform == 'win32' else ':'
+    args = [
+        ENTRY,
+        f'--name={APP_NAME}',
+        profile["mode"],
+        '--windowed',
+        f'--add-data=icon.png{separator}.',
+        f'--add-data=qr-code.png{separator}.',
+        f'--icon={ico_icon}',
+        f'--distpath={os.path.join("dist", profile_name)}',
+        f'--workpath={os.path.join("build", profile_name)}',
+        '--clean',
+        '--noconfirm',
+    ]
+    if not profile["upx"]:
+        # Распаковка сжатых UPX библиотек — лишняя работа при каждом запуске
+        args.append('--noupx')
+    if profile["excludes"]:
+        args += [f'--exclude-module={name}' for name in derive_excludes(collect_imports())]
+    level = profile["optimize"] if optimize is None else optimize
+    if level:
+        if pyinstaller_supports_optimize():
+            args.append(f'--optimize={level}')
+        else:
+            print("⚠️ PyInstaller старше 6.6 не умеет --optimize, байткод собирается без оптимизации")
+    return args
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="onefile", help="Профиль сборки")
+    parser.add_argument("--optimize", type=int, choices=(0, 1, 2),
+                        help="Уровень оптимизации байткода (как python -O/-OO), по умолчанию из профиля")
+    parser.add_argument("--dry-run", action="store_true", help="Показать параметры PyInstaller и не собирать")
+    args = parser.parse_args(argv)
+
+    os.chdir(current_dir)
+    ico_icon = os.path.join(current_dir, "icon.ico") if args.dry_run else make_icon()
+
+    # Проверяем наличие файлов
+    qr_code_file = os.path.join(current_dir, "qr-code.png")
+    if os.path.exists(qr_code_file):
+        print(f"✅ QR-код найден: {qr_code_file}")
+    else:
+        print(f"⚠️ ВНИМАНИЕ: QR-код НЕ найден: {qr_code_file}")
+
+    pyinstaller_args = build_args(args.profile, ico_icon, args.optimize)
+    if args.dry_run:
+        print("pyinstaller " + " ".join(pyinstaller_args))
+        return
+
+    # Сборка
+    import PyInstaller.__main__
+    PyInstaller.__main__.run(pyinstaller_args)
+
+    exe = f"{APP_NAME}.exe" if sys.platform == "win32" else APP_NAME
+    if PROFILES[args.profile]["mode"] == "--onedir":
+        location = os.path.join("dist", args.profile, APP_NAME, exe)
+    else:
+        location = os.path.join("dist", args.profile, exe)
+    print("\n" + "=" * 60)
+    print(f"✅ Сборка завершена! Профиль: {args.profile}")
+    print(f"📁 Файл запуска: {location}")
+    print("=" * 60)
+
 
-# Генерация icon.ico из icon.png
-png_icon = os.path.join(current_dir, "icon.png")
-ico_icon = os.path.join(current_dir, "icon.ico")
-
-if os.path.exists(png_icon):
-    img = Image.open(png_icon)
-    img.save(ico_icon, sizes=[(16,16), (32,32), (48,48), (256,256)])
-    print("✅ icon.ico создан из icon.png")
-
-# Проверяем наличие файлов
-qr_code_file = os.path.join(current_dir, "qr-code.png")
-if os.path.exists(qr_code_file):
-    print(f"✅ QR-код найден: {qr_code_file}")
-else:
-    print(f"⚠️ ВНИМАНИЕ: QR-код НЕ найден: {qr_code_file}")
-
-# Определяем разделитель для --add-data в зависимости от ОС
-separator = ';' if sys.platform == 'win32' else ':'
-
-# Сборка
-PyInstaller.__main__.run([
-    'app.py',
-    '--name=HH_Vacancy_App',
-    '--onefile',
-    '--windowed',
-    f'--add-data=icon.png{separator}.',
-    f'--add-data=qr-code.png{separator}.',
-    f'--icon={ico_icon}',
-    '--clean',
-    '--noconfirm',
-])
-
-print("\n" + "="*60)
-print("✅ Сборка завершена!")
-print("📁 EXE файл находится в папке: dist/HH_Vacancy_App.exe")
-print("="*60)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
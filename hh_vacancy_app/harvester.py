@@ -0,0 +1,847 @@
+import os
+import re
+import sys
+import csv
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from hh_dictionaries import HHDictionaries
+except ImportError:  # импорт как hh_vacancy_app.harvester из корневого скрипта
+    from hh_vacancy_app.hh_dictionaries import HHDictionaries
+
+API_URL = "https://api.hh.ru/vacancies"
+USER_AGENT = os.getenv("HH_USER_AGENT", "HHScript/1.0 (harvester)")
+
+# Профиль по умолчанию повторяет параметры из hh_java_search.py
+DEFAULT_PROFILE = {
+    "name": "java_backend",
+    "query": "Java разработчик",
+    "exclude": [
+        "Android", "QA", "Тестировщик", "Аналитик", "C#", "архитектор",
+        "PHP", "Fullstack", "1С", "Python", "Frontend-разработчик"
+    ],
+    "area": [113, 16],  # Россия и Беларусь
+    "schedule": "remote",
+    "professional_role": 96,  # Java developer
+    "days": 1,
+    "per_page": 50
+}
+
+DETAILS_CACHE_DIR = os.getenv("HH_DETAILS_CACHE", ".hh_cache/details")
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Общий для всех потоков ограничитель запросов (token bucket)."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def make_session(pool_size=10):
+    """Сессия с пулом соединений, общая для всех профилей."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"]
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "HH-User-Agent": USER_AGENT})
+    return session
+
+
+def split_keywords(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [v.strip() for v in value if v and v.strip()]
+
+
+def _is_id(value):
+    return isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit())
+
+
+def resolve_ids(value, lookup):
+    """Имена регионов/ролей в профиле превращает в id через справочник."""
+    values = value if isinstance(value, (list, tuple)) else [value]
+    resolved = []
+    for v in values:
+        if _is_id(v):
+            resolved.append(int(v))
+        elif lookup is None:
+            raise ValueError(f"Для имени «{v}» нужен справочник hh.ru (HHDictionaries)")
+        else:
+            resolved.append(int(lookup(v)))
+    return resolved if isinstance(value, (list, tuple)) else resolved[0]
+
+
+def build_params(profile, dictionaries=None):
+    """Собирает параметры запроса к /vacancies из описания профиля.
+
+    area и professional_role можно задавать и id, и именами («Россия»,
+    «Программист, разработчик») — имена разрешаются по локальному справочнику.
+    """
+    text = profile.get("query") or DEFAULT_PROFILE["query"]
+    for word in split_keywords(profile.get("exclude")):
+        text += f" NOT {word}"
+
+    days = profile.get("days") or 1
+    params = {
+        "text": text,
+        "per_page": profile.get("per_page") or 50,
+        "page": 0,
+        "date_from": (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    for key in ("schedule", "experience", "employment", "search_field"):
+        if profile.get(key) is not None:
+            params[key] = profile[key]
+    if profile.get("area") is not None:
+        params["area"] = resolve_ids(profile["area"], dictionaries and dictionaries.area_id)
+    if profile.get("professional_role") is not None:
+        params["professional_role"] = resolve_ids(
+            profile["professional_role"], dictionaries and dictionaries.role_id
+        )
+    return params
+
+
+def fetch_page(session, limiter, params, page):
+    limiter.acquire()
+    resp = session.get(API_URL, params={**params, "page": page}, timeout=15)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def iter_pages(session, limiter, params, start_page=0):
+    """Отдаёт (номер страницы, данные) до последней страницы выдачи."""
+    page = start_page
+    while True:
+        data = fetch_page(session, limiter, params, page)
+        yield page, data
+        if data.get("pages") and page < data["pages"] - 1:
+            page += 1
+        else:
+            break
+
+
+def format_salary(salary, dictionaries=None):
+    if not salary:
+        return "не указана"
+    currency = salary.get("currency")
+    if dictionaries is not None:
+        currency = dictionaries.currency_label(currency)
+    return f"{salary.get('from')} - {salary.get('to')} {currency}"
+
+
+def normalize_item(item, dictionaries=None):
+    """Строка отчёта в том же виде, что и в hh_java_search.py, плюс id вакансии."""
+    return {
+        "id": str(item.get("id")),
+        "Название": item.get("name"),
+        "Компания": (item.get("employer") or {}).get("name"),
+        "Город": (item.get("area") or {}).get("name"),
+        "Зарплата": format_salary(item.get("salary"), dictionaries),
+        "Дата публикации": (item.get("published_at") or "")[:10],
+        "Ссылка": item.get("alternate_url")
+    }
+
+
+REPORT_COLUMNS = ["Название", "Компания", "Город", "Зарплата", "Дата публикации", "Ссылка", "Статус"]
+RUB_COLUMNS = ["Зарплата от, ₽", "Зарплата до, ₽"]
+
+
+def items_to_frame(items, known_links=None, dictionaries=None, rub_columns=False):
+    """Пакетная нормализация выдачи всего запуска в строки отчёта.
+
+    Значения те же, что у normalize_item. NEW/OLD определяется одним
+    анти-джойном по ссылке: вакансии из known_links отбрасываются до разбора
+    остальных полей. Дубликаты внутри выдачи сохраняются, как и в старом
+    цикле hh_java_search.py. Колонки собираются отдельными проходами по
+    списку и сразу передаются в DataFrame, без промежуточного словаря на
+    строку. pd.json_normalize и Series.str.get на выдаче hh.ru оказались
+    медленнее.
+
+    Для одной страницы (50–100 вакансий) DataFrame дороже самого разбора,
+    поэтому harvest_profile и потоковый сбор остаются на normalize_item.
+
+    С dictionaries валюта показывается знаком (₽, $). rub_columns=True
+    добавляет границы вилки в рублях по курсам из справочника; в Excel-отчёт
+    скрипта они не попадают, чтобы не менять его колонки.
+    """
+    rub_columns = rub_columns and dictionaries is not None
+    columns = REPORT_COLUMNS + (RUB_COLUMNS if rub_columns else [])
+    links = [item.get("alternate_url") for item in items]
+    if known_links is not None and len(known_links):
+        keep = ~pd.Series(links, dtype=object).isin(known_links).to_numpy()
+        if not keep.all():
+            items = [item for item, flag in zip(items, keep) if flag]
+            links = [link for link, flag in zip(links, keep) if flag]
+    if not items:
+        return pd.DataFrame(columns=columns)
+
+    salaries = [item.get("salary") for item in items]
+    frame = pd.DataFrame({
+        "Название": [item.get("name") for item in items],
+        "Компания": [(item.get("employer") or {}).get("name") for item in items],
+        "Город": [(item.get("area") or {}).get("name") for item in items],
+        "Зарплата": [format_salary(salary, dictionaries) for salary in salaries],
+        "Дата публикации": [(item.get("published_at") or "")[:10] for item in items],
+        "Ссылка": links,
+        "Статус": "NEW"
+    })
+    if rub_columns:
+        for column, bound in zip(RUB_COLUMNS, ("from", "to")):
+            rub = [dictionaries.to_rub(salary.get(bound), salary.get("currency")) if salary else None
+                   for salary in salaries]
+            frame[column] = pd.Series(rub, dtype="float64").round().to_numpy()
+    return frame
+
+
+def sort_report(df):
+    """Сначала NEW, затем по дате публикации (новые сверху)."""
+    if df.empty:
+        return df
+    status = (df["Статус"] != "NEW").to_numpy(dtype="int8")
+    # Даты вида YYYY-MM-DD: порядок кодов factorize(sort=True) совпадает с порядком строк
+    date_codes, _ = pd.factorize(df["Дата публикации"].fillna("").astype(str), sort=True)
+    order = np.lexsort((-date_codes, status))
+    return df.take(order).reset_index(drop=True)
+
+
+DETAIL_COLUMNS = ("description", "key_skills", "experience")
+
+
+def extract_details(detail):
+    """Поля из /vacancies/{id}, которых нет в выдаче списка."""
+    return {
+        "description": detail.get("description"),
+        "key_skills": ", ".join(s.get("name", "") for s in detail.get("key_skills") or []),
+        "experience": (detail.get("experience") or {}).get("name")
+    }
+
+
+class DetailCache:
+    """Дисковый кэш карточек вакансий.
+
+    Тела ответов лежат в objects/ под именем sha256 содержимого, index.json
+    хранит для каждого id хэш, ETag и время загрузки. Пока запись моложе ttl,
+    сеть не трогаем; после — перепроверяем через If-None-Match.
+    """
+
+    def __init__(self, cache_dir, ttl=24 * 3600):
+        self.root = Path(cache_dir)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.root / "index.json"
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.index = {}
+        if self.index_file.exists():
+            try:
+                self.index = json.loads(self.index_file.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Не удалось прочитать индекс кэша: {e}")
+
+    def _object_path(self, digest):
+        return self.objects / digest[:2] / f"{digest}.json"
+
+    def entry(self, vacancy_id):
+        with self.lock:
+            return self.index.get(str(vacancy_id))
+
+    def is_fresh(self, entry):
+        return bool(entry) and time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def load(self, entry):
+        try:
+            return json.loads(self._object_path(entry["hash"]).read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, vacancy_id, body, etag=None):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+        with self.lock:
+            self.index[str(vacancy_id)] = {"hash": digest, "etag": etag, "fetched_at": time.time()}
+
+    def touch(self, vacancy_id):
+        with self.lock:
+            entry = self.index.get(str(vacancy_id))
+            if entry:
+                entry["fetched_at"] = time.time()
+
+    def save(self):
+        with self.lock:
+            data = json.dumps(self.index, ensure_ascii=False)
+        tmp = self.index_file.with_suffix(".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, self.index_file)
+
+
+def fetch_detail(session, limiter, cache, vacancy_id):
+    """Возвращает (карточка или None, источник: cache / revalidated / fetched / missing)."""
+    entry = cache.entry(vacancy_id)
+    if cache.is_fresh(entry):
+        cached = cache.load(entry)
+        if cached is not None:
+            return cached, "cache"
+        entry = None
+
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    limiter.acquire()
+    resp = session.get(f"{API_URL}/{vacancy_id}", headers=headers, timeout=15)
+    if resp.status_code == 304 and entry:
+        cached = cache.load(entry)
+        if cached is not None:
+            cache.touch(vacancy_id)
+            return cached, "revalidated"
+        # Объект пропал с диска — забираем заново без условного запроса
+        limiter.acquire()
+        resp = session.get(f"{API_URL}/{vacancy_id}", timeout=15)
+    if resp.status_code == 404:
+        return None, "missing"
+    resp.raise_for_status()
+    cache.put(vacancy_id, resp.content, resp.headers.get("ETag"))
+    return resp.json(), "fetched"
+
+
+def enrich_vacancies(ids, session, limiter, cache, workers=8):
+    """Дозагружает карточки вакансий параллельно; свежие записи кэша в сеть не идут.
+
+    Возвращает ({id: поля карточки}, {источник: количество}).
+    """
+    details = {}
+    stats = {"cache": 0, "revalidated": 0, "fetched": 0, "missing": 0, "error": 0}
+    pending = []
+    for vacancy_id in dict.fromkeys(str(i) for i in ids):
+        entry = cache.entry(vacancy_id)
+        cached = cache.load(entry) if cache.is_fresh(entry) else None
+        if cached is not None:
+            details[vacancy_id] = extract_details(cached)
+            stats["cache"] += 1
+        else:
+            pending.append(vacancy_id)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(fetch_detail, session, limiter, cache, vacancy_id): vacancy_id
+                for vacancy_id in pending
+            }
+            for future in as_completed(futures):
+                vacancy_id = futures[future]
+                try:
+                    detail, source = future.result()
+                except Exception as e:
+                    logger.warning(f"Не удалось загрузить вакансию {vacancy_id}: {e}")
+                    stats["error"] += 1
+                    continue
+                stats[source] += 1
+                if detail is not None:
+                    details[vacancy_id] = extract_details(detail)
+        cache.save()
+    return details, stats
+
+
+def profile_table(name):
+    slug = re.sub(r"\W+", "_", str(name).lower()).strip("_") or "profile"
+    return f"profile_{slug}"
+
+
+class HarvestStore:
+    """Общее SQLite-хранилище: вакансии хранятся один раз, профили ссылаются на них.
+
+    Таблица vacancies служит межпрофильным индексом дедупликации,
+    у каждого профиля своя таблица profile_<name> со статусами NEW/OLD.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vacancies (
+                    id TEXT PRIMARY KEY,
+                    name TEXT,
+                    employer TEXT,
+                    area TEXT,
+                    salary TEXT,
+                    published_at TEXT,
+                    link TEXT,
+                    first_profile TEXT,
+                    first_seen TEXT
+                )
+                """
+            )
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(vacancies)")}
+            for column in DETAIL_COLUMNS:
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE vacancies ADD COLUMN {column} TEXT")
+
+    def ensure_profile(self, name):
+        table = profile_table(name)
+        with self.lock, self.conn:
+            self.conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    vacancy_id TEXT PRIMARY KEY REFERENCES vacancies(id),
+                    status TEXT NOT NULL,
+                    found_at TEXT
+                )
+                """
+            )
+        return table
+
+    def start_run(self, name):
+        """Как и в скрипте: всё, что было найдено раньше, становится OLD."""
+        table = self.ensure_profile(name)
+        with self.lock, self.conn:
+            self.conn.execute(f"UPDATE {table} SET status = 'OLD'")
+        return table
+
+    def known_ids(self, ids):
+        ids = list(ids)
+        if not ids:
+            return set()
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT id FROM vacancies WHERE id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def add_page(self, name, ids, rows):
+        """Сохраняет страницу профиля.
+
+        ids — все вакансии страницы, rows — нормализованные строки только для
+        вакансий, которых ещё нет в хранилище. Возвращает (новых для профиля,
+        впервые сохранено).
+        """
+        table = profile_table(name)
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO vacancies "
+                "(id, name, employer, area, salary, published_at, link, first_profile, first_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (r["id"], r["Название"], r["Компания"], r["Город"], r["Зарплата"],
+                     r["Дата публикации"], r["Ссылка"], name, now)
+                    for r in rows
+                ]
+            )
+            stored = self.conn.total_changes - before
+
+            before = self.conn.total_changes
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO {table} (vacancy_id, status, found_at) VALUES (?, 'NEW', ?)",
+                [(vacancy_id, now) for vacancy_id in ids]
+            )
+            added = self.conn.total_changes - before
+        return added, stored
+
+    def update_details(self, details):
+        """details: {id: {"description", "key_skills", "experience"}}."""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "UPDATE vacancies SET description = ?, key_skills = ?, experience = ? WHERE id = ?",
+                [
+                    (d.get("description"), d.get("key_skills"), d.get("experience"), vacancy_id)
+                    for vacancy_id, d in details.items()
+                ]
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def harvest_profile(profile, session, limiter, store, dictionaries=None):
+    name = profile["name"]
+    params = build_params(profile, dictionaries)
+    store.start_run(name)
+
+    added_total = 0
+    stored_total = 0
+    seen_ids = set()
+    for page, data in iter_pages(session, limiter, params):
+        items = data.get("items", [])
+        ids = [str(item.get("id")) for item in items]
+        seen_ids.update(ids)
+        # Вакансии, уже известные по другим профилям, повторно не нормализуем и не сохраняем
+        known = store.known_ids(ids)
+        rows = [normalize_item(item, dictionaries) for item, vacancy_id in zip(items, ids) if vacancy_id not in known]
+        added, stored = store.add_page(name, ids, rows)
+        added_total += added
+        stored_total += stored
+        logger.info(f"[{name}] страница {page + 1}: новых {added}")
+
+    return {"profile": name, "new": added_total, "stored": stored_total, "ids": seen_ids}
+
+
+STREAM_FIELDS = ["id", "Название", "Компания", "Город", "Зарплата", "Дата публикации", "Ссылка", "Статус"]
+
+
+class StreamWriter:
+    """Дописывает строки в NDJSON или CSV сразу после каждой страницы.
+
+    Раз в fsync_every страниц данные сбрасываются на диск и рядом
+    обновляется файл состояния <out>.state.json с номером последней
+    записанной страницы — по нему прерванный запуск продолжается.
+    """
+
+    def __init__(self, path, fmt=None, fsync_every=5):
+        self.path = Path(path)
+        self.fmt = fmt or ("csv" if self.path.suffix.lower() == ".csv" else "ndjson")
+        self.state_path = self.path.with_name(self.path.name + ".state.json")
+        self.fsync_every = max(1, fsync_every)
+        self.pages_since_sync = 0
+        self.last_page = None
+        self.file = None
+        self.csv_writer = None
+
+    def read_state(self):
+        if not self.state_path.exists():
+            return None
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+
+    def existing_ids(self):
+        """id уже записанных вакансий; недописанную последнюю строку отрезает."""
+        ids = set()
+        if not self.path.exists():
+            return ids
+        with open(self.path, "rb+") as f:
+            valid_end = 0
+            lines = []
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                valid_end += len(raw)
+                lines.append(raw.decode("utf-8"))
+                if len(lines) >= 10000:
+                    self._collect_ids(lines, ids)
+                    lines = []
+            self._collect_ids(lines, ids)
+            if valid_end < f.seek(0, os.SEEK_END):
+                f.truncate(valid_end)
+        return ids
+
+    def _collect_ids(self, lines, ids):
+        if self.fmt == "csv":
+            for row in csv.reader(lines):
+                # Первая колонка — id, заголовок пропускаем
+                if row and row[0] and row[0] != "id":
+                    ids.add(row[0])
+        else:
+            for line in lines:
+                try:
+                    ids.add(str(json.loads(line)["id"]))
+                except (ValueError, KeyError):
+                    continue
+
+    def open(self, state):
+        self.state = state
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        self.file = open(self.path, "a", encoding="utf-8", newline="")
+        if self.fmt == "csv":
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=STREAM_FIELDS, extrasaction="ignore")
+            if is_new:
+                self.csv_writer.writeheader()
+
+    def write_page(self, page, rows):
+        for row in rows:
+            if self.csv_writer:
+                self.csv_writer.writerow(row)
+            else:
+                self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.last_page = page
+        self.pages_since_sync += 1
+        if self.pages_since_sync >= self.fsync_every:
+            self.sync()
+
+    def sync(self, complete=False):
+        if self.file is None:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pages_since_sync = 0
+        # Состояние пишется только после fsync данных, иначе возобновление пропустит страницы
+        state = {**self.state, "last_page": self.last_page, "complete": complete}
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def close(self, complete=False):
+        if self.file is None:
+            return
+        self.sync(complete=complete)
+        self.file.close()
+        self.file = None
+
+
+def normalize_pages(pages, dictionaries=None):
+    for page, data in pages:
+        yield page, [normalize_item(item, dictionaries) for item in data.get("items", [])]
+
+
+def dedup_pages(pages, seen):
+    """Пропускает вакансии, которые уже есть в выходном файле или встречались выше по потоку."""
+    for page, rows in pages:
+        fresh = []
+        for row in rows:
+            if row["id"] in seen:
+                continue
+            seen.add(row["id"])
+            row["Статус"] = "NEW"
+            fresh.append(row)
+        yield page, fresh
+
+
+def stream_profile(profile, out_path, fmt=None, session=None, limiter=None, fsync_every=5,
+                   dictionaries=None):
+    """Потоковый сбор одного профиля: fetch -> normalize -> dedup -> write.
+
+    Память не растёт с размером выдачи, а после сбоя повторный запуск с тем
+    же файлом продолжает со страницы, следующей за последней сохранённой.
+    """
+    own_session = session is None
+    session = session or make_session(pool_size=1)
+    if dictionaries is None:
+        dictionaries = HHDictionaries(session=session).load()
+    writer = StreamWriter(out_path, fmt, fsync_every)
+    params = build_params(profile, dictionaries)
+    query_key = {k: v for k, v in params.items() if k not in ("page", "date_from")}
+
+    start_page = 0
+    state = writer.read_state()
+    if state and not state.get("complete") and state.get("query") == json.loads(json.dumps(query_key)):
+        # Продолжаем прерванный запуск с теми же date_from, чтобы выдача совпала
+        params["date_from"] = state["date_from"]
+        if state.get("last_page") is not None:
+            start_page = state["last_page"] + 1
+        logger.info(f"Продолжаем с страницы {start_page + 1}")
+
+    seen = writer.existing_ids()
+    limiter = limiter or RateLimiter(5)
+    written = 0
+    writer.open({"query": query_key, "date_from": params["date_from"]})
+    try:
+        pipeline = dedup_pages(normalize_pages(iter_pages(session, limiter, params, start_page), dictionaries), seen)
+        for page, rows in pipeline:
+            writer.write_page(page, rows)
+            written += len(rows)
+            logger.info(f"Страница {page + 1}: записано {len(rows)}")
+        writer.close(complete=True)
+    finally:
+        writer.close()
+        if own_session:
+            session.close()
+    return {"profile": profile["name"], "new": written, "resumed_from": start_page}
+
+
+def load_config(path):
+    """Читает YAML или JSON со списком профилей."""
+    with open(path, encoding="utf-8") as f:
+        raw = f.read()
+    if str(path).lower().endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError("Для YAML-конфигурации установите PyYAML или используйте JSON")
+        config = yaml.safe_load(raw) or {}
+    else:
+        config = json.loads(raw)
+
+    if isinstance(config, list):
+        config = {"profiles": config}
+    defaults = config.get("defaults") or {}
+    profiles = []
+    seen = set()
+    for entry in config.get("profiles") or []:
+        profile = {**DEFAULT_PROFILE, **defaults, **entry}
+        table = profile_table(profile["name"])
+        if table in seen:
+            raise ValueError(f"Повторяющееся имя профиля: {profile['name']}")
+        seen.add(table)
+        profiles.append(profile)
+    if not profiles:
+        raise ValueError("В конфигурации нет ни одного профиля")
+    config["profiles"] = profiles
+    return config
+
+
+def run_batch(config, store_path=None, workers=None, rate=None, enrich=None):
+    """Запускает все профили параллельно с общим лимитом запросов и пулом соединений.
+
+    enrich — None или словарь с ключами cache_dir, ttl_hours, workers: после
+    сбора списков дозагружает карточки найденных вакансий через DetailCache.
+    """
+    profiles = config["profiles"]
+    workers = workers or config.get("workers") or min(8, len(profiles))
+    rate = rate or config.get("rate_limit") or 5
+    if enrich is None and config.get("enrich"):
+        enrich = config["enrich"] if isinstance(config["enrich"], dict) else {}
+    enrich_workers = (enrich or {}).get("workers") or 8
+    store = HarvestStore(store_path or config.get("store") or "harvest.sqlite")
+    session = make_session(pool_size=max(workers, enrich_workers if enrich is not None else 0))
+    limiter = RateLimiter(rate)
+
+    results = []
+    try:
+        # Справочники грузятся один раз на запуск (обычно из дискового кэша)
+        dictionaries = HHDictionaries(session=session).load()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(harvest_profile, profile, session, limiter, store, dictionaries): profile["name"]
+                for profile in profiles
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"[{name}] ошибка: {e}")
+                    results.append({"profile": name, "error": str(e)})
+
+        if enrich is not None:
+            ids = set()
+            for result in results:
+                ids.update(result.get("ids", ()))
+            cache = DetailCache(
+                enrich.get("cache_dir") or DETAILS_CACHE_DIR,
+                ttl=float(enrich.get("ttl_hours") or 24) * 3600
+            )
+            details, stats = enrich_vacancies(ids, session, limiter, cache, workers=enrich_workers)
+            store.update_details(details)
+            logger.info(f"Карточки вакансий: {stats}")
+            results.append({"profile": "enrich", "stats": stats})
+    finally:
+        session.close()
+        store.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сбор вакансий hh.ru по нескольким профилям")
+    parser.add_argument("--config", help="YAML/JSON файл с профилями")
+    parser.add_argument("--store", help="Путь к SQLite-хранилищу (по умолчанию из конфига)")
+    parser.add_argument("--workers", type=int, help="Количество параллельных профилей")
+    parser.add_argument("--rate", type=float, help="Запросов в секунду на все профили")
+    parser.add_argument("--enrich", action="store_true",
+                        help="Дозагрузить описание, ключевые навыки и опыт из /vacancies/{id}")
+    parser.add_argument("--cache-dir", help=f"Кэш карточек вакансий (по умолчанию {DETAILS_CACHE_DIR})")
+    parser.add_argument("--details-ttl", type=float, help="Сколько часов карточка считается свежей")
+    parser.add_argument("--stream", metavar="OUT",
+                        help="Потоковый режим: писать вакансии сразу в NDJSON/CSV файл")
+    parser.add_argument("--format", choices=["ndjson", "csv"],
+                        help="Формат потокового вывода (по умолчанию по расширению файла)")
+    parser.add_argument("--profile", help="Профиль из --config для потокового режима")
+    parser.add_argument("--fsync-every", type=int, default=5, help="fsync каждые N страниц")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.stream:
+        return stream_main(args)
+    if not args.config:
+        parser.error("укажите --config для пакетного режима или --stream для потокового")
+
+    config = load_config(args.config)
+    print("=" * 60)
+    print(f"Запуск пакетного сбора: {len(config['profiles'])} профилей")
+    print("=" * 60)
+
+    enrich = None
+    if args.enrich or args.cache_dir or args.details_ttl:
+        enrich = dict(config.get("enrich") or {}) if isinstance(config.get("enrich"), dict) else {}
+        if args.cache_dir:
+            enrich["cache_dir"] = args.cache_dir
+        if args.details_ttl:
+            enrich["ttl_hours"] = args.details_ttl
+
+    results = run_batch(config, args.store, args.workers, args.rate, enrich)
+    for result in sorted(results, key=lambda r: r["profile"]):
+        if "stats" in result:
+            stats = result["stats"]
+            print(f"Карточки: из кэша {stats['cache']}, подтверждено ETag {stats['revalidated']}, "
+                  f"загружено {stats['fetched']}, снято с публикации {stats['missing']}, ошибок {stats['error']}")
+        elif "error" in result:
+            print(f"{result['profile']}: ОШИБКА {result['error']}")
+        else:
+            print(f"{result['profile']}: новых {result['new']}, впервые сохранено {result['stored']}")
+    return 0 if all("error" not in r for r in results) else 1
+
+
+def stream_main(args):
+    profile = dict(DEFAULT_PROFILE)
+    if args.config:
+        profiles = load_config(args.config)["profiles"]
+        if args.profile:
+            matches = [p for p in profiles if p["name"] == args.profile]
+            if not matches:
+                print(f"Профиль {args.profile} не найден в {args.config}")
+                return 1
+            profile = matches[0]
+        else:
+            profile = profiles[0]
+
+    print("=" * 60)
+    print(f"Потоковый сбор профиля {profile['name']} в {args.stream}")
+    print("=" * 60)
+    result = stream_profile(profile, args.stream, args.format,
+                            limiter=RateLimiter(args.rate or 5), fsync_every=args.fsync_every)
+    print(f"Записано {result['new']} новых вакансий")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import logging
+from pathlib import Path
+
+import requests
+
+HH_API_URL = "https://api.hh.ru"
+DICTIONARY_NAMES = ("areas", "professional_roles", "dictionaries")
+DICTIONARIES_CACHE_DIR = os.getenv("HH_DICTIONARIES_CACHE", ".hh_cache/dictionaries")
+FIXTURE_FILE = Path(__file__).with_name("fixtures") / "hh_dictionaries.json"
+
+logger = logging.getLogger(__name__)
+
+
+class HHDictionaries:
+    """Справочники hh.ru: регионы, профессиональные роли и валюты.
+
+    Каждый справочник скачивается один раз и хранится на диске ttl секунд.
+    После load() все поиски идут по словарям в памяти, без запросов в сеть:
+    имя -> id, id -> имя, регион -> все вложенные регионы, валюта -> курс.
+    """
+
+    def __init__(self, cache_dir=DICTIONARIES_CACHE_DIR, ttl=7 * 24 * 3600, session=None):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.session = session
+        self.raw = {}
+
+    @classmethod
+    def from_fixture(cls, path=FIXTURE_FILE):
+        """Офлайн-набор из fixtures/ для тестов и запуска без сети."""
+        instance = cls(cache_dir=Path(path).parent)
+        instance.raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        instance.build_indexes()
+        return instance
+
+    def load(self, force=False):
+        for name in DICTIONARY_NAMES:
+            self.raw[name] = self._load_one(name, force)
+        self.build_indexes()
+        return self
+
+    def _cache_file(self, name):
+        return self.cache_dir / f"{name}.json"
+
+    def _load_one(self, name, force):
+        cache_file = self._cache_file(name)
+        cached = None
+        if cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text(encoding="utf-8"))
+            except ValueError:
+                cached = None
+        if cached and not force and time.time() - cached.get("fetched_at", 0) < self.ttl:
+            return cached["data"]
+
+        try:
+            session = self.session or requests
+            resp = session.get(f"{HH_API_URL}/{name}", timeout=15)
+            resp.raise_for_status()
+            data = resp.json()
+        except requests.exceptions.RequestException as e:
+            # Устаревший кэш лучше, чем ничего; в крайнем случае — встроенный набор
+            if cached:
+                logger.warning(f"Справочник {name} не обновлён, используем кэш: {e}")
+                return cached["data"]
+            logger.warning(f"Справочник {name} недоступен, используем встроенный набор: {e}")
+            return json.loads(FIXTURE_FILE.read_text(encoding="utf-8"))[name]
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"fetched_at": time.time(), "data": data}, ensure_ascii=False),
+                       encoding="utf-8")
+        os.replace(tmp, cache_file)
+        return data
+
+    def build_indexes(self):
+        self.area_names = {}
+        self.area_parent = {}
+        self.area_children = {}
+        self.area_depth = {}
+        self.area_ids_by_name = {}
+        stack = [(area, 0) for area in self.raw.get("areas") or []]
+        while stack:
+            area, depth = stack.pop()
+            area_id = str(area["id"])
+            self.area_names[area_id] = area["name"]
+            self.area_parent[area_id] = area.get("parent_id") and str(area["parent_id"])
+            self.area_depth[area_id] = depth
+            self.area_ids_by_name.setdefault(area["name"].lower(), []).append(area_id)
+            children = area.get("areas") or []
+            self.area_children[area_id] = [str(child["id"]) for child in children]
+            stack.extend((child, depth + 1) for child in children)
+        # При совпадении имён («Октябрьский») первым идёт самый крупный регион
+        for ids in self.area_ids_by_name.values():
+            ids.sort(key=lambda i: (self.area_depth[i], int(i) if i.isdigit() else 0))
+        self._descendants = {}
+
+        self.role_names = {}
+        self.role_ids_by_name = {}
+        for category in (self.raw.get("professional_roles") or {}).get("categories", []):
+            for role in category.get("roles", []):
+                role_id = str(role["id"])
+                self.role_names[role_id] = role["name"]
+                self.role_ids_by_name.setdefault(role["name"].lower(), role_id)
+
+        self.currency_rates = {}
+        self.currency_labels = {}
+        for currency in (self.raw.get("dictionaries") or {}).get("currency", []):
+            self.currency_rates[currency["code"]] = float(currency.get("rate") or 0)
+            self.currency_labels[currency["code"]] = currency.get("abbr") or currency["code"]
+
+    def area_id(self, value):
+        """id региона по имени или id; неизвестное значение — ValueError."""
+        value = str(value).strip()
+        if value in self.area_names:
+            return value
+        ids = self.area_ids_by_name.get(value.lower())
+        if not ids:
+            raise ValueError(f"Неизвестный регион: {value}")
+        return ids[0]
+
+    def area_descendants(self, area_id):
+        """Все регионы, вложенные в area_id (без него самого)."""
+        area_id = self.area_id(area_id)
+        if area_id not in self._descendants:
+            result = set()
+            stack = list(self.area_children.get(area_id, []))
+            while stack:
+                child = stack.pop()
+                result.add(child)
+                stack.extend(self.area_children.get(child, []))
+            self._descendants[area_id] = frozenset(result)
+        return self._descendants[area_id]
+
+    def role_id(self, value):
+        value = str(value).strip()
+        if value in self.role_names:
+            return value
+        role_id = self.role_ids_by_name.get(value.lower())
+        if role_id is None:
+            raise ValueError(f"Неизвестная профессиональная роль: {value}")
+        return role_id
+
+    def currency_label(self, code):
+        return self.currency_labels.get(code, code)
+
+    def to_rub(self, amount, currency):
+        """Перевод в рубли по курсу hh.ru (rate — сколько единиц валюты за 1 рубль)."""
+        rate = self.currency_rates.get(currency)
+        if amount is None or not rate:
+            return None
+        return amount / rate
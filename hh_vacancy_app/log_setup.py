@@ -0,0 +1,150 @@
+"""Логирование без дисковых операций в GUI-потоке.
+
+Записи из любого потока кладутся в очередь (QueueHandler), а в файл и в
+консоль их пишет фоновый поток QueueListener. Файл ротируется по размеру,
+старые части сжимаются в app.log.1.gz, app.log.2.gz...
+Сообщения горячих путей (перерисовка таблицы и графиков, SSE) пишутся в
+логгер HOT_LOGGER, и только он ограничен по частоте.
+
+    HH_LOG_LEVEL=DEBUG app.exe      # уровень, по умолчанию INFO
+    HH_LOG_CONSOLE=0 app.exe        # без вывода в консоль
+"""
+import os
+import sys
+import gzip
+import time
+import queue
+import atexit
+import shutil
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+HOT_LOGGER = "hh_vacancy.hot"
+RATE_LIMIT = 20  # записей HOT_LOGGER ниже ERROR с одной строки кода...
+RATE_PERIOD = 10.0  # ...за столько секунд
+
+
+class GzipRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler, который сжимает отработавшие части в .gz."""
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+
+    def rotation_filename(self, default_name):
+        return default_name + ".gz"
+
+    def rotate(self, source, dest):
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+
+class RateLimitFilter(logging.Filter):
+    """Не больше rate записей за period секунд с одного места в коде.
+
+    ERROR и выше проходят всегда. Первая запись после паузы сообщает,
+    сколько похожих было пропущено; оставшиеся к выходу счётчики
+    дописывает flush_suppressed.
+    """
+
+    def __init__(self, rate=RATE_LIMIT, period=RATE_PERIOD):
+        super().__init__()
+        self.rate = rate
+        self.period = period
+        self.lock = threading.Lock()
+        self.sites = {}  # (файл, строка) -> [начало окна, записей в окне, пропущено, последняя пропущенная]
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None or now - site[0] >= self.period:
+                site = self.sites[key] = [now, 0, site[2] if site else 0, None]
+            site[1] += 1
+            if site[1] > self.rate:
+                site[2] += 1
+                site[3] = record
+                return False
+            suppressed, site[2], site[3] = site[2], 0, None
+        if suppressed:
+            record.msg = f"{record.getMessage()} (пропущено похожих: {suppressed})"
+            record.args = None
+        return True
+
+    def take_suppressed(self):
+        """[(последняя пропущенная запись, сколько пропущено)] со сбросом счётчиков."""
+        with self.lock:
+            pending = [(site[3], site[2]) for site in self.sites.values() if site[2]]
+            for site in self.sites.values():
+                site[2], site[3] = 0, None
+        return pending
+
+
+def flush_suppressed(rate_filter):
+    """Пишет в лог, сколько записей фильтр пропустил и так и не сообщил."""
+    root = logging.getLogger()
+    for record, count in rate_filter.take_suppressed():
+        record.msg = f"{record.getMessage()} (последняя из {count} пропущенных похожих)"
+        record.args = None
+        # Мимо фильтра HOT_LOGGER — сразу в обработчики корневого логгера
+        root.handle(record)
+
+
+def parse_level(value, default=logging.INFO):
+    if not value:
+        return default
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.strip().upper())
+    return level if isinstance(level, int) else default
+
+
+def setup_logging(log_file, level=None, console=None):
+    """Вешает на корневой логгер QueueHandler и запускает QueueListener; возвращает listener."""
+    if level is None:
+        level = parse_level(os.getenv("HH_LOG_LEVEL"))
+    if console is None:
+        console = os.getenv("HH_LOG_CONSOLE", "1") != "0"
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [GzipRotatingFileHandler(str(log_file))]
+    # В оконной сборке PyInstaller stdout нет
+    if console and sys.stdout is not None:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    hot = logging.getLogger(HOT_LOGGER)
+    for old in [f for f in hot.filters if isinstance(f, RateLimitFilter)]:
+        hot.removeFilter(old)
+    rate_filter = RateLimitFilter()
+    hot.addFilter(rate_filter)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.rate_filter = rate_filter
+    listener.start()
+    atexit.register(stop_listener, listener)
+    return listener
+
+
+def stop_listener(listener):
+    """Дописывает очередь и останавливает поток; повторный вызов ничего не делает."""
+    if listener._thread is not None:
+        flush_suppressed(listener.rate_filter)
+        listener.stop()
@@ -0,0 +1,175 @@
+"""Время запуска собранных профилей: от старта процесса до первого кадра окна.
+
+    python measure_startup.py                            # все сборки из dist/ (build_exe.py --profile ...)
+    python measure_startup.py --source --runs 5          # плюс запуск из исходников
+    python measure_startup.py dist/fast/HH_Vacancy_App/HH_Vacancy_App.exe --mock
+
+Приложение запускается с HH_STARTUP_REPORT и HH_EXIT_AFTER_STARTUP=1: после
+первого кадра оно пишет фазы запуска в JSON и закрывается. «Снаружи» — время
+до первой строки app.py: загрузчик, распаковка onefile, старт интерпретатора.
+С --mock рядом поднимается mock_server и отдельная папка данных, чтобы
+сеть и история пользователя не влияли на цифры. Без --mock приложение
+должно быть закрыто: на одну папку данных запускается один экземпляр.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+APP_NAME = "HH_Vacancy_App"
+
+
+def discover_targets():
+    """Сборки build_exe.py: dist/<профиль>/HH_Vacancy_App[.exe] и dist/<профиль>/HH_Vacancy_App/..."""
+    exe = f"{APP_NAME}.exe" if sys.platform == "win32" else APP_NAME
+    targets = {}
+    for profile_dir in sorted(glob.glob(os.path.join(current_dir, "dist", "*"))):
+        for candidate in (os.path.join(profile_dir, exe), os.path.join(profile_dir, APP_NAME, exe)):
+            if os.path.isfile(candidate):
+                targets[os.path.basename(profile_dir)] = [candidate]
+    return targets
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock_server(vacancies):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(current_dir, "mock_server.py"), "--port", str(port), "--vacancies", str(vacancies)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return server, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("mock_server не запустился")
+
+
+def mock_environment(url):
+    appdata = tempfile.mkdtemp(prefix="hh_startup_")
+    os.makedirs(os.path.join(appdata, "HH_Vacancy"), exist_ok=True)
+    with open(os.path.join(appdata, "HH_Vacancy", "auth.json"), "w", encoding="utf-8") as f:
+        json.dump({"token": "measure"}, f)
+    return {"APPDATA": appdata, "AUTH_SERVICE_URL": url, "VACANCY_SERVICE_URL": url}
+
+
+def run_once(command, env, timeout):
+    """(секунд от старта процесса до отчёта, отчёт приложения) или None по таймауту."""
+    fd, report_path = tempfile.mkstemp(suffix=".json", prefix="startup_")
+    os.close(fd)
+    os.remove(report_path)
+    env = dict(env, HH_STARTUP_REPORT=report_path, HH_EXIT_AFTER_STARTUP="1", HH_LOG_CONSOLE="0")
+    started = time.perf_counter()
+    proc = subprocess.Popen(command, env=env, cwd=os.path.dirname(command[-1]) or None,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wall = None
+    while time.perf_counter() - started < timeout:
+        if os.path.exists(report_path):
+            wall = time.perf_counter() - started
+            break
+        if proc.poll() is not None:
+            break
+        time.sleep(0.01)
+    try:
+        proc.wait(10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    if wall is None:
+        return None
+    with open(report_path, encoding="utf-8") as f:
+        report = json.load(f)
+    os.remove(report_path)
+    return wall, report
+
+
+def summarize(name, runs):
+    walls = [wall * 1000 for wall, _ in runs]
+    inside = [report["total_ms"] for _, report in runs]
+    outside = [w - i for w, i in zip(walls, inside)]
+    return {
+        "target": name,
+        "runs": len(runs),
+        "wall_ms": {"median": round(statistics.median(walls)), "min": round(min(walls)), "max": round(max(walls))},
+        "outside_ms": round(statistics.median(outside)),
+        "inside_ms": round(statistics.median(inside)),
+        "phases_ms": {
+            phase["phase"]: round(statistics.median(
+                next(p["ms"] for p in report["phases"] if p["phase"] == phase["phase"]) for _, report in runs))
+            for phase in runs[0][1]["phases"]
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", help="Пути к exe; по умолчанию все сборки из dist/")
+    parser.add_argument("--source", action="store_true", help="Добавить запуск python app.py")
+    parser.add_argument("--runs", type=int, default=5, help="Замеров на цель, берётся медиана")
+    parser.add_argument("--warmup", type=int, default=1, help="Запусков до замера (прогрев дискового кэша)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Сколько ждать первого кадра, с")
+    parser.add_argument("--mock", action="store_true", help="Запускать против mock_server в отдельной папке данных")
+    parser.add_argument("--vacancies", type=int, default=1000, help="Вакансий в mock_server")
+    parser.add_argument("--output", help="Сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    targets = {os.path.basename(path): [os.path.abspath(path)] for path in args.targets} or discover_targets()
+    if args.source:
+        targets["source"] = [sys.executable, os.path.join(current_dir, "app.py")]
+    if not targets:
+        print("Нет сборок в dist/: соберите python build_exe.py --profile onefile / --profile fast")
+        return 1
+
+    env = dict(os.environ)
+    server = None
+    if args.mock:
+        server, url = start_mock_server(args.vacancies)
+        env.update(mock_environment(url))
+
+    results = []
+    try:
+        for name, command in targets.items():
+            for _ in range(args.warmup):
+                run_once(command, env, args.timeout)
+            runs = [run for run in (run_once(command, env, args.timeout) for _ in range(args.runs)) if run]
+            if not runs:
+                print(f"{name}: окно не показалось за {args.timeout:g} с")
+                continue
+            results.append(summarize(name, runs))
+            print(f"{name}: {len(runs)} замеров", file=sys.stderr)
+    finally:
+        if server:
+            server.kill()
+
+    print(f"{'Цель':<16}{'до кадра, мс':>14}{'мин':>8}{'макс':>8}{'снаружи':>10}{'внутри':>9}")
+    for result in results:
+        wall = result["wall_ms"]
+        print(f"{result['target']:<16}{wall['median']:>14}{wall['min']:>8}{wall['max']:>8}"
+              f"{result['outside_ms']:>10}{result['inside_ms']:>9}")
+    for result in results:
+        phases = ", ".join(f"{phase} {ms}" for phase, ms in result["phases_ms"].items())
+        print(f"{result['target']}: {phases}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,660 @@
+"""Локальная замена серверов авторизации и вакансий для нагрузочных проверок без продакшена.
+
+    python mock_server.py --port 8765 --vacancies 20000 --latency 80 --jitter 30 --error-rate 0.02
+    python mock_server.py --sse-interval 0.5 --sse-batch 20 --no-batch
+
+Затем запустить приложение с
+    AUTH_SERVICE_URL=http://127.0.0.1:8765 VACANCY_SERVICE_URL=http://127.0.0.1:8765
+
+Вход через Telegram подтверждается сразу, любой Bearer-токен считается
+действительным и принадлежит администратору. Данные генерируются из --seed,
+так что один и тот же сценарий воспроизводится от запуска к запуску.
+"""
+import re
+import sys
+import json
+import time
+import uuid
+import random
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+PLANS = ("TRIAL", "MONTHLY", "YEARLY", "LIFETIME")
+PAYMENT_STATUSES = ("PENDING", "VERIFIED", "REJECTED")
+CITIES = ("Москва", "Минск", "Санкт-Петербург", "Казань", "Новосибирск")
+SCHEDULES = ("remote", "hybrid", "office")
+
+
+def item_results(ids, outcomes):
+    """Итог пакетной операции по каждому элементу: [{"id", "success", "error"}]."""
+    return [{"id": item_id, "success": bool(outcome), "error": None if outcome else "not found"}
+            for item_id, outcome in zip(ids, outcomes)]
+
+
+class MockState:
+    """Данные и фоновые задачи сервера; общие для всех потоков обработчика."""
+
+    def __init__(self, audience=1000, broadcast_rate=100, broadcast_fail_rate=0.01, seed=42,
+                 vacancies=1000, users=500, payments=300, description_size=0,
+                 latency=0.0, jitter=0.0, error_rate=0.0,
+                 sse_interval=5.0, sse_batch=5, search_new=20, batch_endpoints=True):
+        self.lock = threading.Lock()
+        self.audience = audience
+        self.broadcast_rate = broadcast_rate
+        self.broadcast_fail_rate = broadcast_fail_rate
+        self.random = random.Random(seed)
+        self.jobs = {}
+        self.latency = latency  # мс
+        self.jitter = jitter  # мс
+        self.error_rate = error_rate
+        self.sse_interval = sse_interval
+        self.sse_batch = sse_batch
+        self.search_new = search_new
+        self.batch_endpoints = batch_endpoints
+        self.description = "x" * description_size
+        self.settings = {"searchQuery": "java", "days": 1, "workTypes": ["remote"], "countries": ["russia"]}
+        self.profile = {"telegramId": 1, "firstName": "Admin", "lastName": "", "username": "admin", "role": "ADMIN"}
+
+        self.now = datetime.now().replace(microsecond=0)
+        self.next_vacancy_id = 1
+        self.vacancies = {}
+        for _ in range(vacancies):
+            vacancy = self._make_vacancy(self.now - timedelta(minutes=self.random.randint(0, 180 * 24 * 60)))
+            vacancy["status"] = "NEW" if self.random.random() < 0.2 else "OLD"
+        self.users = {user["telegramId"]: user for user in (self._make_user(i) for i in range(1, users + 1))}
+        self.payments = {p["id"]: p for p in (self._make_payment(i) for i in range(1, payments + 1))}
+        self.messages = 0
+
+    # --- генерация ---
+
+    def _make_vacancy(self, loaded_at):
+        vacancy_id = self.next_vacancy_id
+        self.next_vacancy_id += 1
+        published = loaded_at - timedelta(hours=self.random.randint(0, 72))
+        vacancy = {
+            "id": vacancy_id,
+            "title": f"Java разработчик {vacancy_id}",
+            "employer": f"Компания {vacancy_id % 5000}",
+            "city": self.random.choice(CITIES),
+            "salary": self.random.choice([None, f"{self.random.randrange(100, 400) * 1000} RUR"]),
+            "publishedAt": published.isoformat(),
+            "loadedAt": loaded_at.isoformat(),
+            "url": f"https://hh.ru/vacancy/{vacancy_id}",
+            "schedule": self.random.choice(SCHEDULES),
+            "status": "NEW",
+        }
+        if self.description:
+            vacancy["description"] = self.description
+        self.vacancies[vacancy_id] = vacancy
+        return vacancy
+
+    def _make_user(self, telegram_id):
+        plan = self.random.choice(PLANS)
+        days = self.random.randint(0, 365)
+        return {
+            "telegramId": telegram_id,
+            "firstName": f"Пользователь{telegram_id}",
+            "lastName": self.random.choice(["Иванов", "Петров", "Сидоров", ""]),
+            "username": f"user{telegram_id}",
+            "email": f"user{telegram_id}@example.com",
+            "isActive": days > 0,
+            "subscriptionPlan": plan,
+            "daysRemaining": days,
+            "role": "ADMIN" if telegram_id == 1 else "USER",
+            "createdAt": (self.now - timedelta(days=self.random.randint(0, 700))).isoformat(),
+        }
+
+    def _make_payment(self, payment_id, telegram_id=None, status=None):
+        return {
+            "id": payment_id,
+            # Каждый десятый платёж — текущего пользователя, чтобы «Мои платежи» не пустовали
+            "telegramId": telegram_id or (1 if payment_id % 10 == 0 else self.random.randint(1, max(1, len(self.users)))),
+            "plan": self.random.choice(PLANS[1:]),
+            "months": self.random.choice([1, 12]),
+            "amount": self.random.choice([299, 2990, 4990]),
+            "status": status or self.random.choice(PAYMENT_STATUSES),
+            "createdAt": (self.now - timedelta(days=self.random.randint(0, 365))).isoformat(),
+            "verifiedAt": None,
+            "adminNotes": "",
+        }
+
+    def delay(self):
+        """Задержка ответа: нормальное распределение вокруг latency с разбросом jitter."""
+        if not self.latency and not self.jitter:
+            return
+        with self.lock:
+            value = self.random.gauss(self.latency, self.jitter) if self.jitter else self.latency
+        time.sleep(max(0.0, value) / 1000)
+
+    def should_fail(self):
+        if not self.error_rate:
+            return False
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    # --- вакансии ---
+
+    def list_vacancies(self, status=None):
+        with self.lock:
+            return [dict(v) for v in self.vacancies.values() if not status or v["status"] == status]
+
+    def add_vacancies(self, count):
+        with self.lock:
+            now = datetime.now().replace(microsecond=0)
+            return [dict(self._make_vacancy(now)) for _ in range(count)]
+
+    def mark_viewed(self, ids):
+        with self.lock:
+            for vacancy_id in ids:
+                if vacancy_id in self.vacancies:
+                    self.vacancies[vacancy_id]["status"] = "OLD"
+
+    def delete_vacancies(self, ids):
+        with self.lock:
+            return [vacancy_id for vacancy_id in ids if self.vacancies.pop(vacancy_id, None)]
+
+    # --- пользователи и платежи ---
+
+    def find_users(self, search=None):
+        with self.lock:
+            users = list(self.users.values())
+        if search:
+            search = search.lower()
+            users = [u for u in users if search in " ".join(
+                str(u.get(f) or "") for f in ("firstName", "lastName", "username", "email")).lower()]
+        return users
+
+    def update_user(self, telegram_id, payload):
+        with self.lock:
+            user = self.users.get(telegram_id)
+            if user is None:
+                return None
+            user.update({k: v for k, v in (payload or {}).items() if k != "telegramId"})
+            return dict(user)
+
+    def extend_subscription(self, payload):
+        telegram_id = int(payload.get("telegramId") or 0)
+        days = int(payload.get("days") or 30 * int(payload.get("months") or 1))
+        with self.lock:
+            user = self.users.get(telegram_id)
+            if user is None:
+                return None
+            user["daysRemaining"] = (user.get("daysRemaining") or 0) + days
+            user["isActive"] = True
+            if payload.get("plan"):
+                user["subscriptionPlan"] = payload["plan"]
+            return dict(user)
+
+    def delete_user(self, telegram_id):
+        with self.lock:
+            return self.users.pop(telegram_id, None) is not None
+
+    def page(self, rows, page, size):
+        total_pages = max(1, -(-len(rows) // size))
+        return rows[page * size:(page + 1) * size], total_pages
+
+    def set_payment_status(self, payment_id, status, notes=""):
+        with self.lock:
+            payment = self.payments.get(payment_id)
+            if payment is None:
+                return None
+            payment["status"] = status
+            payment["adminNotes"] = notes or ""
+            if status == "VERIFIED":
+                payment["verifiedAt"] = datetime.now().replace(microsecond=0).isoformat()
+            return dict(payment)
+
+    def create_payment(self, payload):
+        with self.lock:
+            payment_id = max(self.payments, default=0) + 1
+            payment = self._make_payment(payment_id, telegram_id=1, status="PENDING")
+            payment.update({k: payload[k] for k in ("plan", "months", "amount") if k in (payload or {})})
+            payment["createdAt"] = datetime.now().replace(microsecond=0).isoformat()
+            self.payments[payment_id] = payment
+            return dict(payment)
+
+    # --- рассылка ---
+
+    def start_broadcast(self, message):
+        job_id = uuid.uuid4().hex[:12]
+        job = {"jobId": job_id, "status": "RUNNING", "message": message,
+               "total": self.audience, "sent": 0, "failed": 0, "startedAt": time.time()}
+        with self.lock:
+            self.jobs[job_id] = job
+        threading.Thread(target=self._run_broadcast, args=(job,), daemon=True).start()
+        return job
+
+    def _run_broadcast(self, job):
+        # Шлём пачками раз в 100 мс с заданной скоростью, часть адресатов «недоступна»
+        step = max(1, int(self.broadcast_rate / 10))
+        while True:
+            time.sleep(0.1)
+            with self.lock:
+                left = job["total"] - job["sent"] - job["failed"]
+                batch = min(step, left)
+                failed = sum(1 for _ in range(batch) if self.random.random() < self.broadcast_fail_rate)
+                job["failed"] += failed
+                job["sent"] += batch - failed
+                self.messages += batch - failed
+                if job["sent"] + job["failed"] >= job["total"]:
+                    job["status"] = "DONE"
+                    job["finishedAt"] = time.time()
+                    return
+
+    def get_job(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Маршруты: (метод, регулярное выражение пути, имя метода-обработчика)."""
+    routes = [
+        ("POST", r"/api/telegram-auth/create-session", "create_auth_session"),
+        ("GET", r"/api/telegram-auth/status/(?P<session_id>[\w-]+)", "auth_status"),
+        ("GET", r"/api/subscription/status", "subscription_status"),
+        ("GET", r"/api/auth/me", "current_user"),
+        ("PUT", r"/api/auth/profile", "update_profile"),
+        ("GET", r"/api/settings", "get_settings"),
+        ("PUT", r"/api/settings", "update_settings"),
+        ("GET", r"/api/vacancies", "list_vacancies"),
+        ("POST", r"/api/vacancies/search", "search_vacancies"),
+        ("GET", r"/api/vacancies/stream", "vacancy_stream"),
+        ("POST", r"/api/vacancies/mark-multiple-viewed", "mark_viewed"),
+        ("POST", r"/api/vacancies/delete-multiple", "delete_vacancies_batch"),
+        ("DELETE", r"/api/vacancies/(?P<vacancy_id>\d+)", "delete_vacancy"),
+        ("GET", r"/api/payments/my-payments", "my_payments"),
+        ("POST", r"/api/payments/create", "create_payment"),
+        ("GET", r"/api/payments/(?P<payment_id>\d+)/status", "payment_status"),
+        ("POST", r"/api/payments/(?P<payment_id>\d+)/cancel", "cancel_payment"),
+        ("GET", r"/api/admin/all-users", "admin_users"),
+        ("PUT", r"/api/admin/users/batch", "update_users_batch"),
+        ("POST", r"/api/admin/users/delete-batch", "delete_users_batch"),
+        ("PUT", r"/api/admin/users/(?P<telegram_id>\d+)", "update_user"),
+        ("DELETE", r"/api/admin/users/(?P<telegram_id>\d+)", "delete_user"),
+        ("POST", r"/api/admin/users/(?P<telegram_id>\d+)/role", "set_role"),
+        ("POST", r"/api/admin/extend-subscription/batch", "extend_subscription_batch"),
+        ("POST", r"/api/admin/extend-subscription", "extend_subscription"),
+        ("GET", r"/api/admin/stats", "admin_stats"),
+        ("GET", r"/api/admin/payments/stats", "payment_stats"),
+        ("GET", r"/api/admin/payments/all", "admin_payments"),
+        ("POST", r"/api/admin/payments/verify-batch", "verify_payments_batch"),
+        ("POST", r"/api/admin/payments/reject-batch", "reject_payments_batch"),
+        ("POST", r"/api/admin/payments/(?P<payment_id>\d+)/verify", "verify_payment"),
+        ("POST", r"/api/admin/payments/(?P<payment_id>\d+)/reject", "reject_payment"),
+        ("GET", r"/api/admin/bot/stats", "bot_stats"),
+        ("POST", r"/api/admin/bot/control", "bot_control"),
+        ("POST", r"/api/admin/bot/broadcast/jobs", "start_broadcast"),
+        ("GET", r"/api/admin/bot/broadcast/jobs/(?P<job_id>[\w-]+)", "broadcast_job"),
+        ("POST", r"/api/admin/bot/broadcast", "broadcast_sync"),
+    ]
+    # Доступны без токена
+    public_handlers = {"create_auth_session", "auth_status"}
+    # Отключаются флагом --no-batch, чтобы проверить поштучный запасной путь клиента
+    batch_handlers = {
+        "delete_vacancies_batch", "update_users_batch", "delete_users_batch",
+        "extend_subscription_batch", "verify_payments_batch", "reject_payments_batch",
+    }
+    state = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        for route_method, pattern, handler in self.routes:
+            match = re.fullmatch(pattern, url.path)
+            if route_method != method or not match:
+                continue
+            if handler in self.batch_handlers and not self.state.batch_endpoints:
+                break
+            if handler not in self.public_handlers and not self.headers.get("Authorization", "").startswith("Bearer "):
+                return self.send_json(401, {"error": "unauthorized"})
+            self.state.delay()
+            if self.state.should_fail():
+                self.discard_body()
+                return self.send_json(503, {"error": "injected failure"})
+            return getattr(self, handler)(**match.groupdict())
+        self.discard_body()
+        self.send_json(404, {"error": f"no route for {method} {url.path}"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def discard_body(self):
+        # Непрочитанное тело сбило бы следующий запрос в том же keep-alive соединении
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def page_params(self, default_size=20):
+        return int(self.query.get("page") or 0), max(1, int(self.query.get("size") or default_size))
+
+    # --- авторизация и профиль ---
+
+    def create_auth_session(self):
+        self.read_json()
+        self.send_json(200, {"sessionId": uuid.uuid4().hex})
+
+    def auth_status(self, session_id):
+        self.send_json(200, {"status": "COMPLETED", "token": f"mock-{session_id}"})
+
+    def subscription_status(self):
+        self.send_json(200, {"active": True, "telegramId": 1, "subscriptionPlan": "LIFETIME",
+                             "daysRemaining": 36500, "subscriptionEndDate": "2126-01-01"})
+
+    def current_user(self):
+        self.send_json(200, self.state.profile)
+
+    def update_profile(self):
+        self.state.profile.update(self.read_json() or {})
+        self.send_json(200, self.state.profile)
+
+    def get_settings(self):
+        self.send_json(200, dict(self.state.settings, telegramId=1))
+
+    def update_settings(self):
+        self.state.settings.update(self.read_json() or {})
+        self.send_json(200, self.state.settings)
+
+    # --- вакансии ---
+
+    def list_vacancies(self):
+        self.send_json(200, self.state.list_vacancies(self.query.get("status")))
+
+    def search_vacancies(self):
+        self.read_json()
+        added = self.state.add_vacancies(self.state.search_new)
+        self.send_json(200, {"found": len(added), "newCount": len(added)})
+
+    def vacancy_stream(self):
+        """SSE: раз в sse_interval секунд — пачка из sse_batch новых вакансий.
+
+        id события — порядковый номер, в каждой вакансии sentAt (unix-время
+        отправки), чтобы измерять задержку доставки и пропуски.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        seq = 0
+        try:
+            while True:
+                time.sleep(self.state.sse_interval)
+                seq += 1
+                batch = self.state.add_vacancies(self.state.sse_batch)
+                sent_at = time.time()
+                for vacancy in batch:
+                    vacancy["sentAt"] = sent_at
+                data = json.dumps(batch, ensure_ascii=False)
+                self.wfile.write(f"id: {seq}\ndata: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            logger.debug("SSE-клиент отключился после %s событий", seq)
+
+    def mark_viewed(self):
+        self.state.mark_viewed(self.read_json() or [])
+        self.send_json(200, {"success": True})
+
+    def delete_vacancies_batch(self):
+        deleted = self.state.delete_vacancies(self.read_json() or [])
+        self.send_json(200, {"deleted": len(deleted)})
+
+    def delete_vacancy(self, vacancy_id):
+        if not self.state.delete_vacancies([int(vacancy_id)]):
+            return self.send_json(404, {"error": "vacancy not found"})
+        self.send_json(200, {"success": True})
+
+    # --- платежи пользователя ---
+
+    def my_payments(self):
+        with self.state.lock:
+            payments = [dict(p) for p in self.state.payments.values() if p["telegramId"] == 1]
+        self.send_json(200, payments)
+
+    def create_payment(self):
+        self.send_json(200, self.state.create_payment(self.read_json()))
+
+    def payment_status(self, payment_id):
+        payment = self.state.payments.get(int(payment_id))
+        if payment is None:
+            return self.send_json(404, {"error": "payment not found"})
+        self.send_json(200, dict(payment))
+
+    def cancel_payment(self, payment_id):
+        payment = self.state.set_payment_status(int(payment_id), "CANCELLED")
+        if payment is None:
+            return self.send_json(404, {"error": "payment not found"})
+        self.send_json(200, payment)
+
+    # --- админка: пользователи ---
+
+    def admin_users(self):
+        users = self.state.find_users(self.query.get("search"))
+        if "page" not in self.query and "size" not in self.query:
+            return self.send_json(200, users)
+        page, size = self.page_params()
+        rows, total_pages = self.state.page(users, page, size)
+        self.send_json(200, {"users": rows, "totalPages": total_pages, "totalElements": len(users), "page": page})
+
+    def update_user(self, telegram_id):
+        user = self.state.update_user(int(telegram_id), self.read_json())
+        if user is None:
+            return self.send_json(404, {"error": "user not found"})
+        self.send_json(200, user)
+
+    def update_users_batch(self):
+        payload = self.read_json() or {}
+        ids = payload.get("telegramIds") or []
+        updated = [self.state.update_user(int(i), payload.get("update")) for i in ids]
+        self.send_json(200, {"updated": sum(1 for user in updated if user), "results": item_results(ids, updated)})
+
+    def delete_user(self, telegram_id):
+        if not self.state.delete_user(int(telegram_id)):
+            return self.send_json(404, {"error": "user not found"})
+        self.send_json(200, {"success": True})
+
+    def delete_users_batch(self):
+        ids = self.read_json() or []
+        deleted = [self.state.delete_user(int(i)) for i in ids]
+        self.send_json(200, {"deleted": sum(deleted), "results": item_results(ids, deleted)})
+
+    def set_role(self, telegram_id):
+        user = self.state.update_user(int(telegram_id), {"role": self.query.get("role") or "USER"})
+        if user is None:
+            return self.send_json(404, {"error": "user not found"})
+        self.send_json(200, user)
+
+    def extend_subscription(self):
+        user = self.state.extend_subscription(self.read_json() or {})
+        if user is None:
+            return self.send_json(404, {"error": "user not found"})
+        self.send_json(200, user)
+
+    def extend_subscription_batch(self):
+        payloads = self.read_json() or []
+        extended = [self.state.extend_subscription(payload) for payload in payloads]
+        self.send_json(200, {
+            "extended": sum(1 for user in extended if user),
+            "results": item_results([payload.get("telegramId") for payload in payloads], extended)
+        })
+
+    def admin_stats(self):
+        users = self.state.find_users()
+        self.send_json(200, {
+            "totalUsers": len(users),
+            "activeSubscriptions": sum(1 for u in users if u.get("isActive")),
+            "expiredSubscriptions": sum(1 for u in users if not u.get("isActive")),
+            "trialUsedCount": sum(1 for u in users if u.get("subscriptionPlan") == "TRIAL"),
+        })
+
+    # --- админка: платежи ---
+
+    def payment_stats(self):
+        with self.state.lock:
+            statuses = [p["status"] for p in self.state.payments.values()]
+        self.send_json(200, {
+            "totalPayments": len(statuses),
+            "pendingPayments": statuses.count("PENDING"),
+            "verifiedPayments": statuses.count("VERIFIED"),
+            "rejectedPayments": statuses.count("REJECTED"),
+        })
+
+    def admin_payments(self):
+        status = self.query.get("status")
+        with self.state.lock:
+            payments = [dict(p) for p in self.state.payments.values() if not status or p["status"] == status]
+        page, size = self.page_params()
+        rows, total_pages = self.state.page(payments, page, size)
+        self.send_json(200, {"payments": rows, "totalPages": total_pages, "totalElements": len(payments)})
+
+    def verify_payment(self, payment_id):
+        payment = self.state.set_payment_status(int(payment_id), "VERIFIED", self.query.get("notes"))
+        if payment is None:
+            return self.send_json(404, {"error": "payment not found"})
+        self.send_json(200, payment)
+
+    def reject_payment(self, payment_id):
+        payment = self.state.set_payment_status(int(payment_id), "REJECTED", self.query.get("reason"))
+        if payment is None:
+            return self.send_json(404, {"error": "payment not found"})
+        self.send_json(200, payment)
+
+    def verify_payments_batch(self):
+        payload = self.read_json() or {}
+        ids = payload.get("paymentIds") or []
+        done = [self.state.set_payment_status(int(i), "VERIFIED", payload.get("notes")) for i in ids]
+        self.send_json(200, {"verified": sum(1 for p in done if p), "results": item_results(ids, done)})
+
+    def reject_payments_batch(self):
+        payload = self.read_json() or {}
+        ids = payload.get("paymentIds") or []
+        done = [self.state.set_payment_status(int(i), "REJECTED", payload.get("reason")) for i in ids]
+        self.send_json(200, {"rejected": sum(1 for p in done if p), "results": item_results(ids, done)})
+
+    # --- админка: бот ---
+
+    def bot_stats(self):
+        self.send_json(200, {
+            "totalUsers": self.state.audience,
+            "activeToday": self.state.audience // 10,
+            "totalMessages": self.state.messages,
+            "messagesToday": self.state.messages,
+            "botStatus": "RUNNING",
+            "lastUpdate": datetime.now().replace(microsecond=0).isoformat(),
+        })
+
+    def bot_control(self):
+        payload = self.read_json() or {}
+        self.send_json(200, {"success": True, "action": payload.get("action")})
+
+    def start_broadcast(self):
+        payload = self.read_json() or {}
+        if not payload.get("message"):
+            return self.send_json(400, {"error": "message is required"})
+        job = self.state.start_broadcast(payload["message"])
+        self.send_json(202, {"jobId": job["jobId"], "status": job["status"], "total": job["total"]})
+
+    def broadcast_job(self, job_id):
+        job = self.state.get_job(job_id)
+        if job is None:
+            return self.send_json(404, {"error": "job not found"})
+        self.send_json(200, job)
+
+    def broadcast_sync(self):
+        # Старый синхронный вариант: отвечает, только когда «разослал» всем
+        payload = self.read_json() or {}
+        job = self.state.start_broadcast(payload.get("message") or "")
+        while self.state.get_job(job["jobId"])["status"] != "DONE":
+            time.sleep(0.1)
+        self.send_json(200, {"success": True})
+
+
+def make_server(host="127.0.0.1", port=8765, state=None):
+    """Сервер в отдельном классе обработчика, чтобы несколько экземпляров не делили state."""
+    handler = type("BoundMockHandler", (MockHandler,), {"state": state or MockState()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    data = parser.add_argument_group("Объём данных")
+    data.add_argument("--vacancies", type=int, default=1000, help="Вакансий в списке при старте")
+    data.add_argument("--users", type=int, default=500, help="Пользователей в админке")
+    data.add_argument("--payments", type=int, default=300, help="Платежей в админке")
+    data.add_argument("--description-size", type=int, default=0,
+                      help="Байт текста описания в каждой вакансии, чтобы раздуть ответы")
+    network = parser.add_argument_group("Сеть")
+    network.add_argument("--latency", type=float, default=0.0, help="Средняя задержка ответа, мс")
+    network.add_argument("--jitter", type=float, default=0.0, help="Разброс задержки, мс")
+    network.add_argument("--error-rate", type=float, default=0.0, help="Доля запросов с ответом 503")
+    network.add_argument("--no-batch", action="store_true", help="Без пакетных эндпоинтов (404)")
+    stream = parser.add_argument_group("SSE и поиск")
+    stream.add_argument("--sse-interval", type=float, default=5.0, help="Секунд между событиями SSE")
+    stream.add_argument("--sse-batch", type=int, default=5, help="Новых вакансий в событии SSE")
+    stream.add_argument("--search-new", type=int, default=20, help="Новых вакансий после поиска")
+    bot = parser.add_argument_group("Рассылка")
+    bot.add_argument("--audience", type=int, default=1000, help="Получателей рассылки")
+    bot.add_argument("--broadcast-rate", type=float, default=100, help="Сообщений в секунду")
+    bot.add_argument("--broadcast-fail-rate", type=float, default=0.01, help="Доля неудачных отправок")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    state = MockState(
+        args.audience, args.broadcast_rate, args.broadcast_fail_rate, seed=args.seed,
+        vacancies=args.vacancies, users=args.users, payments=args.payments,
+        description_size=args.description_size, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, sse_interval=args.sse_interval, sse_batch=args.sse_batch,
+        search_new=args.search_new, batch_endpoints=not args.no_batch,
+    )
+    server = make_server(args.host, args.port, state)
+    url = f"http://{args.host}:{args.port}"
+    print(f"Тестовый сервер: {url}")
+    print(f"AUTH_SERVICE_URL={url} VACANCY_SERVICE_URL={url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
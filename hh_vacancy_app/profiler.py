@@ -0,0 +1,167 @@
+"""Профилирование пользовательской сборки, в том числе exe из build_exe.py.
+
+    HH_PROFILE=sample app.exe                     # выборки стеков всех потоков до выхода
+    HH_PROFILE=cprofile HH_PROFILE_SECONDS=60 app.exe
+    app.exe --profile cprofile --profile-seconds 60
+
+Файлы пишутся в папку данных:
+    profile-<время>.prof    cProfile GUI-потока: snakeviz, python -m pstats
+    profile-<время>.folded  свёрнутые стеки всех потоков: speedscope, flamegraph.pl
+
+Запись можно начать и остановить из меню «Справка → Профилирование».
+"""
+import os
+import sys
+import time
+import cProfile
+import logging
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+MODES = ("sample", "cprofile")
+SAMPLE_INTERVAL_MS = 5
+
+logger = logging.getLogger(__name__)
+
+
+def parse_mode(value):
+    """«sample», «cprofile» или None, если профилирование выключено."""
+    value = (value or "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return None
+    if value in ("1", "true", "yes", "on"):
+        return "sample"
+    if value not in MODES:
+        logger.warning(f"Неизвестный режим профилирования «{value}», используется sample")
+        return "sample"
+    return value
+
+
+def options_from(argv, environ=os.environ):
+    """Режим и длительность записи из --profile/--profile-seconds или HH_PROFILE/HH_PROFILE_SECONDS."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile", nargs="?", const="sample", default=environ.get("HH_PROFILE", ""))
+    parser.add_argument("--profile-seconds", type=float, default=float(environ.get("HH_PROFILE_SECONDS") or 0))
+    args, _ = parser.parse_known_args(argv[1:])
+    return parse_mode(args.profile), args.profile_seconds
+
+
+class StackSampler:
+    """Фоновый поток, который раз в interval_ms снимает стеки всех потоков через sys._current_frames()."""
+
+    def __init__(self, interval_ms=SAMPLE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(1)
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}")
+                    frame = frame.f_back
+                stack.reverse()
+                name = names.get(thread_id, "")
+                if not name or name.startswith("Dummy"):
+                    # QThread-воркеры Python видит как Dummy-N — подписываем их функцией run
+                    name = stack[0].split(":", 1)[-1] if stack else str(thread_id)
+                self.stacks[";".join([name] + stack)] += 1
+            self.samples += 1
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class AppProfiler(QObject):
+    """Запись профиля в out_dir: cProfile GUI-потока или выборки стеков всех потоков.
+
+    start() вызывается из GUI-потока. Если задано seconds, запись
+    останавливается сама; finished сообщает путь к файлу.
+    """
+
+    finished = Signal(str)
+
+    def __init__(self, out_dir, mode="sample", parent=None):
+        super().__init__(parent)
+        self.out_dir = out_dir
+        self.mode = mode
+        self.profile = None
+        self.sampler = None
+        self.started_at = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.stop)
+
+    @property
+    def running(self):
+        return self.started_at is not None
+
+    def start(self, seconds=0):
+        if self.running:
+            return
+        if self.mode == "cprofile":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.sampler = StackSampler()
+            self.sampler.start()
+        self.started_at = time.monotonic()
+        if seconds > 0:
+            self.timer.start(int(seconds * 1000))
+        logger.info(f"Профилирование ({self.mode}) запущено" + (f" на {seconds:g} с" if seconds > 0 else ""))
+
+    def new_path(self, suffix):
+        """profile-<время><suffix>; две записи за одну секунду не затирают друг друга."""
+        stem = os.path.join(self.out_dir, f"profile-{datetime.now():%Y%m%d-%H%M%S}")
+        path, index = stem + suffix, 1
+        while os.path.exists(path):
+            index += 1
+            path = f"{stem}-{index}{suffix}"
+        return path
+
+    def stop(self):
+        """Останавливает запись и сохраняет файл; без активной записи возвращает None."""
+        if not self.running:
+            return None
+        self.timer.stop()
+        elapsed = time.monotonic() - self.started_at
+        self.started_at = None
+        if self.profile:
+            self.profile.disable()
+            path = self.new_path(".prof")
+            self.profile.dump_stats(path)
+            self.profile = None
+        else:
+            self.sampler.stop()
+            path = self.new_path(".folded")
+            self.sampler.write(path)
+            logger.info(f"Выборок стеков: {self.sampler.samples}")
+            self.sampler = None
+        logger.info(f"Профиль за {elapsed:.1f} с записан в {path}")
+        self.finished.emit(path)
+        return path
@@ -0,0 +1,97 @@
+"""Один экземпляр приложения на папку данных.
+
+Первый запуск берёт QLockFile и слушает QLocalServer. Повторный запуск
+видит занятую блокировку, передаёт первому команду строкой через
+QLocalSocket («activate» — показать окно, «refresh» — показать и обновить
+вакансии) и сразу завершается, не открывая второй SSE-поток и трей.
+Слушать первый экземпляр начинает ещё до создания окна, поэтому команды,
+пришедшие раньше attach(), копятся и передаются окну при подключении.
+"""
+import hashlib
+import logging
+
+from PySide6.QtCore import QObject, QLockFile, QThread, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+COMMANDS = ("activate", "refresh")
+CONNECT_TIMEOUT_MS = 500
+HANDOFF_ATTEMPTS = 6  # первый экземпляр мог взять блокировку, но ещё не начать слушать
+HANDOFF_DELAY_MS = 100  # пауза перед повтором, удваивается: всего около 3 с
+
+logger = logging.getLogger(__name__)
+
+
+class SingleInstance(QObject):
+    command_received = Signal(str)
+
+    def __init__(self, data_dir, parent=None):
+        super().__init__(parent)
+        # Имя канала зависит от папки данных: с другим APPDATA (бенчмарки, тесты) экземпляры не мешают друг другу
+        self.name = "HH_Vacancy-" + hashlib.sha1(str(data_dir).encode("utf-8")).hexdigest()[:12]
+        self.lock = QLockFile(str(data_dir / "instance.lock"))
+        self.lock.setStaleLockTime(0)
+        self.server = None
+        self.attached = False
+        self.pending = []
+
+    def acquire(self):
+        """True, если этот процесс — единственный экземпляр; тогда он начинает слушать команды."""
+        if not self.lock.tryLock(0):
+            return False
+        # Канал мог остаться от упавшего процесса
+        QLocalServer.removeServer(self.name)
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+        if not self.server.listen(self.name):
+            logger.warning(f"Не удалось открыть канал {self.name}: {self.server.errorString()}")
+        return True
+
+    def attach(self, slot):
+        """Подключает получателя команд и отдаёт ему накопленные до этого."""
+        self.command_received.connect(slot)
+        self.attached = True
+        pending, self.pending = self.pending, []
+        for command in pending:
+            self.command_received.emit(command)
+
+    def send(self, command):
+        """Передаёт команду работающему экземпляру; False, если он не ответил."""
+        for attempt in range(HANDOFF_ATTEMPTS):
+            if attempt:
+                # Без сервера connectToServer сразу падает с ServerNotFound — ждём, пока первый начнёт слушать
+                QThread.msleep(HANDOFF_DELAY_MS * 2 ** (attempt - 1))
+            socket = QLocalSocket()
+            socket.connectToServer(self.name)
+            if socket.waitForConnected(CONNECT_TIMEOUT_MS):
+                socket.write(f"{command}\n".encode("utf-8"))
+                socket.waitForBytesWritten(CONNECT_TIMEOUT_MS)
+                socket.disconnectFromServer()
+                return True
+        return False
+
+    def release(self):
+        if self.server:
+            self.server.close()
+            self.server = None
+        self.lock.unlock()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self._read_commands(s))
+            socket.disconnected.connect(socket.deleteLater)
+            # Короткая команда могла прийти раньше, чем подключили readyRead
+            self._read_commands(socket)
+
+    def _read_commands(self, socket):
+        while socket.canReadLine():
+            command = bytes(socket.readLine()).decode("utf-8", "replace").strip()
+            if command in COMMANDS:
+                if self.attached:
+                    self.command_received.emit(command)
+                else:
+                    # Окно ещё создаётся (например, открыт диалог входа) — выполним команду позже
+                    self.pending.append(command)
+            elif command:
+                logger.warning(f"Неизвестная команда от второго экземпляра: {command}")
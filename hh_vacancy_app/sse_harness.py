@@ -0,0 +1,316 @@
+"""Нагрузка SSE-потока на настоящее окно VacancyApp и замер задержек интерфейса.
+
+    python sse_harness.py --history 5000 --backlog 2000 --phase 5:2 --phase 300:3:30 --phase 5:3
+    python sse_harness.py --output sse_report.json --history-file sse_history.jsonl
+
+Поднимает mock_server в этом же процессе, запускает окно без экрана
+(QT_QPA_PLATFORM=offscreen) и проигрывает сценарий:
+    --backlog N             сразу после подключения N вакансий подряд, как после восстановления связи
+    --phase RATE:SEC[:BATCH] RATE вакансий в секунду в течение SEC секунд, по BATCH в событии
+
+Меряет:
+    задержку от отправки события до строки в таблице и до освобождения цикла событий;
+    блокировку GUI-потока по пульсу таймера раз в --tick мс;
+    потерянные и повторные вакансии (--duplicate-rate повторно шлёт уже отправленные события).
+"""
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime
+from unittest import mock
+from http.server import ThreadingHTTPServer
+
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+os.environ["APPDATA"] = tempfile.mkdtemp(prefix="hh_sse_")
+
+import mock_server  # noqa: E402
+from PySide6.QtCore import QEventLoop, QTimer  # noqa: E402
+from PySide6.QtWidgets import QApplication, QMessageBox  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PHASES = ("5:2", "300:3:30", "5:3")
+
+
+def parse_phase(value):
+    parts = value.split(":")
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"Ожидается RATE:SEC[:BATCH], получено {value}")
+    rate, seconds = float(parts[0]), float(parts[1])
+    batch = int(parts[2]) if len(parts) == 3 else 1
+    if rate <= 0 or seconds <= 0 or batch <= 0:
+        raise argparse.ArgumentTypeError(f"Значения фазы должны быть положительными: {value}")
+    return {"rate": rate, "seconds": seconds, "batch": batch}
+
+
+class HarnessState(mock_server.MockState):
+    """MockState со сценарием SSE и журналом всего отправленного."""
+
+    def __init__(self, phases, backlog=0, backlog_batch=50, duplicate_rate=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.phases = phases
+        self.backlog = backlog
+        self.backlog_batch = backlog_batch
+        self.duplicate_rate = duplicate_rate
+        self.emitted = []  # (seq, отправлено, [id]) — включая повторы
+        self.finished = threading.Event()
+        self.closing = threading.Event()
+
+    def duration(self):
+        return sum(phase["seconds"] for phase in self.phases)
+
+
+class HarnessHandler(mock_server.MockHandler):
+    def vacancy_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        state = self.state
+        if state.finished.is_set():
+            # Переподключение после конца сценария не нужно
+            return
+        seq = 0
+        sent = []
+
+        def emit(batch):
+            nonlocal seq
+            seq += 1
+            sent_at = time.time()
+            for vacancy in batch:
+                vacancy["sentAt"] = sent_at
+            self.wfile.write(f"id: {seq}\ndata: {json.dumps(batch, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            state.emitted.append((seq, sent_at, [v["id"] for v in batch]))
+            sent.append(batch)
+
+        try:
+            left = state.backlog
+            while left > 0:
+                emit(state.add_vacancies(min(state.backlog_batch, left)))
+                left -= state.backlog_batch
+            for phase in state.phases:
+                interval = phase["batch"] / phase["rate"]
+                deadline = time.monotonic() + phase["seconds"]
+                next_at = time.monotonic()
+                while next_at < deadline:
+                    time.sleep(max(0.0, next_at - time.monotonic()))
+                    if sent and state.random.random() < state.duplicate_rate:
+                        emit([dict(v) for v in state.random.choice(sent)])
+                    else:
+                        emit(state.add_vacancies(phase["batch"]))
+                    next_at += interval
+            state.finished.set()
+            # Соединение держим, пока харнесс не соберёт результаты; закрытие завершит поток клиента
+            while not state.closing.wait(1):
+                self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            logger.debug("SSE-клиент отключился")
+
+
+class Probe:
+    """Замеры на стороне GUI: обёртка слота и пульс главного потока."""
+
+    def __init__(self, window, tick_ms):
+        self.window = window
+        self.tick = tick_ms / 1000
+        self.received = []  # (получено, в таблице, [(id, sentAt)])
+        self.visible = {}  # индекс пачки -> цикл событий снова свободен
+        self.slot_times = []
+        self.gaps = []
+        self.last_tick = None
+        self.original_slot = window.on_stream_vacancies
+        window.on_stream_vacancies = self.on_stream_vacancies
+        self.timer = QTimer()
+        self.timer.setInterval(tick_ms)
+        self.timer.timeout.connect(self.on_tick)
+
+    def start(self):
+        self.last_tick = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def on_tick(self):
+        now = time.perf_counter()
+        self.gaps.append(now - self.last_tick)
+        self.last_tick = now
+
+    def on_stream_vacancies(self, vacancies):
+        received_at = time.time()
+        started = time.perf_counter()
+        self.original_slot(vacancies)
+        self.slot_times.append(time.perf_counter() - started)
+        index = len(self.received)
+        self.received.append((received_at, time.time(), [(v.get("id"), v.get("sentAt")) for v in vacancies]))
+        # Срабатывает, когда обработаны отложенные события, в том числе перерисовка
+        QTimer.singleShot(0, lambda: self.visible.setdefault(index, time.time()))
+
+
+def percentiles(values, points=(50, 90, 99)):
+    if not values:
+        return {f"p{p}": None for p in points} | {"max": None}
+    ordered = sorted(values)
+    result = {f"p{p}": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in points}
+    result["max"] = ordered[-1]
+    return result
+
+
+def ms(stats):
+    return {key: None if value is None else round(value * 1000, 1) for key, value in stats.items()}
+
+
+def build_report(args, state, probe):
+    emitted_ids = [vacancy_id for _, _, ids in state.emitted for vacancy_id in ids]
+    unique_emitted = set(emitted_ids)
+    received_ids = [vacancy_id for _, _, items in probe.received for vacancy_id, _ in items]
+    window_ids = [v.get("id") for v in probe.window.vacancies]
+
+    table_lag, visible_lag = [], []
+    for index, (_, in_table_at, items) in enumerate(probe.received):
+        visible_at = probe.visible.get(index)
+        for _, sent_at in items:
+            if sent_at is None:
+                continue
+            table_lag.append(in_table_at - sent_at)
+            if visible_at:
+                visible_lag.append(visible_at - sent_at)
+
+    blocked = [gap - probe.tick for gap in probe.gaps if gap > probe.tick * 2]
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "scenario": {
+            "history": args.history, "backlog": args.backlog, "backlog_batch": args.backlog_batch,
+            "phases": args.phase, "duplicate_rate": args.duplicate_rate, "tick_ms": args.tick,
+        },
+        "events": {
+            "emitted": len(state.emitted),
+            "received": len(probe.received),
+            "vacancies_emitted": len(emitted_ids),
+            "vacancies_unique": len(unique_emitted),
+        },
+        "lag_to_table_ms": ms(percentiles(table_lag)),
+        "lag_to_visible_ms": ms(percentiles(visible_lag)),
+        "slot_ms": ms(percentiles(probe.slot_times)) | {"total": round(sum(probe.slot_times) * 1000, 1)},
+        "main_thread": {
+            "stalls": len(blocked),
+            "blocked_ms": round(sum(blocked) * 1000, 1),
+            "longest_stall_ms": round(max(blocked, default=0) * 1000, 1),
+        },
+        "integrity": {
+            # Не дошли до слота: потеряны в транспорте или ещё в пути к концу замера
+            "lost_in_transport": len(unique_emitted - set(received_ids)),
+            "missing_in_window": len(unique_emitted - set(window_ids)),
+            "duplicates_received": len(received_ids) - len(set(received_ids)),
+            "duplicates_in_window": len(window_ids) - len(set(window_ids)),
+        },
+    }
+
+
+def print_report(report):
+    print(f"События: отправлено {report['events']['emitted']}, получено {report['events']['received']}, "
+          f"вакансий {report['events']['vacancies_unique']}")
+    for title, key in (("До строки в таблице", "lag_to_table_ms"), ("До свободного цикла", "lag_to_visible_ms"),
+                       ("Время слота", "slot_ms")):
+        values = report[key]
+        print(f"{title:<22} p50 {values['p50']} мс, p90 {values['p90']} мс, p99 {values['p99']} мс, "
+              f"max {values['max']} мс")
+    main = report["main_thread"]
+    print(f"GUI-поток: {main['stalls']} остановок, всего {main['blocked_ms']} мс, "
+          f"самая долгая {main['longest_stall_ms']} мс")
+    integrity = report["integrity"]
+    print(f"Потеряно по дороге: {integrity['lost_in_transport']}, нет в окне: {integrity['missing_in_window']}, "
+          f"повторов получено: {integrity['duplicates_received']}, повторов в окне: {integrity['duplicates_in_window']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, default=2000, help="Вакансий в окне до начала сценария")
+    parser.add_argument("--backlog", type=int, default=0, help="Вакансий сразу после подключения")
+    parser.add_argument("--backlog-batch", type=int, default=50, help="Вакансий в событии при сбросе")
+    parser.add_argument("--phase", type=parse_phase, action="append", help="RATE:SEC[:BATCH], можно несколько раз")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="Доля событий-повторов")
+    parser.add_argument("--tick", type=int, default=10, help="Период пульса GUI-потока, мс")
+    parser.add_argument("--drain", type=float, default=30.0,
+                        help="Сколько секунд после сценария ждать, пока окно разберёт хвост")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Сохранить отчёт в JSON")
+    parser.add_argument("--history-file", help="Дописать отчёт строкой в JSONL для отслеживания во времени")
+    args = parser.parse_args(argv)
+    args.phase = args.phase or [parse_phase(value) for value in DEFAULT_PHASES]
+
+    state = HarnessState(args.phase, args.backlog, args.backlog_batch, args.duplicate_rate,
+                         seed=args.seed, vacancies=args.history)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), type("BoundHarnessHandler", (HarnessHandler,), {"state": state}))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    os.environ["AUTH_SERVICE_URL"] = url
+    os.environ["VACANCY_SERVICE_URL"] = url
+    os.environ["HH_LOG_CONSOLE"] = "0"
+
+    # app читает адреса серверов при импорте, поэтому импорт только здесь
+    import app
+
+    qt_app = QApplication.instance() or QApplication(sys.argv)
+    app.TOKEN_FILE.write_text(json.dumps({"token": "harness"}), encoding="utf-8")
+
+    def run_for(seconds):
+        loop = QEventLoop()
+        QTimer.singleShot(int(seconds * 1000), loop.quit)
+        loop.exec()
+
+    with mock.patch.object(QMessageBox, "exec", return_value=QMessageBox.Ok), \
+            mock.patch.object(QMessageBox, "information"), \
+            mock.patch.object(QMessageBox, "warning"):
+        with mock.patch.object(app.VacancyApp, "start_stream"), \
+                mock.patch.object(app.VacancyApp, "update_vacancies"):
+            window = app.VacancyApp()
+        window.show()
+        probe = Probe(window, args.tick)
+        probe.start()
+        window.start_stream()
+        started = time.monotonic()
+        limit = state.duration() + args.backlog / 100 + 60
+        while not state.finished.is_set() and time.monotonic() - started < limit:
+            run_for(0.2)
+        # Окно может отставать от сервера: ждём, пока до слота дойдут все события
+        drain_until = time.monotonic() + args.drain
+        while len(probe.received) < len(state.emitted) and time.monotonic() < drain_until:
+            run_for(0.2)
+        run_for(0.2)
+        probe.stop()
+        report = build_report(args, state, probe)
+        state.closing.set()
+        if window.stream_worker:
+            window.stream_worker.stop()
+            window.stream_worker.wait(5000)
+        window.stop_stream()
+        window.stream_retry_timer.stop()
+    server.shutdown()
+
+    print_report(report)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    if args.history_file:
+        with open(args.history_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False) + "\n")
+    integrity = report["integrity"]
+    return 1 if integrity["missing_in_window"] or integrity["duplicates_in_window"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+import logging
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+
+from PySide6.QtCore import QObject, QTimer
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopWatchdog(QObject):
+    """Сторож цикла событий Qt.
+
+    Таймер в GUI-потоке раз в heartbeat_ms отмечает, что цикл жив. Фоновый
+    поток проверяет отметку; если её нет дольше threshold_ms, снимает стек
+    главного потока через sys._current_frames(). Когда цикл оживает, зависание
+    с длительностью и стеком попадает в лог и в кольцевой буфер stalls.
+    Пока цикл не запущен (первой отметки нет), зависания не считаются.
+    """
+
+    def __init__(self, threshold_ms=500, heartbeat_ms=50, history=100, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.poll = min(heartbeat_ms, threshold_ms / 4) / 1000
+        self.stalls = deque(maxlen=history)
+        self.main_thread_id = threading.main_thread().ident
+        self.last_beat = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(heartbeat_ms)
+        self.timer.timeout.connect(self.beat)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.timer.start()
+        self._thread = threading.Thread(target=self._watch, name="EventLoopWatchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Сторож цикла событий включён: порог {self.threshold * 1000:.0f} мс")
+
+    def stop(self):
+        self._stop.set()
+        self.timer.stop()
+        if self._thread:
+            self._thread.join(1)
+            self._thread = None
+
+    def beat(self):
+        self.last_beat = time.monotonic()
+
+    def _watch(self):
+        stall = None
+        while not self._stop.wait(self.poll):
+            last_beat = self.last_beat
+            if last_beat is None:
+                continue
+            if stall and last_beat > stall["beat"]:
+                # Цикл снова отвечает — зависание закончилось
+                stall["duration_ms"] = round((last_beat - stall["beat"]) * 1000)
+                self._record(stall)
+                stall = None
+            elif not stall and time.monotonic() - last_beat > self.threshold:
+                stall = self._capture(last_beat)
+
+    def _capture(self, last_beat):
+        frame = sys._current_frames().get(self.main_thread_id)
+        frames = traceback.extract_stack(frame) if frame is not None else []
+        return {
+            "beat": last_beat,
+            "started_at": datetime.now().isoformat(timespec="milliseconds"),
+            "culprit": self.culprit(frames),
+            "stack": traceback.format_list(frames),
+        }
+
+    @staticmethod
+    def culprit(frames):
+        """Самый глубокий кадр из кода приложения, например «app.py:3921 update_table»."""
+        for entry in reversed(frames):
+            if os.path.dirname(os.path.abspath(entry.filename)) == APP_DIR:
+                return f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+        return frames[-1].name if frames else "?"
+
+    def _record(self, stall):
+        stall.pop("beat")
+        self.stalls.append(stall)
+        logger.warning(
+            f"Цикл событий завис на {stall['duration_ms']} мс в {stall['culprit']}\n"
+            + "".join(stall["stack"][-15:])
+        )
+
+    def summary(self):
+        """Зависания по месту, самые долгие сначала: [(место, число, всего мс, максимум мс)]."""
+        by_culprit = {}
+        for stall in self.stalls:
+            count, total, longest = by_culprit.get(stall["culprit"], (0, 0, 0))
+            by_culprit[stall["culprit"]] = (count + 1, total + stall["duration_ms"],
+                                            max(longest, stall["duration_ms"]))
+        return sorted(((k,) + v for k, v in by_culprit.items()), key=lambda row: row[2], reverse=True)
@@ -0,0 +1,45 @@
+"""Фазы запуска приложения: сколько заняли импорт, авторизация, построение окна.
+
+Отсчёт идёт от первой строки app.py, поэтому время импорта PySide6 тоже
+видно. Отчёт пишется в лог после первого кадра окна, а при
+HH_STARTUP_REPORT=<путь> ещё и в JSON. Подробно по модулям: python -X importtime app.py
+"""
+import os
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    def __init__(self, started):
+        self.started = started
+        self.last = started
+        self.phases = []
+
+    def mark(self, phase):
+        """Закрывает фазу: от предыдущей отметки до текущего момента."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    @property
+    def total(self):
+        return self.last - self.started
+
+    def log(self):
+        lines = [f"  {phase:<28}{seconds * 1000:>8.0f} мс" for phase, seconds in self.phases]
+        logger.info(f"Запуск занял {self.total * 1000:.0f} мс:\n" + "\n".join(lines))
+
+    def as_dict(self):
+        return {
+            "total_ms": round(self.total * 1000, 1),
+            "phases": [{"phase": phase, "ms": round(seconds * 1000, 1)} for phase, seconds in self.phases],
+        }
+
+    def write(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
@@ -0,0 +1,149 @@
+"""Лёгкие span'ы с выгрузкой в формат Chrome trace event.
+
+    HH_TRACE=1 python app.py              # trace-<время>.json в папке данных при выходе
+    HH_TRACE=C:/tmp/trace.json python app.py
+
+Файл открывается в chrome://tracing или https://ui.perfetto.dev. Каждый поток
+(GUI, UpdateWorker, VacancyStreamWorker...) — отдельная дорожка. Пока
+трассировка выключена, span() и @traced стоят одну проверку флага.
+"""
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+
+TRACE_ENV = os.getenv("HH_TRACE", "")
+MAX_EVENTS = 200000
+
+enabled = False
+_events = deque(maxlen=MAX_EVENTS)
+_thread_names = {}
+_origin = time.perf_counter()
+
+
+def enable(max_events=MAX_EVENTS):
+    global enabled, _events
+    if _events.maxlen != max_events:
+        _events = deque(_events, maxlen=max_events)
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def clear():
+    _events.clear()
+    _thread_names.clear()
+
+
+def _now_us():
+    return (time.perf_counter() - _origin) * 1e6
+
+
+def _thread_id():
+    tid = threading.get_ident()
+    if tid not in _thread_names:
+        name = threading.current_thread().name
+        if name.startswith("Dummy"):
+            # Потоки QThread Python видит как Dummy-N; имя класса воркера понятнее
+            try:
+                from PySide6.QtCore import QThread
+                name = type(QThread.currentThread()).__name__
+            except Exception:
+                pass
+        _thread_names[tid] = name
+    return tid
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start", "tid")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.tid = _thread_id()
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event = {"name": self.name, "cat": self.cat, "ph": "X", "ts": self.start,
+                 "dur": _now_us() - self.start, "pid": os.getpid(), "tid": self.tid}
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        if self.args:
+            event["args"] = self.args
+        _events.append(event)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, cat="app", **args):
+    """with span("update_table", rows=n): ... — интервал на дорожке текущего потока."""
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def instant(name, cat="app", **args):
+    """Отметка без длительности, например приход события SSE."""
+    if not enabled:
+        return
+    event = {"name": name, "cat": cat, "ph": "i", "s": "t", "ts": _now_us(),
+             "pid": os.getpid(), "tid": _thread_id()}
+    if args:
+        event["args"] = args
+    _events.append(event)
+
+
+def traced(name=None, cat="app"):
+    """Декоратор: каждый вызов функции — span с её квалифицированным именем."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, cat, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def export(path):
+    """Записывает накопленные события в JSON для chrome://tracing / Perfetto."""
+    pid = os.getpid()
+    metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "HH Vacancy"}}]
+    for tid, thread_name in list(_thread_names.items()):
+        metadata.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        if thread_name == "MainThread":
+            metadata.append({"name": "thread_sort_index", "ph": "M", "pid": pid, "tid": tid,
+                             "args": {"sort_index": -1}})
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": metadata + list(_events), "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return len(_events)
+
+
+if TRACE_ENV:
+    enable()
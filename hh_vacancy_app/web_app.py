@@ -0,0 +1,503 @@
+"""Веб-панель вакансий для templates/index.html.
+
+    python web_app.py [--host 127.0.0.1] [--port 5000]
+
+Вакансии лежат в памяти с индексами по id и ссылке, ответы /api/vacancies
+отдаются из готового снимка с ETag. Сбор с hh.ru идёт в фоновом потоке:
+/api/update только запускает его, а страница опрашивает /api/update/status.
+Кроме того, сервер сам собирает вакансии раз в HH_WEB_REFRESH_MINUTES минут
+и рассылает открытым страницам изменения через SSE (/api/stream).
+"""
+import os
+import sys
+import json
+import time
+import queue
+import logging
+import atexit
+import argparse
+import threading
+from pathlib import Path
+
+from flask import Flask, Response, jsonify, render_template, request
+
+from harvester import (
+    DEFAULT_PROFILE, RateLimiter, build_params, iter_pages, make_session, normalize_item
+)
+from hh_dictionaries import HHDictionaries
+
+DATA_DIR = Path(os.getenv("HH_WEB_DATA", "hh_web_data"))
+DEFAULT_SETTINGS = {
+    "query": DEFAULT_PROFILE["query"],
+    "exclude": ", ".join(DEFAULT_PROFILE["exclude"]),
+    "days": DEFAULT_PROFILE["days"]
+}
+
+# Ключи сортировки для постраничной выдачи; "-" в запросе — по убыванию
+SORT_FIELDS = ("date", "title", "company", "city")
+MAX_PAGE_SIZE = 500
+REFRESH_MINUTES = float(os.getenv("HH_WEB_REFRESH_MINUTES", "30"))
+SSE_PING_SECONDS = 15
+SAVE_DELAY_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+def write_json(path, data):
+    """Атомарная запись: сначала во временный файл, затем os.replace."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_json(path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+def row_to_vacancy(row):
+    """Строка отчёта harvester -> формат, который ждёт index.html."""
+    return {
+        "id": row["id"],
+        "status": row["Статус"],
+        "title": row["Название"],
+        "company": row["Компания"],
+        "city": row["Город"],
+        "salary": row["Зарплата"],
+        "date": row["Дата публикации"],
+        "link": row["Ссылка"]
+    }
+
+
+class Broadcaster:
+    """Рассылка событий всем подписчикам /api/stream.
+
+    У каждого подписчика своя ограниченная очередь. Если клиент не успевает
+    читать, очередь очищается и ему уходит reset — страница перечитает
+    данные целиком, а сервер не копит память ради медленной вкладки.
+    """
+
+    def __init__(self, max_queue=256):
+        self.max_queue = max_queue
+        self.lock = threading.Lock()
+        self.subscribers = set()
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=self.max_queue)
+        with self.lock:
+            self.subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            self.subscribers.discard(q)
+
+    def publish(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait({"type": "reset"})
+
+
+class DeferredWriter:
+    """Запись файла в фоновом потоке с объединением изменений.
+
+    schedule() только отмечает, что данные изменились; поток ждёт
+    delay секунд, пока серия изменений не закончится, и один раз
+    сохраняет то, что вернёт collect(). flush() пишет сразу — перед
+    выходом процесса.
+    """
+
+    def __init__(self, path, collect, delay=SAVE_DELAY_SECONDS):
+        self.path = path
+        self.collect = collect
+        self.delay = delay
+        self.dirty = threading.Event()
+        self.stopped = threading.Event()
+        self.write_lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="hh-cache-writer", daemon=True)
+        self.thread.start()
+
+    def schedule(self):
+        self.dirty.set()
+
+    def _run(self):
+        while not self.stopped.is_set():
+            self.dirty.wait()
+            self.stopped.wait(self.delay)
+            self.flush()
+
+    def flush(self):
+        with self.write_lock:
+            if not self.dirty.is_set():
+                return
+            self.dirty.clear()
+            try:
+                write_json(self.path, self.collect())
+            except OSError:
+                logger.exception(f"Не удалось сохранить {self.path}")
+                self.dirty.set()
+
+    def close(self):
+        self.stopped.set()
+        self.flush()
+
+
+class VacancyCache:
+    """Вакансии в памяти: индексы по id и ссылке плюс готовый JSON-снимок.
+
+    Любое изменение увеличивает version; снимок (сортировка NEW сверху,
+    затем по дате, и сериализация) и отсортированные представления для
+    постраничной выдачи пересобираются один раз на версию, а не на каждый
+    запрос. На диск изменения уходят через DeferredWriter, вне блокировки.
+    """
+
+    def __init__(self, path, on_change=None):
+        self.path = path
+        self.on_change = on_change
+        self.lock = threading.RLock()
+        self.by_id = {}
+        self.id_by_link = {}
+        self.version = 0
+        self._snapshot = None
+        self._views = {}
+        for vacancy in read_json(path, []):
+            self._add(vacancy)
+        self.writer = DeferredWriter(path, self._persisted)
+
+    def _persisted(self):
+        # Копии под блокировкой: сериализация идёт в потоке записи, а статус может смениться
+        with self.lock:
+            return [dict(v) for v in self.by_id.values()]
+
+    def _add(self, vacancy):
+        self.by_id[vacancy["id"]] = vacancy
+        if vacancy.get("link"):
+            self.id_by_link[vacancy["link"]] = vacancy["id"]
+
+    def _changed(self, event):
+        self.version += 1
+        self._snapshot = None
+        self._views = {}
+        self.writer.schedule()
+        if self.on_change is not None:
+            # Под блокировкой, чтобы подписчики получали события в порядке версий
+            self.on_change(dict(event, version=self.version, **self.counts()))
+
+    def __contains__(self, vacancy_id):
+        return vacancy_id in self.by_id
+
+    def snapshot(self):
+        """(etag, body, vacancies) текущей версии."""
+        with self.lock:
+            if self._snapshot is None:
+                vacancies = self.view()
+                body = json.dumps(vacancies, ensure_ascii=False)
+                self._snapshot = (f'W/"{self.version}"', body, vacancies)
+            return self._snapshot
+
+    def view(self, status=None, sort=None):
+        """Отфильтрованный по статусу и отсортированный список (кэш на версию).
+
+        sort — одно из SORT_FIELDS, с "-" для убывания; по умолчанию NEW
+        сверху, затем свежие даты, как в отчёте hh_java_search.py.
+        """
+        key = (status, sort)
+        with self.lock:
+            if key not in self._views:
+                vacancies = [v for v in self.by_id.values() if status is None or v["status"] == status]
+                field = (sort or "-date").lstrip("-")
+                vacancies.sort(key=lambda v: str(v.get(field) or "").lower(), reverse=(sort or "-date").startswith("-"))
+                if sort is None:
+                    # Устойчивая сортировка сохраняет порядок по дате внутри NEW и OLD
+                    vacancies.sort(key=lambda v: v["status"] != "NEW")
+                self._views[key] = vacancies
+            return self._views[key]
+
+    def counts(self):
+        with self.lock:
+            if ("counts", None) not in self._views:
+                new_count = sum(1 for v in self.by_id.values() if v["status"] == "NEW")
+                self._views[("counts", None)] = {"total_count": len(self.by_id), "new_count": new_count}
+            return self._views[("counts", None)]
+
+    def add_new(self, vacancies):
+        with self.lock:
+            fresh = [v for v in vacancies if v["id"] not in self.by_id]
+            for vacancy in fresh:
+                self._add(vacancy)
+            if fresh:
+                # Копии: событие сериализуется позже, когда статус уже мог смениться
+                self._changed({"type": "added", "items": [dict(v) for v in fresh]})
+            return len(fresh)
+
+    def mark_old(self, ids=(), links=()):
+        with self.lock:
+            targets = set(ids)
+            targets.update(self.id_by_link[link] for link in links if link in self.id_by_link)
+            updated = []
+            for vacancy_id in targets:
+                vacancy = self.by_id.get(str(vacancy_id))
+                if vacancy is not None and vacancy["status"] != "OLD":
+                    vacancy["status"] = "OLD"
+                    updated.append(vacancy["id"])
+            if updated:
+                self._changed({"type": "status", "ids": updated, "status": "OLD"})
+            return len(updated)
+
+
+class Refresher:
+    """Фоновый сбор с hh.ru; одновременно идёт не больше одного."""
+
+    def __init__(self, cache, settings_getter, on_status=None):
+        self.cache = cache
+        self.settings_getter = settings_getter
+        self.on_status = on_status
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stopped = threading.Event()
+        self.session = make_session(pool_size=2)
+        self.limiter = RateLimiter(5)
+        self.dictionaries = None
+        self.status = {"running": False, "started_at": None, "finished_at": None,
+                       "new_count": 0, "total_count": len(cache.by_id), "error": None}
+
+    def start(self):
+        with self.lock:
+            if self.status["running"]:
+                return False
+            self.status.update(running=True, started_at=time.time(), new_count=0, error=None)
+        self._notify()
+        self.thread = threading.Thread(target=self._run, name="hh-refresh", daemon=True)
+        self.thread.start()
+        return True
+
+    def start_periodic(self, interval):
+        """Сбор по расписанию: один на всех, сколько бы страниц ни было открыто."""
+        def loop():
+            while not self.stopped.wait(interval):
+                self.start()
+
+        threading.Thread(target=loop, name="hh-refresh-timer", daemon=True).start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def _notify(self):
+        if self.on_status is not None:
+            self.on_status({"type": "refresh", "status": self.get_status()})
+
+    def get_status(self):
+        with self.lock:
+            return dict(self.status, total_count=len(self.cache.by_id))
+
+    def _profile(self):
+        settings = self.settings_getter()
+        profile = dict(DEFAULT_PROFILE)
+        profile.update(query=settings["query"], exclude=settings["exclude"], days=settings["days"])
+        return profile
+
+    def _run(self):
+        new_count = 0
+        error = None
+        try:
+            if self.dictionaries is None:
+                self.dictionaries = HHDictionaries(session=self.session).load()
+            params = build_params(self._profile(), self.dictionaries)
+            for page, data in iter_pages(self.session, self.limiter, params):
+                # Нормализуем только то, чего ещё нет в индексе
+                rows = [
+                    normalize_item(item, self.dictionaries)
+                    for item in data.get("items", [])
+                    if str(item.get("id")) not in self.cache
+                ]
+                new_count += self.cache.add_new([row_to_vacancy(row) for row in rows])
+                with self.lock:
+                    self.status["new_count"] = new_count
+                logger.info(f"Страница {page + 1}: новых {len(rows)}")
+        except Exception as e:
+            logger.exception("Ошибка обновления вакансий")
+            error = str(e)
+        with self.lock:
+            self.status.update(running=False, finished_at=time.time(), new_count=new_count, error=error)
+        self._notify()
+
+
+def create_app(data_dir=DATA_DIR, refresh_minutes=None):
+    data_dir = Path(data_dir)
+    settings_file = data_dir / "settings.json"
+    settings = dict(DEFAULT_SETTINGS, **read_json(settings_file, {}))
+    settings_lock = threading.Lock()
+
+    def get_settings():
+        with settings_lock:
+            return dict(settings)
+
+    broadcaster = Broadcaster()
+    cache = VacancyCache(data_dir / "vacancies.json", on_change=broadcaster.publish)
+    refresher = Refresher(cache, get_settings, on_status=broadcaster.publish)
+    if refresh_minutes:
+        refresher.start_periodic(refresh_minutes * 60)
+
+    app = Flask(__name__)
+    app.config["JSON_AS_ASCII"] = False
+    app.extensions["hh_cache"] = cache
+    app.extensions["hh_refresher"] = refresher
+    app.extensions["hh_broadcaster"] = broadcaster
+    atexit.register(cache.writer.close)
+
+    @app.route("/")
+    def index():
+        return render_template("index.html")
+
+    def view_args():
+        status = request.args.get("status") or None
+        sort = request.args.get("sort") or None
+        if status not in (None, "NEW", "OLD"):
+            raise ValueError("status должен быть NEW или OLD")
+        if sort is not None and sort.lstrip("-") not in SORT_FIELDS:
+            raise ValueError(f"sort должен быть одним из: {', '.join(SORT_FIELDS)}")
+        return status, sort
+
+    @app.route("/api/vacancies")
+    def vacancies():
+        """Без параметров — весь список; с offset/limit/status/sort — одна страница."""
+        paged = any(name in request.args for name in ("offset", "limit", "status", "sort"))
+        if not paged:
+            etag, body, _ = cache.snapshot()
+        else:
+            try:
+                status, sort = view_args()
+                offset = max(0, int(request.args.get("offset", 0)))
+                limit = min(MAX_PAGE_SIZE, max(1, int(request.args.get("limit", 100))))
+            except ValueError as e:
+                return jsonify({"success": False, "error": str(e)}), 400
+            with cache.lock:
+                etag = f'W/"{cache.version}"'
+                view = cache.view(status, sort)
+                body = json.dumps(dict(
+                    cache.counts(),
+                    items=view[offset:offset + limit],
+                    total=len(view),
+                    offset=offset,
+                    limit=limit,
+                    version=cache.version
+                ), ensure_ascii=False)
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=304, headers={"ETag": etag})
+        return Response(body, mimetype="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    @app.route("/api/vacancies/ids")
+    def vacancy_ids():
+        """id всех вакансий под фильтром — для «Выбрать все» без загрузки строк."""
+        try:
+            status, sort = view_args()
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        return jsonify([v["id"] for v in cache.view(status, sort)])
+
+    @app.route("/api/stream")
+    def stream():
+        """SSE: события added/status/refresh с номером версии данных.
+
+        Первым уходит hello с текущей версией, чтобы страница могла сверить
+        её со своей и при расхождении перечитать данные.
+        """
+        q = broadcaster.subscribe()
+        with cache.lock:
+            hello = dict(cache.counts(), type="hello", version=cache.version)
+
+        def events():
+            try:
+                yield "retry: 5000\n\n"
+                yield f"event: delta\ndata: {json.dumps(hello, ensure_ascii=False)}\n\n"
+                while True:
+                    try:
+                        event = q.get(timeout=SSE_PING_SECONDS)
+                    except queue.Empty:
+                        # Комментарий держит соединение живым через прокси
+                        yield ": ping\n\n"
+                        continue
+                    yield f"event: delta\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+            finally:
+                broadcaster.unsubscribe(q)
+
+        return Response(events(), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.route("/api/update", methods=["GET", "POST"])
+    def update():
+        started = refresher.start()
+        return jsonify({"success": True, "started": started, "status": refresher.get_status()}), 202
+
+    @app.route("/api/update/status")
+    def update_status():
+        return jsonify(refresher.get_status())
+
+    @app.route("/api/mark-as-old", methods=["POST"])
+    def mark_as_old():
+        payload = request.get_json(silent=True) or {}
+        ids = [str(i) for i in payload.get("ids") or []]
+        links = payload.get("links") or []
+        if not ids and not links:
+            return jsonify({"success": False, "error": "Не переданы ids или links"}), 400
+        updated = cache.mark_old(ids, links)
+        return jsonify({"success": True, "updated_count": updated})
+
+    @app.route("/api/settings", methods=["GET", "POST"])
+    def settings_api():
+        if request.method == "GET":
+            return jsonify(get_settings())
+        payload = request.get_json(silent=True) or {}
+        query = str(payload.get("query") or "").strip()
+        if not query:
+            return jsonify({"success": False, "error": "Укажите ключевое слово"}), 400
+        try:
+            days = max(1, int(payload.get("days") or 1))
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "Период должен быть числом дней"}), 400
+        with settings_lock:
+            settings.update(query=query, exclude=str(payload.get("exclude") or "").strip(), days=days)
+            write_json(settings_file, settings)
+        return jsonify({"success": True})
+
+    @app.route("/api/exit", methods=["POST"])
+    def exit_app():
+        def shutdown():
+            # os._exit не вызывает atexit — несохранённые изменения пишем сами
+            cache.writer.close()
+            os._exit(0)
+
+        # Отвечаем странице и только потом гасим процесс
+        threading.Timer(0.5, shutdown).start()
+        return jsonify({"success": True})
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Веб-панель вакансий hh.ru")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Где хранить вакансии и настройки")
+    parser.add_argument("--refresh-minutes", type=float, default=REFRESH_MINUTES,
+                        help="Период фонового сбора, 0 — только по кнопке")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    app = create_app(args.data_dir, args.refresh_minutes)
+    print(f"Откройте http://{args.host}:{args.port}/")
+    app.run(host=args.host, port=args.port, threaded=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
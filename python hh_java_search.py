@@ -4,45 +4,60 @@ from datetime import datetime, timedelta
 import os
 from openpyxl import load_workbook
 
+from hh_vacancy_app.harvester import RUB_COLUMNS, items_to_frame, sort_report
+from hh_vacancy_app.hh_dictionaries import HHDictionaries
+
 API_URL = "https://api.hh.ru/vacancies"
 
+
+def load_dictionaries():
+    """Справочники hh.ru (регионы, роли, валюты) — из локального кэша, в сеть раз в неделю."""
+    try:
+        return HHDictionaries().load()
+    except (requests.exceptions.RequestException, OSError, ValueError) as e:
+        print(f"Справочники hh.ru недоступны ({e}) — используем встроенный набор")
+        return HHDictionaries.from_fixture()
+
+
+print("=" * 60)
+print("Начало работы скрипта")
+print("=" * 60)
+
+dictionaries = load_dictionaries()
+
 # Дата: день назад
 date_from = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%S")
 
 params = {
     "text": "Java разработчик NOT Android NOT QA NOT Тестировщик NOT Аналитик NOT C# NOT архитектор NOT PHP NOT Fullstack NOT 1С NOT Python NOT Frontend-разработчик",
-    "area": [113, 16],  # Россия и Беларусь
+    "area": [dictionaries.area_id("Россия"), dictionaries.area_id("Беларусь")],
     "schedule": "remote",  # удаленная работа
     "per_page": 50,
     "page": 0,
     "date_from": date_from,
-    "professional_role": 96  # Java developer
+    "professional_role": dictionaries.role_id("Программист, разработчик")
 }
 
 file_name = "java_backend_vacancies_last_week.xlsx"
 
-print("=" * 60)
-print("Начало работы скрипта")
-print("=" * 60)
-
 # Загружаем предыдущие данные (если файл есть)
 if os.path.exists(file_name):
     old_df = pd.read_excel(file_name)
+    # Рублёвые колонки писала одна из прошлых версий скрипта — в отчёте их больше нет
+    old_df = old_df.drop(columns=[c for c in RUB_COLUMNS if c in old_df.columns])
     # Все предыдущие вакансии помечаем как OLD
     old_df["Статус"] = "OLD"
-    old_links = set(old_df["Ссылка"].tolist())
-    print(f"Найден предыдущий отчёт: {len(old_links)} вакансий помечено как OLD")
+    print(f"Найден предыдущий отчёт: {len(old_df)} вакансий помечено как OLD")
 else:
     old_df = pd.DataFrame()
-    old_links = set()
     print("Предыдущий отчёт не найден — создаём новый")
 
 print("\n" + "=" * 60)
 print("Поиск вакансий для Java Developer (Россия и Беларусь)...")
 print("=" * 60 + "\n")
 
-# Собираем текущие вакансии
-current_vacancies = []
+# Собираем сырые вакансии со всех страниц, нормализуем одним пакетом в конце
+raw_items = []
 
 while True:
     resp = requests.get(API_URL, params=params)
@@ -50,49 +65,28 @@ while True:
 
     print(f"Обработка страницы {params['page'] + 1}...")
 
-    for item in data.get("items", []):
-        link = item.get("alternate_url")
-
-        # Определяем статус: NEW если вакансии не было, иначе пропускаем (она уже есть как OLD)
-        if link not in old_links:
-            vacancy = {
-                "Название": item.get("name"),
-                "Компания": item.get("employer", {}).get("name"),
-                "Город": item.get("area", {}).get("name"),
-                "Зарплата": (
-                    f"{item['salary']['from']} - {item['salary']['to']} {item['salary']['currency']}"
-                    if item.get("salary") else "не указана"
-                ),
-                "Дата публикации": item.get("published_at", "")[:10],
-                "Ссылка": link,
-                "Статус": "NEW"
-            }
-            current_vacancies.append(vacancy)
+    raw_items.extend(data.get("items", []))
 
     if data.get("pages") and params["page"] < data["pages"] - 1:
         params["page"] += 1
     else:
         break
 
+# NEW — только вакансии, которых не было в прошлом отчёте (остальные уже есть как OLD)
+current_df = items_to_frame(raw_items, known_links=old_df.get("Ссылка"), dictionaries=dictionaries)
+
 print(f"\n{'=' * 60}")
-print(f"Найдено {len(current_vacancies)} новых вакансий")
+print(f"Найдено {len(current_df)} новых вакансий")
 print("=" * 60 + "\n")
 
 # Объединяем старые (OLD) и новые (NEW) данные
 if not old_df.empty:
-    new_df = pd.concat([old_df, pd.DataFrame(current_vacancies)], ignore_index=True)
+    new_df = pd.concat([old_df, current_df], ignore_index=True)
 else:
-    new_df = pd.DataFrame(current_vacancies)
+    new_df = current_df
 
 # Сортировка: сначала NEW сверху, затем по дате (новые даты сверху)
-# Создаём временную колонку для сортировки статуса (NEW = 0, OLD = 1)
-new_df['_sort_status'] = new_df['Статус'].apply(lambda x: 0 if x == 'NEW' else 1)
-
-# Сортируем: сначала по статусу (NEW сверху), потом по дате (новые сверху)
-new_df = new_df.sort_values(
-    by=['_sort_status', 'Дата публикации'],
-    ascending=[True, False]
-).drop(columns=['_sort_status']).reset_index(drop=True)
+new_df = sort_report(new_df)
 
 # Сохраняем обновлённый отчёт
 if os.path.exists(file_name):
@@ -127,5 +121,5 @@ for column in ws.columns:
 wb.save(file_name)
 
 print("\n" + "=" * 60)
-print(f"Отчёт обновлён: всего {len(new_df)} вакансий ({len(old_df)} OLD + {len(current_vacancies)} NEW)")
+print(f"Отчёт обновлён: всего {len(new_df)} вакансий ({len(old_df)} OLD + {len(current_df)} NEW)")
 print("=" * 60)
\ No newline at end of file